@@ -0,0 +1,146 @@
+"""Compare the iterative DFS on :math:`G^{-1}` with the recursive one.
+
+The DFS on :math:`G^{-1}` computes the order used to sort the image of each
+vertex topologically (see
+:func:`bispy.utilities.graph_decorator.compute_counterimage_finishing_time_list`).
+We run the current implementation, which uses an explicit stack, and the
+recursive implementation it replaced on two families of graphs:
+
+- *chain*: a path whose length is the number of nodes (the depth of the
+  recursion is the number of nodes);
+- *wide*: a DAG with `--layers` layers, where each node has `--degree`
+  random successors in the next layer (the depth of the recursion is the
+  number of layers).
+
+The recursive implementation runs in a thread with a large stack, and with
+a large recursion limit.
+
+Usage::
+
+    python -m benchmarks.counterimage_dfs --nodes 1000000
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from bispy import CSRGraph
+from bispy.utilities.graph_decorator import (
+    _BLACK,
+    _GRAY,
+    _WHITE,
+    compute_counterimage_finishing_time_list,
+    decorate_nx_graph,
+)
+
+
+def recursive_counterimage_dfs(
+    current_vertex_idx, vertexes, finishing_list, colors
+):
+    colors[current_vertex_idx] = _GRAY
+    for counterimage_vertex in vertexes[current_vertex_idx].predecessors():
+        if colors[counterimage_vertex.label] == _WHITE:
+            recursive_counterimage_dfs(
+                counterimage_vertex.label, vertexes, finishing_list, colors
+            )
+    finishing_list.append(vertexes[current_vertex_idx])
+    colors[current_vertex_idx] = _BLACK
+
+
+def recursive_finishing_time_list(vertexes):
+    colors = [_WHITE for _ in range(len(vertexes))]
+    finishing_list = []
+    for idx in range(len(vertexes)):
+        if colors[idx] == _WHITE:
+            recursive_counterimage_dfs(idx, vertexes, finishing_list, colors)
+    return finishing_list
+
+
+def chain(nvertexes, seed):
+    return CSRGraph.from_edges(
+        nvertexes, range(1, nvertexes), range(nvertexes - 1)
+    )
+
+
+def wide_dag(nvertexes, nlayers, degree, seed):
+    rnd = random.Random(seed)
+    width = max(nvertexes // nlayers, 1)
+    sources = []
+    targets = []
+    for node in range(nvertexes - width):
+        next_layer = (node // width + 1) * width
+        for _ in range(degree):
+            sources.append(node)
+            targets.append(
+                min(next_layer + rnd.randrange(width), nvertexes - 1)
+            )
+    return CSRGraph.from_edges(nvertexes, sources, targets)
+
+
+def timed(function, vertexes, repeat):
+    # the best of `repeat` runs
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(vertexes)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1000000)
+    parser.add_argument("--layers", type=int, default=100)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graphs = [
+        ("chain", chain(args.nodes, args.seed)),
+        (
+            "wide",
+            wide_dag(args.nodes, args.layers, args.degree, args.seed),
+        ),
+    ]
+
+    print(
+        "{:<10}{:>12}{:>16}{:>16}".format(
+            "graph", "edges", "rec (s)", "iter (s)"
+        )
+    )
+    for name, graph in graphs:
+        vertexes, _ = decorate_nx_graph(
+            graph,
+            set_count=False,
+            topological_sorted_images=False,
+            compute_rank=False,
+            set_xblock=False,
+            preprocess=False,
+            edge_objects=False,
+        )
+
+        expected, recursive_time = timed(
+            recursive_finishing_time_list, vertexes, args.repeat
+        )
+        result, iterative_time = timed(
+            compute_counterimage_finishing_time_list, vertexes, args.repeat
+        )
+        assert result == expected
+
+        print(
+            "{:<10}{:>12}{:>16.3f}{:>16.3f}".format(
+                name, graph.number_of_edges(), recursive_time, iterative_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    # the recursive DFS needs a deep stack
+    sys.setrecursionlimit(10**7)
+    threading.stack_size(1024 * 2**20)
+    thread = threading.Thread(target=main)
+    thread.start()
+    thread.join()
@@ -0,0 +1,90 @@
+"""Compare the ways of reading a graph from a text edge list.
+
+A random graph with string node names is written to a temporary edge list.
+We measure the wall time and the peak memory (with `tracemalloc`) needed to
+obtain an integer graph which can be passed to the algorithms in *BisPy*,
+either with `networkx.read_edgelist` followed by `convert_to_integer_graph`,
+or with the streaming reader
+:func:`bispy.utilities.edge_list_reader.read_edge_list`. Wall times are
+measured in a second run, without `tracemalloc`.
+
+Usage::
+
+    python -m benchmarks.edge_list_reader --nodes 100000 --edges 500000
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+
+from bispy.utilities.edge_list_reader import read_edge_list
+from bispy.utilities.graph_normalization import convert_to_integer_graph
+
+
+def write_random_edge_list(path, nvertexes, nedges, seed):
+    rnd = random.Random(seed)
+    with open(path, "w") as file:
+        for _ in range(nedges):
+            file.write(
+                "node{}\tnode{}\n".format(
+                    rnd.randrange(nvertexes), rnd.randrange(nvertexes)
+                )
+            )
+
+
+def with_networkx(path):
+    return convert_to_integer_graph(
+        nx.read_edgelist(path, create_using=nx.DiGraph)
+    )
+
+
+READERS = {
+    "networkx + convert": with_networkx,
+    "read_edge_list": read_edge_list,
+}
+
+
+def measure(function, path):
+    gc.collect()
+    tracemalloc.start()
+    result = function(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    gc.collect()
+    start = time.perf_counter()
+    result = function(path)
+    elapsed = time.perf_counter() - start
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "graph.txt")
+        write_random_edge_list(path, args.nodes, args.edges, args.seed)
+        print("edge list: {:.2f} MB".format(os.path.getsize(path) / 2**20))
+
+        print("{:<24}{:>12}{:>16}".format("", "time (s)", "peak (MB)"))
+        for name, function in READERS.items():
+            elapsed, peak = measure(function, path)
+            print(
+                "{:<24}{:>12.2f}{:>16.2f}".format(name, elapsed, peak / 2**20)
+            )
+
+
+if __name__ == "__main__":
+    main()
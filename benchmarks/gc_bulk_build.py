@@ -0,0 +1,71 @@
+"""Measure the wall time saved by the bulk-build mode on large graphs.
+
+For random graphs of increasing size we measure the time needed to decorate
+the graph and to compute its maximum bisimulation, with the cyclic garbage
+collector enabled (the default) and disabled by the bulk-build mode (see
+:func:`bispy.utilities.bulk_build.bulk_build_mode`).
+
+Usage::
+
+    python -m benchmarks.gc_bulk_build --nodes 100000 --edges 500000
+"""
+
+import argparse
+import gc
+import time
+
+from benchmarks.graphs import random_graph
+from bispy import paige_tarjan, dovier_piazza_policriti
+from bispy.utilities.graph_decorator import decorate_nx_graph
+
+ALGORITHMS = {
+    "decoration": lambda graph, bulk_build: decorate_nx_graph(
+        graph, edge_objects=False, bulk_build=bulk_build
+    ),
+    "paige_tarjan": lambda graph, bulk_build: paige_tarjan(
+        graph, is_integer_graph=True, bulk_build=bulk_build
+    ),
+    "dovier_piazza_policriti": lambda graph, bulk_build: (
+        dovier_piazza_policriti(
+            graph, is_integer_graph=True, bulk_build=bulk_build
+        )
+    ),
+}
+
+
+def wall_time(function, graph, bulk_build):
+    gc.collect()
+    start = time.perf_counter()
+    result = function(graph, bulk_build)
+    elapsed = time.perf_counter() - start
+    del result
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        "{:<26}{:>10}{:>10}{:>12}{:>12}{:>10}".format(
+            "", "nodes", "edges", "gc (s)", "bulk (s)", "speedup"
+        )
+    )
+    for scale in (1, 2, 4):
+        nvertexes, nedges = scale * args.nodes, scale * args.edges
+        graph = random_graph(nvertexes, nedges, args.seed)
+        for name, function in ALGORITHMS.items():
+            with_gc = wall_time(function, graph, False)
+            bulk = wall_time(function, graph, True)
+            print(
+                "{:<26}{:>10}{:>10}{:>12.2f}{:>12.2f}{:>10.2f}".format(
+                    name, nvertexes, nedges, with_gc, bulk, with_gc / bulk
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measure the time needed to open a *BisPy* graph file.
+
+A random graph is written to a *BisPy* graph file (see
+:mod:`bispy.utilities.graph_file`). We compare the time needed to open the
+file (which maps it in memory without reading it) with the time needed to
+build a `CSRGraph` from the edge arrays, and report the time needed to
+compute the maximum bisimulation of the mapped graph. With `--decorated`, we
+also compare the decoration of the graph with the one read from a file
+written by `write_decorated_graph`.
+
+Usage::
+
+    python -m benchmarks.graph_file --nodes 1000000 --edges 5000000
+    python -m benchmarks.graph_file --nodes 100000 --edges 500000 --decorated
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.graphs import random_edges
+from bispy import CSRGraph, paige_tarjan
+from bispy.utilities.graph_decorator import decorate_nx_graph
+from bispy.utilities.graph_file import (
+    decorate_mapped_graph,
+    open_graph_file,
+    write_decorated_graph,
+    write_edge_arrays,
+)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1000000)
+    parser.add_argument("--edges", type=int, default=5000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--bisimulation",
+        action="store_true",
+        help="Also compute the maximum bisimulation of the mapped graph",
+    )
+    parser.add_argument(
+        "--decorated",
+        action="store_true",
+        help="Also compare the decoration with the cached one",
+    )
+    args = parser.parse_args()
+
+    sources, targets = random_edges(args.nodes, args.edges, args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "graph.bispy")
+
+        _, write_time = timed(
+            write_edge_arrays, path, args.nodes, sources, targets
+        )
+        _, csr_time = timed(CSRGraph.from_edges, args.nodes, sources, targets)
+        mapped_graph, open_time = timed(open_graph_file, path)
+
+        row = "{:<28}{:>12.3f}"
+        print(row.format("file size (MB)", os.path.getsize(path) / 2**20))
+        print(row.format("write file (s)", write_time))
+        print(row.format("CSRGraph.from_edges (s)", csr_time))
+        print(row.format("open_graph_file (ms)", open_time * 1000))
+
+        if args.bisimulation:
+            _, pt_time = timed(paige_tarjan, mapped_graph)
+            print(row.format("paige_tarjan (s)", pt_time))
+
+        if args.decorated:
+            graph = mapped_graph.graph
+            decorated_path = os.path.join(directory, "decorated.bispy")
+            _, decorated_write_time = timed(
+                write_decorated_graph, decorated_path, graph
+            )
+            _, decorate_time = timed(decorate_nx_graph, graph)
+            with open_graph_file(decorated_path) as decorated_graph:
+                _, cached_time = timed(decorate_mapped_graph, decorated_graph)
+            print(
+                row.format("write_decorated_graph (s)", decorated_write_time)
+            )
+            print(row.format("decorate_nx_graph (s)", decorate_time))
+            print(row.format("decorate_mapped_graph (s)", cached_time))
+
+        mapped_graph.close()
+
+
+if __name__ == "__main__":
+    main()
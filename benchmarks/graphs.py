@@ -0,0 +1,23 @@
+"""Random graphs used by the benchmarks.
+
+The edges are drawn uniformly at random (multiple edges and self loops are
+allowed), and the same seed always gives the same graph.
+"""
+
+import random
+from array import array
+
+from bispy import CSRGraph
+
+
+def random_edges(nvertexes, nedges, seed):
+    rnd = random.Random(seed)
+    sources = array("i", (rnd.randrange(nvertexes) for _ in range(nedges)))
+    targets = array("i", (rnd.randrange(nvertexes) for _ in range(nedges)))
+    return sources, targets
+
+
+def random_graph(nvertexes, nedges, seed):
+    return CSRGraph.from_edges(
+        nvertexes, *random_edges(nvertexes, nedges, seed)
+    )
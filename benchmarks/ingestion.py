@@ -0,0 +1,72 @@
+"""Compare the ways of passing a graph stored in edge arrays to *BisPy*.
+
+The edges of a random graph are stored in two `array.array` instances. For
+each ingestion path (build a `networkx.DiGraph`, build a `CSRGraph`, or pass
+the arrays directly with `paige_tarjan_from_arrays`) we measure the wall time
+and the peak memory (with `tracemalloc`) needed to compute the maximum
+bisimulation, including the construction of the intermediate graph.
+
+Usage::
+
+    python -m benchmarks.ingestion --nodes 100000 --edges 500000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import networkx as nx
+
+from benchmarks.graphs import random_edges
+from bispy import CSRGraph, paige_tarjan, paige_tarjan_from_arrays
+
+
+def from_nx_graph(nvertexes, sources, targets):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    graph.add_edges_from(zip(sources, targets))
+    return paige_tarjan(graph, is_integer_graph=True)
+
+
+def from_csr_graph(nvertexes, sources, targets):
+    graph = CSRGraph.from_edges(nvertexes, sources, targets)
+    return paige_tarjan(graph)
+
+
+PATHS = {
+    "networkx.DiGraph": from_nx_graph,
+    "CSRGraph": from_csr_graph,
+    "paige_tarjan_from_arrays": paige_tarjan_from_arrays,
+}
+
+
+def measure(function, *args):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sources, targets = random_edges(args.nodes, args.edges, args.seed)
+
+    print("{:<30}{:>12}{:>16}".format("", "time (s)", "peak (MB)"))
+    for name, function in PATHS.items():
+        elapsed, peak = measure(function, args.nodes, sources, targets)
+        print("{:<30}{:>12.2f}{:>16.2f}".format(name, elapsed, peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure the memory needed by the algorithms in *BisPy*.
+
+For each algorithm we measure (with `tracemalloc`) the peak memory allocated
+while computing the maximum bisimulation of random graphs, and split it in a
+cost per vertex and a cost per edge using three graphs of sizes
+:math:`(n,m)`, :math:`(2n,m)` and :math:`(n,2m)`. The input graph is built
+before the measurement starts, therefore it is not taken into account.
+
+Usage::
+
+    python -m benchmarks.memory_usage --nodes 10000 --edges 50000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.graphs import random_graph
+from bispy import paige_tarjan, dovier_piazza_policriti, saha
+from bispy.utilities.graph_decorator import decorate_nx_graph
+
+
+def decorate_paige_tarjan(graph, edge_objects=False):
+    return decorate_nx_graph(
+        graph,
+        topological_sorted_images=False,
+        compute_rank=False,
+        lightweight=True,
+        edge_objects=edge_objects,
+    )
+
+
+def decorate_full(graph, edge_objects=False):
+    return decorate_nx_graph(graph, edge_objects=edge_objects)
+
+
+ALGORITHMS = {
+    "decoration (Paige-Tarjan)": decorate_paige_tarjan,
+    "  with _Edge objects": lambda graph: decorate_paige_tarjan(graph, True),
+    "decoration (rank, DPP)": decorate_full,
+    "  with _Edge objects (Saha)": lambda graph: decorate_full(graph, True),
+    "paige_tarjan": paige_tarjan,
+    "dovier_piazza_policriti": dovier_piazza_policriti,
+    "saha": saha,
+}
+
+
+def peak_memory(function, graph):
+    gc.collect()
+    tracemalloc.start()
+    result = function(graph)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def bytes_per_vertex_and_edge(function, nvertexes, nedges, seed):
+    base = peak_memory(function, random_graph(nvertexes, nedges, seed))
+    more_vertexes = peak_memory(
+        function, random_graph(2 * nvertexes, nedges, seed)
+    )
+    more_edges = peak_memory(
+        function, random_graph(nvertexes, 2 * nedges, seed)
+    )
+    return (
+        (more_vertexes - base) / nvertexes,
+        (more_edges - base) / nedges,
+        base,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--edges", type=int, default=30000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        "{:<30}{:>16}{:>16}{:>16}".format(
+            "", "bytes/vertex", "bytes/edge", "peak (MB)"
+        )
+    )
+    for name, function in ALGORITHMS.items():
+        per_vertex, per_edge, base = bytes_per_vertex_and_edge(
+            function, args.nodes, args.edges, args.seed
+        )
+        print(
+            "{:<30}{:>16.1f}{:>16.1f}{:>16.2f}".format(
+                name, per_vertex, per_edge, base / 2**20
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
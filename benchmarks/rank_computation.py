@@ -0,0 +1,100 @@
+"""Compare the computation of the rank on vertexes with the one on the
+integer arrays of a CSR graph.
+
+:func:`bispy.utilities.rank_computation.compute_rank` visits the vertexes of
+the *BisPy* representation of the graph, while
+:func:`bispy.utilities.rank_computation.csr_rank` (used by
+:func:`bispy.utilities.graph_decorator.decorate_nx_graph` when the input is
+a :class:`bispy.utilities.csr_graph.CSRGraph`) only uses arrays of integers.
+We run both on two families of graphs:
+
+- *chain*: a path whose length is the number of nodes;
+- *local*: each node has `--degree` successors among the next `--window`
+  nodes, and a few random successors which create cycles.
+
+Usage::
+
+    python -m benchmarks.rank_computation --nodes 1000000
+"""
+
+import argparse
+import random
+import time
+
+from bispy import CSRGraph
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.graph_decorator import decorate_nx_graph
+from bispy.utilities.rank_computation import compute_rank, csr_rank
+
+
+def chain(nvertexes, degree, window, seed):
+    return CSRGraph.from_edges(
+        nvertexes, range(1, nvertexes), range(nvertexes - 1)
+    )
+
+
+def local(nvertexes, degree, window, seed):
+    rnd = random.Random(seed)
+    sources = []
+    targets = []
+    for node in range(nvertexes):
+        for _ in range(degree):
+            sources.append(node)
+            if rnd.random() < 0.001:
+                targets.append(rnd.randrange(nvertexes))
+            else:
+                targets.append(
+                    min(node + 1 + rnd.randrange(window), nvertexes - 1)
+                )
+    return CSRGraph.from_edges(nvertexes, sources, targets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1000000)
+    parser.add_argument("--degree", type=int, default=3)
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        "{:<10}{:>12}{:>16}{:>16}".format(
+            "graph", "edges", "vertexes (s)", "arrays (s)"
+        )
+    )
+    for name, builder in [("chain", chain), ("local", local)]:
+        graph = builder(args.nodes, args.degree, args.window, args.seed)
+        # the counterimage is needed by both
+        graph.counterimage
+
+        vertexes, _ = decorate_nx_graph(
+            graph,
+            set_count=False,
+            compute_rank=False,
+            set_xblock=False,
+            preprocess=False,
+            edge_objects=False,
+            bulk_build=True,
+        )
+        with bulk_build_mode():
+            start = time.perf_counter()
+            compute_rank(vertexes)
+            vertexes_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scc_of, rank, _ = csr_rank(graph)
+            arrays_time = time.perf_counter() - start
+
+        for vertex, scc in zip(vertexes, scc_of):
+            expected = -1 if vertex.rank == float("-inf") else vertex.rank
+            assert rank[scc] == expected
+
+        print(
+            "{:<10}{:>12}{:>16.3f}{:>16.3f}".format(
+                name, graph.number_of_edges(), vertexes_time, arrays_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
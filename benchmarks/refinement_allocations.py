@@ -0,0 +1,80 @@
+"""Count the allocations avoided by the refinement pool of *Paige-Tarjan*.
+
+For random graphs of increasing size we run
+:func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan_qblocks` with a
+:class:`bispy.paige_tarjan.refinement_pool.RefinementPool`, and report the
+number of refinement steps, the number of blocks of :math:`Q` allocated and
+taken from the pool, and the number of allocations avoided in each refinement
+step.
+
+Usage::
+
+    python -m benchmarks.refinement_allocations --nodes 10000 --edges 30000
+"""
+
+import argparse
+import random
+
+from benchmarks.graphs import random_graph
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks
+from bispy.paige_tarjan.refinement_pool import RefinementPool
+from bispy.utilities.graph_decorator import decorate_nx_graph
+
+
+def refine_with_pool(graph, nlabels, seed):
+    rnd = random.Random(seed)
+    initial_partition = [[] for _ in range(nlabels)]
+    for vertex in range(graph.number_of_nodes()):
+        initial_partition[rnd.randrange(nlabels)].append(vertex)
+
+    _, q_partition = decorate_nx_graph(
+        graph,
+        [block for block in initial_partition if block],
+        topological_sorted_images=False,
+        compute_rank=False,
+        lightweight=True,
+        edge_objects=False,
+    )
+
+    pool = RefinementPool()
+    rscp = paige_tarjan_qblocks(q_partition, pool=pool)
+    return pool, len(rscp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--edges", type=int, default=30000)
+    parser.add_argument("--labels", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        "{:>10}{:>10}{:>10}{:>12}{:>12}{:>12}{:>14}".format(
+            "nodes",
+            "blocks",
+            "steps",
+            "allocated",
+            "reused",
+            "buffers",
+            "avoided/step",
+        )
+    )
+    for scale in (1, 2, 4, 8):
+        graph = random_graph(scale * args.nodes, scale * args.edges, args.seed)
+        pool, nblocks = refine_with_pool(graph, args.labels, args.seed)
+        print(
+            "{:>10}{:>10}{:>10}{:>12}{:>12}{:>12}{:>14.2f}".format(
+                scale * args.nodes,
+                nblocks,
+                pool.refine_steps,
+                pool.allocated_qblocks,
+                pool.reused_qblocks,
+                pool.reused_buffers,
+                pool.avoided_allocations_per_step(),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
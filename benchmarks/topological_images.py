@@ -0,0 +1,144 @@
+"""Compare the construction of topologically ordered images on vertexes with
+the counting sort on the arrays of a CSR graph.
+
+:func:`bispy.utilities.graph_decorator.build_vertexes_image` rebuilds the
+image of each vertex by visiting the counterimages in inverse order of
+finishing time (after the DFS on :math:`G^{-1}` of
+:func:`bispy.utilities.graph_decorator.compute_counterimage_finishing_time_list`),
+while :func:`bispy.utilities.graph_decorator.build_topological_csr_graph`
+(used by :func:`bispy.utilities.graph_decorator.decorate_nx_graph` when the
+input is a :class:`bispy.utilities.csr_graph.CSRGraph`) emits the arrays of
+the images in the same order with a single pass over the counterimages.
+
+Degrees are skewed: the endpoints of the edges follow a *Zipf*-like
+distribution with exponent `--exponent`, therefore a few hubs have most of
+the edges. We run three families of graphs:
+
+- *uniform*: sources and destinations are uniform (no skew);
+- *in-hubs*: destinations are skewed (a few nodes with huge counterimages);
+- *out-hubs*: sources are skewed (a few nodes with huge images).
+
+Usage::
+
+    python -m benchmarks.topological_images --nodes 1000000
+"""
+
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from bispy import CSRGraph
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.graph_decorator import (
+    as_bispy_graph,
+    build_topological_csr_graph,
+    build_vertexes_image,
+    compute_counterimage_finishing_time_list,
+    csr_counterimage_finishing_time_list,
+)
+
+
+def endpoints(rnd, nvertexes, nedges, exponent):
+    if exponent is None:
+        return [rnd.randrange(nvertexes) for _ in range(nedges)]
+
+    cum_weights = list(
+        accumulate(1 / (node + 1) ** exponent for node in range(nvertexes))
+    )
+    nodes = rnd.choices(range(nvertexes), cum_weights=cum_weights, k=nedges)
+    # hubs are scattered among the nodes
+    permutation = list(range(nvertexes))
+    rnd.shuffle(permutation)
+    return [permutation[node] for node in nodes]
+
+
+def skewed_graph(
+    nvertexes, degree, exponent, skew_sources, skew_targets, seed
+):
+    rnd = random.Random(seed)
+    nedges = nvertexes * degree
+    sources = endpoints(
+        rnd, nvertexes, nedges, exponent if skew_sources else None
+    )
+    targets = endpoints(
+        rnd, nvertexes, nedges, exponent if skew_targets else None
+    )
+    return CSRGraph.from_edges(nvertexes, sources, targets)
+
+
+def vertexes_images(graph):
+    vertexes, _ = as_bispy_graph(
+        graph, None, False, False, False, edge_objects=False
+    )
+    start = time.perf_counter()
+    build_vertexes_image(compute_counterimage_finishing_time_list(vertexes))
+    return vertexes, time.perf_counter() - start
+
+
+def arrays_images(graph):
+    start = time.perf_counter()
+    sorted_graph = build_topological_csr_graph(graph)
+    return sorted_graph, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1000000)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--exponent", type=float, default=1.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    families = [
+        ("uniform", False, False),
+        ("in-hubs", False, True),
+        ("out-hubs", True, False),
+    ]
+
+    print(
+        "{:<10}{:>12}{:>12}{:>16}{:>16}".format(
+            "graph", "max in", "max out", "vertexes (s)", "arrays (s)"
+        )
+    )
+    for name, skew_sources, skew_targets in families:
+        graph = skewed_graph(
+            args.nodes,
+            args.degree,
+            args.exponent,
+            skew_sources,
+            skew_targets,
+            args.seed,
+        )
+        # the counterimage built from the image is sorted by source, like
+        # the counterimages of the vertexes, therefore the images are the
+        # same. it's needed by both
+        graph = CSRGraph(args.nodes, graph.image_offsets, graph.image)
+        counterimage_offsets = graph.counterimage_offsets
+        max_in = max(
+            counterimage_offsets[node + 1] - counterimage_offsets[node]
+            for node in range(args.nodes)
+        )
+        max_out = max(
+            graph.image_offsets[node + 1] - graph.image_offsets[node]
+            for node in range(args.nodes)
+        )
+
+        with bulk_build_mode():
+            vertexes, vertexes_time = vertexes_images(graph)
+            sorted_graph, arrays_time = arrays_images(graph)
+
+        for vertex in vertexes:
+            assert [v.label for v in vertex.image] == list(
+                sorted_graph.successors(vertex.label)
+            )
+
+        print(
+            "{:<10}{:>12}{:>12}{:>16.3f}{:>16.3f}".format(
+                name, max_in, max_out, vertexes_time, arrays_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,38 @@
-from .paige_tarjan.paige_tarjan import paige_tarjan
+from .paige_tarjan.paige_tarjan import (
+    paige_tarjan,
+    paige_tarjan_from_arrays,
+    paige_tarjan_iter,
+    paige_tarjan_quotient,
+)
 from .dovier_piazza_policriti.dovier_piazza_policriti import (
     dovier_piazza_policriti,
+    dovier_piazza_policriti_from_arrays,
 )
-from .saha.saha_partition import saha
+from .saha.saha_partition import saha, saha_from_arrays
 
 from .utilities.graph_decorator import (
     decorate_bispy_graph,
     decorate_nx_graph,
     to_tuple_list,
 )
+from .utilities.csr_graph import CSRGraph
+from .utilities.edge_arrays import EdgeArrayGraph
+from .utilities.node_table import NodeTable
+from .utilities.block_labels import BlockLabels
+from .utilities.quotient_graph import quotient_graph
+from .utilities.sparse_matrix import as_csr_graph, quotient_sparse_matrix
+from .utilities.graph_file import (
+    MappedGraph,
+    as_mapped_graph_input,
+    decorate_mapped_graph,
+    open_graph_file,
+    write_decorated_graph,
+    write_edge_arrays,
+    write_nx_graph,
+)
+from .utilities.graph_rank import GraphRank, clear_rank_cache, graph_rank
+from .utilities.edge_list_reader import read_edge_list
+from .utilities.ntriples_reader import read_ntriples
 from enum import Enum, auto
 import networkx as nx
 
@@ -22,6 +46,7 @@ def compute_maximum_bisimulation(
     graph: nx.DiGraph,
     initial_partition=None,
     algorithm=Algorithms.PaigeTarjan,
+    sparse_quotient=False,
 ):
     """Compute the maximum bisimulation of the given graph, possibly using
     an initial partition (or labeling set). The preferred algorithm may be
@@ -37,16 +62,40 @@ def compute_maximum_bisimulation(
             algorithm=Algorithms.DovierPiazzaPolicriti)
         [(3, 5, 6), (7, 8, 9, 10, 11, 12, 13, 14), (0,), (2,), (1,), (4,)]
 
-    :param graph: The input graph.
+    :param graph: The input graph (a `networkx.DiGraph`, a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, a `scipy.sparse`
+        adjacency matrix, or a *BisPy* graph file, see
+        :mod:`bispy.utilities.graph_file`).
     :param initial_partition: A partition of the set of nodes of the graph,
         two nodes in different blocks of this partition cannot be bisimilar.
         Defaults to the trivial initial partition.
     :param algorithm: The algorithm used to compute the maximum bisimulation.
+    :param sparse_quotient: If `True`, the function also returns the
+        adjacency matrix of the quotient graph as a `scipy.sparse.csr_matrix`
+        whose :math:`i`-th row/column corresponds to the :math:`i`-th block of
+        the maximum bisimulation (see
+        :func:`bispy.utilities.sparse_matrix.quotient_sparse_matrix`).
+        Defaults to `False`.
     :returns: The maximum bisimulation of the given graph, with the given
-        initial partition.
+        initial partition. If `sparse_quotient` is `True`, a tuple whose
+        items are the maximum bisimulation and the adjacency matrix of the
+        quotient graph.
     """
 
-    if algorithm == Algorithms.PaigeTarjan:
-        return paige_tarjan(graph, initial_partition)
-    elif algorithm == Algorithms.DovierPiazzaPolicriti:
-        return dovier_piazza_policriti(graph, initial_partition)
+    # the graph is read only once, and then used by the quotient
+    with as_mapped_graph_input(graph, initial_partition) as (
+        graph,
+        initial_partition,
+    ):
+        graph = as_csr_graph(graph)
+
+        if algorithm == Algorithms.PaigeTarjan:
+            rscp = paige_tarjan(graph, initial_partition)
+        elif algorithm == Algorithms.DovierPiazzaPolicriti:
+            rscp = dovier_piazza_policriti(graph, initial_partition)
+        else:
+            raise ValueError("Unknown algorithm: {}".format(algorithm))
+
+        if sparse_quotient:
+            return rscp, quotient_sparse_matrix(graph, rscp)
+        return rscp
@@ -1,15 +1,35 @@
+import os
 import networkx as nx
 from typing import Iterable, List, Tuple, Dict, Union
 from itertools import islice
-from llist import dllist
-from bispy.utilities.graph_entities import _QBlock as _Block, _Vertex, _XBlock
-from bispy.utilities.graph_decorator import decorate_nx_graph
+from bispy.utilities.graph_entities import (
+    _QBlock as _Block,
+    _Vertex,
+    _XBlock,
+    new_epoch,
+)
+from bispy.utilities.graph_decorator import (
+    check_graph_rank,
+    decorate_nx_graph,
+)
 from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks
 from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
     convert_to_integer_graph,
     back_to_original,
 )
+from bispy.utilities.csr_graph import CSRGraph
+from bispy.utilities.edge_arrays import EdgeArrayGraph, labels_to_partition
+from bispy.utilities.sparse_matrix import as_csr_graph
+from bispy.utilities.graph_file import (
+    MappedGraph,
+    as_mapped_graph_input,
+    decorate_mapped_graph,
+    open_graph_file,
+)
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.block_labels import BlockLabels
+from bispy.utilities.graph_rank import GraphRank
 from bispy.utilities.graph_entities import _XBlock
 from bispy.dovier_piazza_policriti.ranked_partition import RankedPartition
 
@@ -23,26 +43,23 @@ def collapse(block: _Block) -> Tuple[_Vertex, List[_Vertex]]:
         the collapse, and the second is the list of collapsed vertexes.
     """
 
-    if block.vertexes.size > 0:
+    if block.size > 0:
         # "randomly" select a survivor node
-        survivor_node = block.vertexes.first.value
+        survivor_node = block.vertexes[0]
 
-        collapsed_nodes = []
-
-        vertex = block.vertexes.first.next
         # set all the other nodes to collapsed
-        while vertex is not None:
-            collapsed_nodes.append(vertex.value)
-
+        collapsed_nodes = block.vertexes[1:]
+        for vertex in collapsed_nodes:
             # append the counterimage of vertex to survivor_node
-            survivor_node.counterimage.extend(vertex.value.counterimage)
+            survivor_node.counterimage.extend(vertex.counterimage)
+            if survivor_node.counterimage_counts is not None:
+                survivor_node.counterimage_counts.extend(
+                    vertex.counterimage_counts
+                )
 
-            # acquire a pointer to the next vertex in the list
-            next_vertex = vertex.next
-            # remove the current vertex from the block
-            block.vertexes.remove(vertex)
-            # point vertex to the next vertex to be collapsed
-            vertex = next_vertex
+        # remove the collapsed vertexes from the block
+        del block.vertexes[1:]
+        block.size = 1
 
         return (survivor_node, collapsed_nodes)
     else:
@@ -56,23 +73,28 @@ def build_block_counterimage(block: _Block) -> List[_Vertex]:
     :param block: The block for which we intend to build the counterimage.
     """
 
-    block_counterimage = []
+    return build_vertexes_counterimage(block.vertexes)
+
+
+def build_vertexes_counterimage(vertexes: List[_Vertex]) -> List[_Vertex]:
+    """Construct the counterimage of the given set of vertexes with respect
+    to the binary relation :math:`E` (edges of the graph), without
+    duplicates.
+
+    :param vertexes: The vertexes for which we intend to build the
+        counterimage.
+    """
 
-    for vertex in block.vertexes:
-        for edge in vertex.counterimage:
-            counterimage_vertex = edge.source
+    epoch = new_epoch()
+    block_counterimage = []
 
+    for vertex in vertexes:
+        for counterimage_vertex in vertex.predecessors():
             # this vertex should be added to the counterimage only if necessary
             # (avoid duplicates)
-            if not counterimage_vertex.visited:
+            if counterimage_vertex.visit_epoch != epoch:
                 block_counterimage.append(counterimage_vertex)
-                # remember to release this vertex
-                counterimage_vertex.visit()
-
-    for vertex in block_counterimage:
-        # release this vertex so that it can be visited again in a next
-        # splitting phase
-        vertex.release()
+                counterimage_vertex.visit_epoch = epoch
 
     return block_counterimage
 
@@ -151,6 +173,9 @@ def dovier_piazza_policriti_partition(
         # OPTIMIZATION: if at the current rank we only have blocks of single
         # vertexes, skip this step.
         elif any(map(lambda block: block.size > 1, partition[partition_idx])):
+            # the subgraph of the vertexes at the current rank
+            subgraph_epoch = new_epoch()
+
             current_label = 0
             for block in partition[partition_idx]:
                 for vertex in block.vertexes:
@@ -158,19 +183,45 @@ def dovier_piazza_policriti_partition(
                     vertex.scale_label(current_label)
                     current_label += 1
 
-                    # exclude nodes having the wrong rank from the image and
-                    # counterimage of the vertex. from now they're gone
-                    # forever.
-                    vertex.restrict_to_subgraph(
-                        validation=lambda vx: vx.rank == vertex.rank
-                    )
+                    vertex.subgraph_epoch = subgraph_epoch
+
+            # PTA is going to skip the edges to/from nodes having the wrong
+            # rank, without copying the image and counterimage
+            for block in partition[partition_idx]:
+                for vertex in block.vertexes:
+                    vertex.restrict_to_subgraph(subgraph_epoch)
 
             # apply PTA to the subgraph at the current examined rank
             # CAREFUL: if you debug here, you'll see that there are some
             # "duplicate" nodes (nodes with the same label in different blocks
             # of the partition). this happens becaus of the SCALING (which is
             # used to pass a normal graph to PTA)
-            rscp = paige_tarjan_qblocks(partition[partition_idx])
+            # Paige-Tarjan requires a partition which is stable with respect
+            # to the whole subgraph (see preprocess_initial_partition):
+            # vertexes without successors at the current rank are separated
+            # from the others. blocks emptied by split_upper_ranks are
+            # removed from their block of X, otherwise Paige-Tarjan could
+            # choose one of them as splitter.
+            blocks = []
+            for block in partition[partition_idx]:
+                if block.size == 0:
+                    if block.xblock is not None:
+                        block.xblock.remove_qblock(block)
+                    continue
+                blocks.append(block)
+
+                leafs = [
+                    vertex
+                    for vertex in block.vertexes
+                    if not any(
+                        successor.subgraph_epoch == subgraph_epoch
+                        for successor in vertex.successors()
+                    )
+                ]
+                if 0 < len(leafs) < block.size:
+                    blocks.append(block.fast_mitosis(leafs))
+
+            rscp = paige_tarjan_qblocks(blocks, subgraph_epoch)
 
             # clear the partition at the current rank
             partition.clear_index(partition_idx)
@@ -209,7 +260,10 @@ def dovier_piazza_policriti(
     graph: nx.Graph,
     initial_partition: List[Tuple[int]] = None,
     is_integer_graph: bool = False,
-) -> List[Tuple]:
+    bulk_build: bool = False,
+    block_labels: bool = False,
+    rank: GraphRank = None,
+) -> Union[List[Tuple], BlockLabels]:
     """Compute the RSCP/maximum bisimulation of the given graph using
     *Dovier-Piazza-Policriti*'s algorithm.
 
@@ -230,34 +284,110 @@ def dovier_piazza_policriti(
         will probably make the function fail with an exception, or, even worse,
         return a wrong output.
 
-    :param graph: The input graph.
+    :param graph: The input graph (a `networkx.DiGraph`, or a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, a
+        :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`, a
+        `scipy.sparse` adjacency matrix, a
+        :class:`bispy.utilities.graph_file.MappedGraph` or the path of a
+        *BisPy* graph file). If the file was written by
+        :func:`bispy.utilities.graph_file.write_decorated_graph`, the stored
+        topological order of the images and the stored *rank* are used.
     :param initial_partition: The initial partition (or labeling set). Defaults
         to `None`, in which case the trivial labeling set (one block which
-        contains all the nodes) is used.
+        contains all the nodes) is used (or the one stored in the *BisPy*
+        graph file, if any).
     :param is_integer_graph: If `True`, we do not check if the given graph is
         integer (saves time). If `is_integer_graph` is `True` but the graph
         is not integer the output may be wrong. Defaults to False.
+    :param bulk_build: If `True`, the cyclic garbage collector is disabled
+        while the graph is decorated and refined (see
+        :func:`bispy.utilities.bulk_build.bulk_build_mode`). Recommended for
+        large graphs. Defaults to `False`.
+    :param block_labels: If `True`, the RSCP/maximum bisimulation is
+        returned as a :class:`bispy.utilities.block_labels.BlockLabels`
+        (the canonical block id of each node), which is cheaper to build and
+        to store than a list of tuples. If the graph is not integer, the
+        :math:`i`-th label corresponds to the :math:`i`-th node in
+        `graph.nodes`. Defaults to `False`.
+    :param rank: The precomputed *rank* of the graph (see
+        :func:`bispy.utilities.graph_rank.graph_rank`), which is not
+        computed again. Only integer graphs are supported. It **must** be the
+        rank of this exact graph, since only the number of nodes and edges
+        is checked. If the graph file stores the rank, the stored one is
+        used. Defaults to `None`.
     :returns: The RSCP/maximum bisimulation of the given labeling set as a
-        list of tuples, each of which contains bisimilar nodes.
+        list of tuples, each of which contains bisimilar nodes (or as a
+        :class:`bispy.utilities.block_labels.BlockLabels` if `block_labels`
+        is `True`).
     """
 
-    if not isinstance(graph, nx.DiGraph):
-        raise Exception("graph should be a directed graph (nx.DiGraph)")
+    if isinstance(graph, (str, os.PathLike)):
+        with open_graph_file(graph) as mapped_graph:
+            return dovier_piazza_policriti(
+                mapped_graph,
+                initial_partition,
+                is_integer_graph,
+                bulk_build,
+                block_labels,
+                rank,
+            )
+    if isinstance(graph, MappedGraph) and graph.is_decorated:
+        # the decoration stored in the file is reused, the rank stored in the
+        # file is the one of this graph
+        check_graph_rank(rank, graph)
+        with bulk_build_mode(bulk_build):
+            vertexes, _ = decorate_mapped_graph(
+                graph, initial_partition, edge_objects=False
+            )
+            rscp = _decorated_graph_rscp(vertexes)
+        if block_labels:
+            return BlockLabels.from_partition(rscp, len(vertexes))
+        return rscp
 
-    # if True, the input graph is already an integer graph
-    original_graph_is_integer = is_integer_graph or check_normal_integer_graph(
-        graph
-    )
+    # BisPy graph files are mapped in memory, scipy.sparse adjacency
+    # matrixes are read without any copy
+    with as_mapped_graph_input(graph, initial_partition) as (
+        graph,
+        initial_partition,
+    ):
+        graph = as_csr_graph(graph)
+
+        if not isinstance(graph, (nx.DiGraph, CSRGraph, EdgeArrayGraph)):
+            raise Exception(
+                "graph should be a directed graph (nx.DiGraph, CSRGraph or "
+                "EdgeArrayGraph)"
+            )
+
+        # if True, the input graph is already an integer graph
+        original_graph_is_integer = (
+            is_integer_graph or check_normal_integer_graph(graph)
+        )
 
-    if not original_graph_is_integer:
-        # convert the graph to an "integer" graph
-        integer_graph, node_to_idx = convert_to_integer_graph(graph)
-    else:
-        integer_graph = graph
+        if not original_graph_is_integer:
+            if rank is not None:
+                raise ValueError("A precomputed rank needs an integer graph")
+            # convert the graph to an "integer" graph
+            integer_graph, node_to_idx = convert_to_integer_graph(graph)
+        else:
+            integer_graph = graph
+
+        with bulk_build_mode(bulk_build):
+            vertexes, _ = decorate_nx_graph(
+                integer_graph, initial_partition, edge_objects=False, rank=rank
+            )
+            rscp = _decorated_graph_rscp(vertexes)
+
+        if block_labels:
+            return BlockLabels.from_partition(rscp, len(vertexes))
+        if original_graph_is_integer:
+            return rscp
+        else:
+            return back_to_original(rscp, node_to_idx)
 
-    vertexes, _ = decorate_nx_graph(integer_graph, initial_partition)
-    partition = RankedPartition(vertexes)
 
+def _decorated_graph_rscp(vertexes: List[_Vertex]) -> List[Tuple]:
+    # apply the algorithm to a decorated integer graph
+    partition = RankedPartition(vertexes)
     tp = dovier_piazza_policriti_partition(partition)
     collapsed_partition, collapse_map = tp
 
@@ -266,8 +396,8 @@ def dovier_piazza_policriti(
     rscp = []
     for rank in collapsed_partition:
         for block in rank:
-            if block.vertexes.size > 0:
-                block_survivor_node = block.vertexes.first.value
+            if block.size > 0:
+                block_survivor_node = block.vertexes[0]
                 block_vertexes = [block_survivor_node.label]
 
                 if collapse_map[block_survivor_node.label] is not None:
@@ -279,8 +409,46 @@ def dovier_piazza_policriti(
                     )
 
                 rscp.append(tuple(block_vertexes))
+    return rscp
+
+
+def dovier_piazza_policriti_from_arrays(
+    nvertexes: int,
+    sources,
+    targets,
+    labels=None,
+    bulk_build: bool = False,
+    block_labels: bool = False,
+) -> Union[List[Tuple], BlockLabels]:
+    """Compute the RSCP/maximum bisimulation of the *integer* graph whose
+    nodes are :math:`0, \\dots, \\textit{nvertexes}-1` and whose edges are
+    :math:`\\langle \\textit{sources}[i], \\textit{targets}[i] \\rangle`
+    using *Dovier-Piazza-Policriti*'s algorithm. The *BisPy* representation
+    of the graph is built directly from the arrays (see
+    :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`), without any
+    `networkx.DiGraph`.
+
+        >>> dovier_piazza_policriti_from_arrays(4, [0, 1], [2, 3])
+        [(2, 3), (0, 1)]
+
+    :param nvertexes: The number of nodes in the graph.
+    :param sources: Sources of the edges (a list, an `array.array` or a
+        *NumPy* array of integers).
+    :param targets: Destinations of the edges (same length of `sources`).
+    :param labels: The label of each node, nodes having different labels
+        cannot be bisimilar (see
+        :func:`bispy.utilities.edge_arrays.labels_to_partition`). Defaults to
+        `None`, in which case the trivial labeling set is used.
+    :param bulk_build: See :func:`dovier_piazza_policriti`. Defaults to
+        `False`.
+    :returns: The RSCP/maximum bisimulation of the given labeling set as a
+        list of tuples, each of which contains bisimilar nodes.
+    """
 
-    if original_graph_is_integer:
-        return rscp
-    else:
-        return back_to_original(rscp, node_to_idx)
+    return dovier_piazza_policriti(
+        EdgeArrayGraph(nvertexes, sources, targets),
+        None if labels is None else labels_to_partition(labels),
+        is_integer_graph=True,
+        bulk_build=bulk_build,
+        block_labels=block_labels,
+    )
@@ -1,18 +1,20 @@
-from llist import dllist, dllistnode
-from typing import List, Dict, Any, Tuple, Iterable
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Union
 import networkx as nx
+from operator import attrgetter
 
 from bispy.utilities.graph_entities import (
     _Vertex,
     _XBlock,
     _QBlock,
-    _Count,
+    new_epoch,
 )
 from bispy.paige_tarjan.compound_xblocks_container import (
     CompoundXBlocksContainer,
 )
+from bispy.paige_tarjan.refinement_pool import RefinementPool, ScratchBuffer
 from bispy.utilities.graph_decorator import (
     decorate_nx_graph,
+    iter_blocks,
     preprocess_initial_partition,
     to_tuple_list,
 )
@@ -20,7 +22,17 @@ from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
     convert_to_integer_graph,
     back_to_original,
+    inverse_mapping,
 )
+from bispy.utilities.csr_graph import CSRGraph
+from bispy.utilities.edge_arrays import EdgeArrayGraph, labels_to_partition
+from bispy.utilities.sparse_matrix import as_csr_graph
+from bispy.utilities.graph_file import as_mapped_graph_input
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.block_labels import BlockLabels
+from bispy.utilities.quotient_graph import quotient_graph
+
+_edge_count = attrgetter("count")
 
 
 # choose the smallest qblock of the first two
@@ -33,54 +45,70 @@ def extract_splitter(compound_block: _XBlock) -> _QBlock:
     compound_block: A compound block in the partition `X`.
     """
 
-    first_qblock = compound_block.qblocks.first
-    if first_qblock.value.size <= first_qblock.next.value.size:
-        compound_block.remove_qblock(first_qblock.value)
-        return first_qblock.value
+    first_qblock, second_qblock = compound_block.qblocks[:2]
+    if first_qblock.size <= second_qblock.size:
+        compound_block.remove_qblock(first_qblock)
+        return first_qblock
     else:
-        qblock = first_qblock.next.value
-        compound_block.remove_qblock(qblock)
-        return qblock
+        compound_block.remove_qblock(second_qblock)
+        return second_qblock
 
 
 # construct a list of the nodes in the counterimage of qblock to be used in the
 # split-phase.
 # this also updates count(x,qblock) = |qblock \cap E({x})| (because qblock is
 # going to become a new xblock).
-# remember to reset the value of aux_count after the refinement
-def build_block_counterimage(B_qblock: _QBlock) -> List[_Vertex]:
+def build_block_counterimage(
+    B_qblock: _QBlock,
+    subgraph_epoch: int = None,
+    buffer: ScratchBuffer = None,
+) -> List[_Vertex]:
     """Given a block :math:`B  \\in Q`, construct the :math:`E^{-1}(B)`.
     This function also sets `vertex.aux_count` and increases it by one for each
     visited vertex in order to find the value :math:`|B \\cap E({vertex})|`,
     where :math:`E` is the edge relation (:math:`\\to`) of the graph.
+    `vertex.aux_count` is a new slot of `vertex.count_table`, which holds the
+    value. Visited vertexes are stamped with a new epoch, therefore the slot
+    left in `vertex.aux_count` by a previous call is ignored.
 
     :param B_qblock: A block of :math:`Q`.
+    :param subgraph_epoch: If not `None`, only the vertexes of the subgraph
+        identified by this epoch are considered (see
+        :func:`bispy.utilities.graph_entities._Vertex.restrict_to_subgraph`).
+        Defaults to `None`.
+    :param buffer: If not `None`, the counterimage is stored into this
+        (empty) buffer, which is returned in place of a new list. Defaults
+        to `None`.
     """
 
-    qblock_counterimage = []
+    epoch = new_epoch()
+    if buffer is None:
+        qblock_counterimage = []
+    else:
+        qblock_counterimage = buffer
 
     for vertex in B_qblock.vertexes:
-        for edge in vertex.counterimage:
-            counterimage_vertex = edge.source
+        for counterimage_vertex in vertex.predecessors():
+            # skip the edges which do not belong to the subgraph
+            if (
+                subgraph_epoch is not None
+                and counterimage_vertex.subgraph_epoch != subgraph_epoch
+            ):
+                continue
 
             # this vertex should be added to the counterimage only if necessary
-            # (avoid duplicates)
-            if not counterimage_vertex.visited:
+            # (avoid duplicates). if this is the first time we found a
+            # destination in qblock for whom this node is a source, create a
+            # new instance of Count.
+            if counterimage_vertex.visit_epoch != epoch:
+                counterimage_vertex.visit_epoch = epoch
                 qblock_counterimage.append(counterimage_vertex)
-                # remember to release this vertex
-                counterimage_vertex.visit()
-
-            # if this is the first time we found a destination in qblock for
-            # whom this node is a source, create a new instance of Count.
-            # remember to set it to None
-            if not counterimage_vertex.aux_count:
-                counterimage_vertex.aux_count = _Count(counterimage_vertex)
-            counterimage_vertex.aux_count.value += 1
-
-    for vertex in qblock_counterimage:
-        # release this vertex so that it can be visited again in a next
-        # splitting phase
-        vertex.release()
+                counterimage_vertex.aux_count = (
+                    counterimage_vertex.count_table.new_slot()
+                )
+            counterimage_vertex.count_table.values[
+                counterimage_vertex.aux_count
+            ] += 1
 
     return qblock_counterimage
 
@@ -91,6 +119,8 @@ def build_block_counterimage(B_qblock: _QBlock) -> List[_Vertex]:
 # build_splitter_counterimage before, which sets aux_count.
 def build_exclusive_B_counterimage(
     B_qblock_vertexes: List[_Vertex],
+    subgraph_epoch: int = None,
+    buffer: ScratchBuffer = None,
 ) -> List[_Vertex]:
     """Given a block :math:`B \\in Q`, generate the "exclusive counterimage" of
     :math:`B`, namely the set :math:`E^{-1}(B) - E^{-1}(S-B)`, where :math:`E`
@@ -101,25 +131,44 @@ def build_exclusive_B_counterimage(
 
     :param B_qblock_vertexes: A block of :math:`Q` represented by the list of
         its vertexes.
+    :param subgraph_epoch: If not `None`, only the vertexes of the subgraph
+        identified by this epoch are considered. Defaults to `None`.
+    :param buffer: If not `None`, the result is stored into this (empty)
+        buffer, which is returned in place of a new list. Defaults to
+        `None`.
     """
 
-    splitter_counterimage = []
+    epoch = new_epoch()
+    if buffer is None:
+        splitter_counterimage = []
+    else:
+        splitter_counterimage = buffer
 
     for vertex in B_qblock_vertexes:
-        for edge in vertex.counterimage:
-            if not edge.source.in_second_splitter:
+        if vertex.edge_objects:
+            slots = map(_edge_count, vertex.counterimage)
+        else:
+            slots = vertex.counterimage_counts
+
+        for source, slot in zip(vertex.predecessors(), slots):
+            if (
+                subgraph_epoch is not None
+                and source.subgraph_epoch != subgraph_epoch
+            ):
+                continue
+
+            if source.second_splitter_epoch != epoch:
+                counts = source.count_table.values
+
                 # determine count(vertex,B) = |B \cap E({vertex})|
-                count_B = edge.source.aux_count
+                count_B = counts[source.aux_count]
 
                 # determine count(vertex,S) = |S \cap E({vertex})|
-                count_S = edge.count
-
-                if count_B.value == count_S.value:
-                    splitter_counterimage.append(edge.source)
-                    edge.source.added_to_second_splitter()
+                count_S = counts[slot]
 
-    for vertex in splitter_counterimage:
-        vertex.clear_second_splitter_flag()
+                if count_B == count_S:
+                    splitter_counterimage.append(source)
+                    source.second_splitter_epoch = epoch
 
     return splitter_counterimage
 
@@ -127,11 +176,16 @@ def build_exclusive_B_counterimage(
 # perform a Split with respect to B_qblock
 def split(
     vertexes: List[_Vertex],
+    pool: RefinementPool = None,
 ) -> Tuple[List[_QBlock], List[_XBlock], List[_QBlock]]:
     """Given a list of vertexes, use them as *splitter* set for the current
     partition :math:`Q`. This function doesn't modify the partition.
 
     :param vertexes: A list of vertexes.
+    :param pool: If not `None`, helper blocks are taken from this pool. A
+        block whose vertexes are all in `vertexes` is not split: it keeps its
+        vertexes, it isn't returned among the new blocks, and its helper block
+        goes back to the pool. Defaults to `None`.
     :returns: A tuple whose items are:
 
         0. The new blocks of :math:`Q`;
@@ -160,7 +214,7 @@ def split(
         # create the helper qblock
         if not qblock.split_helper_block:
             changed_qblocks.append(qblock)
-            qblock.initialize_split_helper_block()
+            qblock.initialize_split_helper_block(pool)
 
         new_qblock = qblock.split_helper_block
 
@@ -170,10 +224,17 @@ def split(
     new_qblocks = []
     for qblock in changed_qblocks:
         helper_qblock = qblock.split_helper_block
-        helper_qblock.is_new_qblock = True
-
         qblock.reset_helper_block()
 
+        # Q \subseteq E^{-1}(B): give the vertexes back to the old qblock and
+        # recycle the helper, which would replace an empty qblock
+        if qblock.size == 0 and pool is not None:
+            qblock.exchange_vertexes(helper_qblock)
+            qblock.xblock.remove_qblock(helper_qblock)
+            pool.release_qblock(helper_qblock)
+            continue
+
+        helper_qblock.is_new_qblock = True
         new_qblocks.append(helper_qblock)
 
         # if the old qblock has been made empty by the split
@@ -186,7 +247,7 @@ def split(
             # NOTE: it's essential that helper_block is added to xblock only in
             # this loop, because otherwise the size of a new compound block
             # can't be forecasted precisely
-            if qblock.xblock.qblocks.size == 2:
+            if qblock.xblock.size == 2:
                 new_compound_xblocks.append(qblock.xblock)
 
     return (new_qblocks, new_compound_xblocks, changed_qblocks)
@@ -196,7 +257,7 @@ def split(
 # b belongs to. Note that B_block is a new _XBlock at the end of refine. We
 # decrement the count for the edge because B isn't in S anymore (S was replaced
 # with B, S-B indeed).
-def update_counts(B_block_vertexes: List[_Vertex]):
+def update_counts(B_block_vertexes: List[_Vertex], subgraph_epoch: int = None):
     """After a block :math:`B \\in Q` has become a (non-compound) block of
     :math:`X` on its own (it was removed from a compound block of :math:`X`) we
     need to decrease by one the quantity `count(x`, :math:`S`) (which is now
@@ -204,22 +265,53 @@ def update_counts(B_block_vertexes: List[_Vertex]):
 
     :param B_block_vertexes: A block of :math:`Q` which is also a block of
         :math:`S`, represented by its vertexes.
+    :param subgraph_epoch: If not `None`, only the vertexes of the subgraph
+        identified by this epoch are considered. Defaults to `None`.
     """
 
     for vertex in B_block_vertexes:
         # edge.destination is inside B now. We must decrement
         # count(edge.source, S) by for each vertex y \in B such that
         # edge.source -> y
-        for edge in vertex.counterimage:
+        # with compact adjacency the slots are in a parallel array
+        compact_slots = (
+            None if vertex.edge_objects else vertex.counterimage_counts
+        )
+
+        for idx, edge in enumerate(vertex.counterimage):
+            if compact_slots is None:
+                source = edge.source
+                slot = edge.count
+            else:
+                source = edge
+                slot = compact_slots[idx]
+
+            if (
+                subgraph_epoch is not None
+                and source.subgraph_epoch != subgraph_epoch
+            ):
+                continue
+
+            count_table = source.count_table
+
             # decrement count(x,S) since we removed B from S
-            edge.count.value -= 1
+            count_table.values[slot] -= 1
+            # if count(x,S-B) = 0 no edge refers to this slot anymore
+            if count_table.values[slot] == 0:
+                count_table.release_slot(slot)
 
             # set edge.count to count(x,B)
-            edge.count = edge.source.aux_count
+            if compact_slots is None:
+                edge.count = source.aux_count
+            else:
+                compact_slots[idx] = source.aux_count
 
 
 def refine(
-    compound_xblocks: CompoundXBlocksContainer, xblocks: List[_XBlock]
+    compound_xblocks: CompoundXBlocksContainer,
+    xblocks: List[_XBlock],
+    subgraph_epoch: int = None,
+    pool: RefinementPool = None,
 ) -> Tuple[List[_XBlock], List[_QBlock]]:
     """Perform a refinement step of the *Paige-Tarjan* algorithm.
 
@@ -232,6 +324,11 @@ def refine(
         .. seealso:: modules :py:mod:`bispy.saha.ranked_pta`
 
     :param xblocks: The partition :math:`X`.
+    :param subgraph_epoch: If not `None`, the refinement is restricted to the
+        subgraph identified by this epoch. Defaults to `None`.
+    :param pool: If not `None`, helper blocks and counterimages are taken
+        from this pool, which also counts the refinement steps. Defaults to
+        `None`.
     :returns: A tuple whose items are:
 
         0. The new partition :math:`X`;
@@ -247,10 +344,16 @@ def refine(
     # extract a random compound xblock
     S_compound_xblock = compound_xblocks.pop()
     # select the right qblock from this compound xblock
-    # note that the dllistonodes in this list will most likely be outdated
-    # after the first split
     B_qblock = extract_splitter(S_compound_xblock)
-    B_qblock_vertexes = [vertex for vertex in B_qblock.vertexes]
+    # B_qblock is going to be modified by the split, take a snapshot of its
+    # vertexes
+    if pool is None:
+        B_qblock_vertexes = list(B_qblock.vertexes)
+    else:
+        pool.refine_steps += 1
+        B_qblock_vertexes = pool.buffer(pool.splitter_vertexes).fill(
+            B_qblock.vertexes
+        )
 
     # step 2 (update X)
     # if S_compound_xblock is still compund, put it back in compound_xblocks
@@ -264,10 +367,16 @@ def refine(
     xblocks.append(B_xblock)
 
     # step 3 (compute E^{-1}(B))
-    B_counterimage = build_block_counterimage(B_qblock)
+    B_counterimage = build_block_counterimage(
+        B_qblock,
+        subgraph_epoch,
+        None if pool is None else pool.buffer(pool.counterimage),
+    )
 
     # step 4 (refine Q with respect to B)
-    new_qblocks_from_split1, new_compound_xblocks, _ = split(B_counterimage)
+    new_qblocks_from_split1, new_compound_xblocks, _ = split(
+        B_counterimage, pool
+    )
     new_qblocks.extend(new_qblocks_from_split1)
     compound_xblocks.extend(new_compound_xblocks)
 
@@ -276,37 +385,51 @@ def refine(
     # note that, since we are employing the strategy proposed in the paper,
     # we don't even need to pass the XBlock S
     second_splitter_counterimage = build_exclusive_B_counterimage(
-        B_qblock_vertexes
+        B_qblock_vertexes,
+        subgraph_epoch,
+        None if pool is None else pool.buffer(pool.exclusive_counterimage),
     )
 
     # step 6
     new_qblocks_from_split2, new_compound_xblocks, _ = split(
-        second_splitter_counterimage
+        second_splitter_counterimage, pool
     )
     new_qblocks.extend(new_qblocks_from_split2)
     compound_xblocks.extend(new_compound_xblocks)
 
     # step 7
-    update_counts(B_qblock_vertexes)
-
-    # reset aux_count
-    # we only care about the vertexes in B_counterimage since we only set
-    # aux_count for those vertexes x such that |E({x}) \cap B_qblock| > 0
-    for vertex in B_counterimage:
-        vertex.aux_count = None
+    update_counts(B_qblock_vertexes, subgraph_epoch)
 
     return (xblocks, new_qblocks)
 
 
 # returns a list of labels splitted in partitions
-def paige_tarjan_qblocks(q_partition: List[_QBlock]) -> List[_QBlock]:
+def paige_tarjan_qblocks(
+    q_partition: List[_QBlock],
+    subgraph_epoch: int = None,
+    pool: RefinementPool = None,
+) -> List[_QBlock]:
     """Apply the *Paige-Tarjan* algorithm to the partition :math:`Q`, which
         is considered a labeling set (namely two vertexes in different
         blocks of the initial partition cannot be bisimilar).
 
     :param q_partition: The initial partition (labeling set).
+    :param subgraph_epoch: If not `None`, the algorithm is applied to the
+        subgraph identified by this epoch (see
+        :func:`bispy.utilities.graph_entities._Vertex.restrict_to_subgraph`),
+        whose vertexes must be the vertexes in `q_partition`. Edges having
+        an endpoint outside the subgraph are skipped without any copy.
+        Defaults to `None`.
+    :param pool: The
+        :class:`bispy.paige_tarjan.refinement_pool.RefinementPool` used by
+        the refinement steps. Pass an instance to inspect the number of
+        allocations avoided after the computation. Defaults to `None`, in
+        which case a new pool is created.
     :returns: The RSCP/maximum bisimulation of the given labeling set.
     """
+    if pool is None:
+        pool = RefinementPool()
+
     # initially, there's only one block in the partition X, the one which
     # contains each block in Q
     x_partition = [q_partition[0].xblock]
@@ -319,7 +442,10 @@ def paige_tarjan_qblocks(q_partition: List[_QBlock]) -> List[_QBlock]:
 
     while compound_xblocks:
         x_partition, new_qblocks = refine(
-            compound_xblocks=compound_xblocks, xblocks=x_partition
+            compound_xblocks=compound_xblocks,
+            xblocks=x_partition,
+            subgraph_epoch=subgraph_epoch,
+            pool=pool,
         )
         q_partition.extend(new_qblocks)
 
@@ -329,11 +455,73 @@ def paige_tarjan_qblocks(q_partition: List[_QBlock]) -> List[_QBlock]:
     ]
 
 
+def _decorate_and_refine(
+    graph, initial_partition, is_integer_graph: bool
+) -> Tuple[List[_Vertex], List[_QBlock], Union[None, Dict[Any, int]]]:
+    # normalize and decorate the input graph, and compute its RSCP. returns
+    # the vertexes, the RSCP and the mapping used to obtain the integer graph
+    # (None if the graph was already integer)
+
+    # BisPy graph files are mapped in memory, scipy.sparse adjacency
+    # matrixes are read without any copy
+    with as_mapped_graph_input(graph, initial_partition) as (
+        graph,
+        initial_partition,
+    ):
+        graph = as_csr_graph(graph)
+
+        if not isinstance(graph, (nx.DiGraph, CSRGraph, EdgeArrayGraph)):
+            raise Exception(
+                "graph should be a directed graph (nx.DiGraph, CSRGraph or "
+                "EdgeArrayGraph)"
+            )
+
+        # if True, the input graph is already an integer graph
+        original_graph_is_integer = (
+            is_integer_graph or check_normal_integer_graph(graph)
+        )
+
+        # if initial_partition is None, then it's the trivial partition
+        if initial_partition is None:
+            # only list(graph.nodes) isn't OK
+            initial_partition = [list(graph.nodes)]
+
+        if not original_graph_is_integer:
+            # convert the graph to an "integer" graph
+            integer_graph, node_to_idx = convert_to_integer_graph(graph)
+
+            # convert the initial partition to a integer partition
+            integer_initial_partition = [
+                [node_to_idx[old_node] for old_node in block]
+                for block in initial_partition
+            ]
+        else:
+            integer_graph = graph
+            integer_initial_partition = initial_partition
+
+        vertexes, q_partition = decorate_nx_graph(
+            integer_graph,
+            integer_initial_partition,
+            topological_sorted_images=False,
+            compute_rank=False,
+            lightweight=True,
+            edge_objects=False,
+        )
+        rscp = paige_tarjan_qblocks(q_partition)
+
+        if original_graph_is_integer:
+            return vertexes, rscp, None
+        else:
+            return vertexes, rscp, node_to_idx
+
+
 def paige_tarjan(
     graph: nx.Graph,
     initial_partition: Iterable[Iterable[int]] = None,
     is_integer_graph: bool = False,
-) -> List[Tuple]:
+    bulk_build: bool = False,
+    block_labels: bool = False,
+) -> Union[List[Tuple], BlockLabels]:
     """Compute the RSCP/maximum bisimulation of the given graph using
     *Paige-Tarjan*'s algorithm, with the given initial partition
     (or *labeling set*, two vertexes in different blocks of the initial
@@ -355,55 +543,176 @@ def paige_tarjan(
         will probably make the function fail with an exception, or, even worse,
         return a wrong output.
 
-    :param graph: The input graph.
+    :param graph: The input graph (a `networkx.DiGraph`, or a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, a
+        :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`, a
+        `scipy.sparse` adjacency matrix, a
+        :class:`bispy.utilities.graph_file.MappedGraph` or the path of a
+        *BisPy* graph file).
     :param initial_partition: The initial partition (or labeling set). Defaults
         to `None`, in which case the trivial labeling set (one block which
-        contains all the nodes) is used.
+        contains all the nodes) is used (or the one stored in the *BisPy*
+        graph file, if any).
     :param is_integer_graph: If `True`, the function assumes that
         the graph is integer, and skips the integer check (may slightly
         improve performance). Defaults to `False`.
+    :param bulk_build: If `True`, the cyclic garbage collector is disabled
+        while the graph is decorated and refined (see
+        :func:`bispy.utilities.bulk_build.bulk_build_mode`). Recommended for
+        large graphs. Defaults to `False`.
+    :param block_labels: If `True`, the RSCP/maximum bisimulation is
+        returned as a :class:`bispy.utilities.block_labels.BlockLabels`
+        (the canonical block id of each node), which is cheaper to build and
+        to store than a list of tuples. If the graph is not integer, the
+        :math:`i`-th label corresponds to the :math:`i`-th node in
+        `graph.nodes`. Defaults to `False`.
     :returns: The RSCP/maximum bisimulation of the given labeling set as a
-        list of tuples, each of which contains bisimilar nodes.
+        list of tuples, each of which contains bisimilar nodes (or as a
+        :class:`bispy.utilities.block_labels.BlockLabels` if `block_labels`
+        is `True`).
     """
 
-    if not isinstance(graph, nx.DiGraph):
-        raise Exception("graph should be a directed graph (nx.DiGraph)")
+    with bulk_build_mode(bulk_build):
+        vertexes, rscp, node_to_idx = _decorate_and_refine(
+            graph, initial_partition, is_integer_graph
+        )
+        if block_labels:
+            return BlockLabels.from_vertexes(vertexes)
+        integer_rscp = to_tuple_list(rscp)
 
-    # if True, the input graph is already an integer graph
-    original_graph_is_integer = is_integer_graph or check_normal_integer_graph(
-        graph
-    )
+    if node_to_idx is None:
+        return integer_rscp
+    else:
+        return back_to_original(integer_rscp, node_to_idx)
 
-    # if initial_partition is None, then it's the trivial partition
-    if initial_partition is None:
-        # only list(graph.nodes) isn't OK
-        initial_partition = [list(graph.nodes)]
 
-    if not original_graph_is_integer:
-        # convert the graph to an "integer" graph
-        integer_graph, node_to_idx = convert_to_integer_graph(graph)
+def paige_tarjan_iter(
+    graph: nx.Graph,
+    initial_partition: Iterable[Iterable[int]] = None,
+    is_integer_graph: bool = False,
+    bulk_build: bool = False,
+) -> Iterator[Tuple]:
+    """Compute the RSCP/maximum bisimulation of the given graph using
+    *Paige-Tarjan*'s algorithm (see :func:`paige_tarjan`), and yield its
+    blocks one at a time (translated back to the original nodes if the
+    graph is not integer) instead of building the whole list of tuples.
+
+    The internal representation of the graph is released progressively
+    while the blocks are consumed (see
+    :func:`bispy.utilities.graph_decorator.iter_blocks`), therefore this is
+    useful to stream the blocks of a very big graph to a file.
+
+        >>> for block in paige_tarjan_iter(graph):
+        ...     file.write(" ".join(map(str, block)) + "\\n")
+
+    :param graph: The input graph, see :func:`paige_tarjan`.
+    :param initial_partition: The initial partition (or labeling set), see
+        :func:`paige_tarjan`.
+    :param is_integer_graph: See :func:`paige_tarjan`. Defaults to `False`.
+    :param bulk_build: See :func:`paige_tarjan`. Defaults to `False`.
+    :returns: An iterator over the blocks of the RSCP/maximum bisimulation
+        of the given labeling set. The computation takes place when the
+        first block is requested.
+    """
 
-        # convert the initial partition to a integer partition
-        integer_initial_partition = [
-            [node_to_idx[old_node] for old_node in block]
-            for block in initial_partition
-        ]
+    with bulk_build_mode(bulk_build):
+        vertexes, rscp, node_to_idx = _decorate_and_refine(
+            graph, initial_partition, is_integer_graph
+        )
+    # from now on the only references to the blocks are kept by `rscp`
+    del vertexes
+
+    if node_to_idx is None:
+        idx_to_node = None
     else:
-        integer_graph = graph
-        integer_initial_partition = initial_partition
-
-    vertexes, q_partition = decorate_nx_graph(
-        integer_graph,
-        integer_initial_partition,
-        topological_sorted_images=False,
-        compute_rank=False,
-    )
-    xblock = q_partition[0].xblock
+        idx_to_node = inverse_mapping(node_to_idx)
+        del node_to_idx
 
-    rscp = paige_tarjan_qblocks(q_partition)
-    integer_rscp = to_tuple_list(rscp)
+    yield from iter_blocks(rscp, idx_to_node)
 
-    if original_graph_is_integer:
-        return integer_rscp
-    else:
-        return back_to_original(integer_rscp, node_to_idx)
+
+def paige_tarjan_quotient(
+    graph: nx.Graph,
+    initial_partition: Iterable[Iterable[int]] = None,
+    is_integer_graph: bool = False,
+    bulk_build: bool = False,
+    networkx_graph: bool = False,
+) -> Tuple[List[Tuple], Union[CSRGraph, nx.DiGraph]]:
+    """Compute the RSCP/maximum bisimulation of the given graph using
+    *Paige-Tarjan*'s algorithm (see :func:`paige_tarjan`), and the
+    corresponding quotient (minimized) graph, which is built from the
+    internal representation of the graph (see
+    :func:`bispy.utilities.quotient_graph.quotient_graph`).
+
+        >>> rscp, quotient = paige_tarjan_quotient(graph)
+
+    :param graph: The input graph, see :func:`paige_tarjan`.
+    :param initial_partition: The initial partition (or labeling set), see
+        :func:`paige_tarjan`.
+    :param is_integer_graph: See :func:`paige_tarjan`. Defaults to `False`.
+    :param bulk_build: See :func:`paige_tarjan`. Defaults to `False`.
+    :param networkx_graph: If `True`, the quotient is returned as a
+        `networkx.DiGraph`. Defaults to `False`, in which case the quotient
+        is a :class:`bispy.utilities.csr_graph.CSRGraph`.
+    :returns: A tuple whose items are:
+
+        0. The RSCP/maximum bisimulation of the given labeling set as a
+           list of tuples;
+        1. The quotient graph, whose :math:`i`-th node is the :math:`i`-th
+           block of the RSCP.
+    """
+
+    with bulk_build_mode(bulk_build):
+        vertexes, rscp, node_to_idx = _decorate_and_refine(
+            graph, initial_partition, is_integer_graph
+        )
+        quotient = quotient_graph(rscp, networkx_graph=networkx_graph)
+        integer_rscp = to_tuple_list(rscp)
+
+    if node_to_idx is not None:
+        integer_rscp = back_to_original(integer_rscp, node_to_idx)
+    return integer_rscp, quotient
+
+
+def paige_tarjan_from_arrays(
+    nvertexes: int,
+    sources,
+    targets,
+    labels=None,
+    bulk_build: bool = False,
+    block_labels: bool = False,
+) -> Union[List[Tuple], BlockLabels]:
+    """Compute the RSCP/maximum bisimulation of the *integer* graph whose
+    nodes are :math:`0, \\dots, \\textit{nvertexes}-1` and whose edges are
+    :math:`\\langle \\textit{sources}[i], \\textit{targets}[i] \\rangle`
+    using *Paige-Tarjan*'s algorithm. The *BisPy* representation of the
+    graph is built directly from the arrays (see
+    :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`), without any
+    `networkx.DiGraph`.
+
+        >>> paige_tarjan_from_arrays(4, [0, 1], [2, 3])
+        [(0, 1), (2, 3)]
+
+    :param nvertexes: The number of nodes in the graph.
+    :param sources: Sources of the edges (a list, an `array.array` or a
+        *NumPy* array of integers).
+    :param targets: Destinations of the edges (same length of `sources`).
+    :param labels: The label of each node, nodes having different labels
+        cannot be bisimilar (see
+        :func:`bispy.utilities.edge_arrays.labels_to_partition`). Defaults to
+        `None`, in which case the trivial labeling set is used.
+    :param bulk_build: See :func:`paige_tarjan`. Defaults to `False`.
+    :param block_labels: See :func:`paige_tarjan`. Defaults to `False`.
+    :returns: The RSCP/maximum bisimulation of the given labeling set as a
+        list of tuples, each of which contains bisimilar nodes (or as a
+        :class:`bispy.utilities.block_labels.BlockLabels` if `block_labels`
+        is `True`).
+    """
+
+    return paige_tarjan(
+        EdgeArrayGraph(nvertexes, sources, targets),
+        None if labels is None else labels_to_partition(labels),
+        is_integer_graph=True,
+        bulk_build=bulk_build,
+        block_labels=block_labels,
+    )
@@ -0,0 +1,217 @@
+from itertools import islice
+from typing import Iterable
+
+
+class ScratchBuffer:
+    """A list-like container which keeps its storage among the refinement
+    steps of *Paige-Tarjan*'s algorithm. Clearing the buffer only resets its
+    length, therefore the storage grows only when a refinement step needs
+    more items than any previous step, and afterwards no allocation is
+    needed.
+
+    Items beyond the current length are stale and are never returned.
+
+    Each call to :meth:`clear` starts a new use of the buffer. The buffer
+    counts the uses which didn't need to grow its storage, apart from the
+    first one (see :attr:`reuses`).
+
+    :param capacity: The initial number of items which the buffer can hold
+        without growing. Defaults to 0.
+    """
+
+    __slots__ = ("_items", "_length", "_uses", "_allocating_uses", "_grown")
+
+    def __init__(self, capacity: int = 0):
+        self._items = [None] * capacity
+        self._length = 0
+
+        self._uses = 0
+        # uses which allocated storage (the first one, and the ones which
+        # made the buffer grow)
+        self._allocating_uses = 0
+        # True if the current use already counts as an allocating use
+        self._grown = False
+
+    def clear(self):
+        """Empty the buffer, keeping its storage."""
+        self._length = 0
+
+        self._uses += 1
+        # the first use is never a reuse
+        self._grown = self._uses == 1
+        if self._grown:
+            self._allocating_uses += 1
+
+    def append(self, item):
+        """Append an item to the buffer.
+
+        :param item: The new item.
+        """
+
+        if self._length == len(self._items):
+            self._items.append(item)
+            if not self._grown:
+                self._grown = True
+                self._allocating_uses += 1
+        else:
+            self._items[self._length] = item
+        self._length += 1
+
+    def fill(self, items: Iterable):
+        """Replace the content of the buffer with the given items.
+
+        :param items: The new content of the buffer.
+        :returns: `self`.
+        :rtype: ScratchBuffer
+        """
+
+        self._length = 0
+        for item in items:
+            self.append(item)
+        return self
+
+    @property
+    def capacity(self) -> int:
+        """The number of items which the buffer can hold without growing."""
+        return len(self._items)
+
+    @property
+    def reuses(self) -> int:
+        """The number of uses of the buffer (apart from the first one) which
+        didn't need to grow its storage."""
+        return self._uses - self._allocating_uses
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return islice(self._items, self._length)
+
+    def __repr__(self):
+        return "ScratchBuffer({})".format(list(self))
+
+
+class RefinementPool:
+    """Blocks of :math:`Q` and scratch buffers owned by a run of
+    *Paige-Tarjan*'s algorithm, reused among its refinement steps.
+
+    A *split* which moves all the vertexes of a block into its helper block
+    does not split anything: in that case the vertexes are given back to the
+    original block and the helper block returns to the pool, where it waits
+    for the next call to
+    :func:`bispy.utilities.graph_entities._LightQBlock
+    .initialize_split_helper_block`. The counterimages computed during a
+    refinement step are stored in instances of :class:`ScratchBuffer`.
+
+    The pool counts the allocations avoided (a reused block saves the
+    allocation of the block and of its list of vertexes, a buffer used again
+    without growing saves the allocation of a list), which are summarized by
+    :meth:`avoided_allocations_per_step`.
+
+    :param capacity: The initial capacity of the scratch buffers (usually
+        the number of vertexes of the graph). Defaults to 0.
+    """
+
+    __slots__ = (
+        "_free_qblocks",
+        "counterimage",
+        "exclusive_counterimage",
+        "splitter_vertexes",
+        "refine_steps",
+        "allocated_qblocks",
+        "reused_qblocks",
+    )
+
+    def __init__(self, capacity: int = 0):
+        # free blocks, grouped by type (_LightQBlock or _QBlock)
+        self._free_qblocks = {}
+
+        self.counterimage = ScratchBuffer(capacity)
+        self.exclusive_counterimage = ScratchBuffer(capacity)
+        self.splitter_vertexes = ScratchBuffer(capacity)
+
+        self.refine_steps = 0
+        self.allocated_qblocks = 0
+        self.reused_qblocks = 0
+
+    def take_qblock(self, qblock_type: type, xblock):
+        """Return an empty block of the given type, which is appended to
+        `xblock`. The block is taken from the pool if possible, otherwise a
+        new one is allocated.
+
+        :param qblock_type: The type of the block
+            (:class:`bispy.utilities.graph_entities._LightQBlock` or one of
+            its subclasses).
+        :param xblock: The block of :math:`X` which is going to contain the
+            block.
+        :type xblock: bispy.utilities.graph_entities._XBlock
+        """
+
+        free_qblocks = self._free_qblocks.get(qblock_type)
+        if free_qblocks:
+            self.reused_qblocks += 1
+            qblock = free_qblocks.pop()
+            qblock.recycle(xblock)
+            return qblock
+        else:
+            self.allocated_qblocks += 1
+            return qblock_type([], xblock)
+
+    def release_qblock(self, qblock):
+        """Give an empty block back to the pool. The block must not belong
+        to any partition.
+
+        :param qblock: An empty block of :math:`Q`.
+        :type qblock: bispy.utilities.graph_entities._LightQBlock
+        """
+
+        self._free_qblocks.setdefault(type(qblock), []).append(qblock)
+
+    def buffer(self, buffer: ScratchBuffer) -> ScratchBuffer:
+        """Clear one of the scratch buffers of the pool and return it.
+
+        :param buffer: A scratch buffer owned by the pool.
+        """
+
+        buffer.clear()
+        return buffer
+
+    @property
+    def reused_buffers(self) -> int:
+        """The number of uses of the scratch buffers which didn't need any
+        allocation (see :attr:`ScratchBuffer.reuses`)."""
+        return (
+            self.counterimage.reuses
+            + self.exclusive_counterimage.reuses
+            + self.splitter_vertexes.reuses
+        )
+
+    @property
+    def free_qblocks(self) -> int:
+        """The number of blocks in the pool."""
+        return sum(map(len, self._free_qblocks.values()))
+
+    @property
+    def avoided_allocations(self) -> int:
+        """The number of allocations avoided since the creation of the
+        pool."""
+        return 2 * self.reused_qblocks + self.reused_buffers
+
+    def avoided_allocations_per_step(self) -> float:
+        """The average number of allocations avoided in each refinement
+        step."""
+
+        if self.refine_steps == 0:
+            return 0.0
+        return self.avoided_allocations / self.refine_steps
+
+    def __repr__(self):
+        return (
+            "RefinementPool(steps={}, allocated_qblocks={}, "
+            "reused_qblocks={}, reused_buffers={})"
+        ).format(
+            self.refine_steps,
+            self.allocated_qblocks,
+            self.reused_qblocks,
+            self.reused_buffers,
+        )
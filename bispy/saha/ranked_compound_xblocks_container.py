@@ -3,6 +3,29 @@ from bispy.utilities.graph_entities import _XBlock
 import sys
 
 
+def xblock_rank(xblock: _XBlock):
+    """The rank of the given block of :math:`X`, namely the maximum rank of
+    its vertexes. The value is computed the first time the block is found,
+    and then stored in the attribute `xblock.rank`, therefore it doesn't
+    depend on the order of the blocks of :math:`Q` and of their vertexes
+    (which changes when vertexes are moved), nor on blocks of :math:`Q`
+    emptied by a split.
+
+    :param xblock: A block of :math:`X`.
+    """
+
+    if xblock.rank is None:
+        xblock.rank = max(
+            (
+                vertex.rank
+                for qblock in xblock.qblocks
+                for vertex in qblock.vertexes
+            ),
+            default=float("-inf"),
+        )
+    return xblock.rank
+
+
 class RankedCompoundXBlocksContainer(CompoundXBlocksContainer):
     def __init__(self, compound_xblocks, max_rank):
         self._xblocks = [[] for _ in range(max_rank + 2)]
@@ -12,9 +35,7 @@ class RankedCompoundXBlocksContainer(CompoundXBlocksContainer):
             first_nonempty_index = -1
 
         for compound_xblock in compound_xblocks:
-            rank = (
-                compound_xblock.qblocks.first.value.vertexes.first.value.rank
-            )
+            rank = xblock_rank(compound_xblock)
             if rank == float("-inf"):
                 self._xblocks[0].append(compound_xblock)
                 first_nonempty_index = 0
@@ -46,12 +67,11 @@ class RankedCompoundXBlocksContainer(CompoundXBlocksContainer):
         )
 
     def append(self, xblock):
-        self.append_at_rank(xblock, xblock.qblocks.first.value.rank)
+        self.append_at_rank(xblock, xblock_rank(xblock))
 
     def extend(self, new_compound_xblocks):
         for xblock in new_compound_xblocks:
-            first_qblock_rank = xblock.qblocks.first.value.rank
-            self.append_at_rank(xblock, first_qblock_rank)
+            self.append_at_rank(xblock, xblock_rank(xblock))
 
     def pop(self):
         xblock = self._xblocks[self._first_nonempty_index].pop()
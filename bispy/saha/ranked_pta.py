@@ -1,20 +1,20 @@
-from llist import dllist, dllistnode
-from typing import List, Dict, Any, Tuple, Iterable
+from typing import List, Dict, Any, Tuple, Iterable, Union
 import networkx as nx
 from bispy.utilities.graph_entities import (
     _Vertex,
     _QBlock,
-    _Count,
     _XBlock,
 )
 from bispy.paige_tarjan.paige_tarjan import (
     extract_splitter,
     split,
     update_counts,
-    build_block_counterimage,
     build_exclusive_B_counterimage,
     refine,
 )
+from bispy.dovier_piazza_policriti.dovier_piazza_policriti import (
+    build_vertexes_counterimage,
+)
 from bispy.paige_tarjan.compound_xblocks_container import (
     CompoundXBlocksContainer,
 )
@@ -43,7 +43,7 @@ def pta(
         blocks that contain more than one block of the partition  :math:`Q`).
     """
 
-    while compound_xblocks._first_nonempty_index > 0:
+    while compound_xblocks._first_nonempty_index >= 0:
         x_partition, new_qblocks = refine(compound_xblocks, x_partition)
         q_partition.extend(new_qblocks)
 
@@ -51,14 +51,18 @@ def pta(
 
 
 def ranked_split(
-    current_partition: List[_QBlock], B_qblock: _QBlock, max_rank: int
+    current_partition: List[_QBlock],
+    B_qblock: Union[_QBlock, List[_Vertex]],
+    max_rank: int,
 ) -> List[Tuple[_Vertex]]:
     """Split the given partition using the block `B_qblock` as *splitter*, then
     use Ranked *Paige-Tarjan*'s algorithm on the resulting partition.
 
     :param current_partition: The current partition as a list of
         :class:`bispy.utilities.graph_entities._QBlock`.
-    :param B_qblock: The block to be used as *splitter*.
+    :param B_qblock: The block to be used as *splitter*, or a snapshot of
+        its vertexes (the vertexes of a block may be moved to another block
+        by a previous split).
     :param max_rank: The maximum rank which may be found in the graph.
     :returns: The output of Ranked *Paige-Tarjan*'s algorithm as a list of
         tuples of vertexes.
@@ -73,13 +77,12 @@ def ranked_split(
     q_partition = current_partition
 
     #  perform Split(B,Q)
-    B_counterimage = build_block_counterimage(B_qblock)
+    if isinstance(B_qblock, list):
+        B_counterimage = build_vertexes_counterimage(B_qblock)
+    else:
+        B_counterimage = build_vertexes_counterimage(B_qblock.vertexes)
     new_qblocks, new_compound_xblocks, chaned_qblocks = split(B_counterimage)
 
-    # reset aux_count
-    for vx in B_counterimage:
-        vx.aux_count = None
-
     q_partition.extend(new_qblocks)
 
     if max_rank == float("-inf"):
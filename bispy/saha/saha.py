@@ -3,9 +3,9 @@ from bispy.utilities.graph_entities import (
     _Vertex,
     _QBlock as _Block,
     _Edge,
-    _Count,
     _XBlock,
     _SCC,
+    new_epoch,
 )
 from typing import List, Tuple, Set, Dict, Union
 from .ranked_pta import ranked_split
@@ -25,9 +25,9 @@ def add_edge(source: _Vertex, destination: _Vertex) -> _Edge:
     """Add a new edge to the graph (this is the internal *BisPy*
     representation, therefore the original graph is left untouched).
 
-    This function also sets the `count` attribute for the new edge, creating
-    a new instance of :class:`bispy.utilities.graph_entities._Count` if the
-    source of the edge was a sink previously, and getting the instance
+    This function also sets the `count` attribute for the new edge, taking
+    a new slot of the :class:`bispy.utilities.graph_entities._CountTable` if
+    the source of the edge was a sink previously, and getting the slot
     from the first edge in the image otherwise.
 
     :param source: The source of the new edge.
@@ -36,14 +36,14 @@ def add_edge(source: _Vertex, destination: _Vertex) -> _Edge:
 
     edge = _Edge(source, destination)
     if len(source.image) > 0:
-        # there's already a _Count instance for the image of this Vertex,
+        # there's already a count slot for the image of this Vertex,
         # therefore we HAVE to use it.
         edge.count = source.image[0].count
     else:
         # the source was a sink previously
-        edge.count = _Count(source)
+        edge.count = source.count_table.new_slot()
 
-    edge.count.value += 1
+    source.count_table.values[edge.count] += 1
 
     source.add_to_image(edge)
     destination.add_to_counterimage(edge)
@@ -70,7 +70,7 @@ def is_in_image(ublock: _Block, vblock: _Block) -> bool:
 
     # since we assume that the given blocks are members of an RSCP, we only
     # need to verify if a single vertex of ublock has an edge towards vblock
-    vertex = ublock.vertexes.first.value
+    vertex = ublock.vertexes[0]
     return any(
         map(
             lambda block: block == vblock,
@@ -85,7 +85,7 @@ def check_new_scc(
     finishing_time_list: List[_Vertex] = None,
     # min_rank: int = None,
     # max_rank: int = None,
-    visited_vertexes: List[_Vertex] = None,
+    epoch: int = None,
     root_call=True,
 ) -> bool:
     """Check if a new *strongly connected component* has been created after
@@ -97,11 +97,11 @@ def check_new_scc(
     starting from `current_source` until it finds the `destination` vertex, in
     which case a new SCC is recognized.
 
-    Meanwhile it also sets the flag `visited` for each visited vertex to
-    prevent visiting the same node twice. At the end of the execution the
-    root call **cleans** the flag `visited` for each vertex by exploring each
-    vertex in the list `visited_vertexes`, which is passed automatically from
-    the root call to all its children.
+    Meanwhile it also stamps each visited vertex with the epoch of the
+    visit (see :func:`bispy.utilities.graph_entities.new_epoch`) to prevent
+    visiting the same node twice. The epoch is created by the root call and
+    passed automatically to all its children, therefore no cleanup is needed
+    after the execution.
 
     It also sets the flag `visited` for each visited
     :class:`bispy.utilities.graph_entities._QBlock`. This information is used
@@ -114,10 +114,8 @@ def check_new_scc(
         the vertexes ordered by finishing time (first are those for which the
         exploaration of the image ended earlier). This feature is disabled if
         this argument is `None`.
-    :param visited_vertexes: An empty list which will be filled with
-        the vertexes visited during the execution. You do not need to pass a
-        non-`None` value since the root call takes care of the necessary
-        cleanup which occurs after the execution of the function.
+    :param epoch: The epoch of the visit. You do not need to pass a
+        non-`None` value since the root call creates a new epoch.
     :param root_call: `True` if this instance of the function is the root call.
         Passing any value other than `True` (from a user perspective) is going
         to end with an exception.
@@ -134,12 +132,10 @@ def check_new_scc(
     #    max_rank = destination.rank
 
     if root_call:
-        current_source.visited = True
+        epoch = new_epoch()
+        current_source.visit_epoch = epoch
         current_source.qblock.visited = True
 
-        visited_vertexes = []
-        visited_vertexes.append(current_source)
-
     flag_scc_found = False
 
     for edge in current_source.counterimage:
@@ -148,13 +144,13 @@ def check_new_scc(
             flag_scc_found = True
 
         if (
-            not edge.source.visited
+            edge.source.visit_epoch
+            != epoch
             # and min_rank <= edge.source.rank
             # and edge.source.rank <= max_rank
         ):
             # we don't want to visit a vertex more than one time
-            edge.source.visited = True
-            visited_vertexes.append(edge.source)
+            edge.source.visit_epoch = epoch
 
             edge.source.qblock.visited = True
 
@@ -167,7 +163,7 @@ def check_new_scc(
                     finishing_time_list,
                     # min_rank,
                     # max_rank,
-                    visited_vertexes,
+                    epoch,
                     root_call=False,
                 )
                 or flag_scc_found
@@ -176,11 +172,6 @@ def check_new_scc(
     if finishing_time_list is not None:
         finishing_time_list.append(current_source)
 
-    # we have to clean the flag "visited" for each visited vertex
-    if root_call:
-        for vx in visited_vertexes:
-            vx.visited = False
-
     return flag_scc_found
 
 
@@ -248,6 +239,11 @@ def exists_causal_splitter(
         `False` otherwise.
     """
 
+    # a block may temporarily contain vertexes having different ranks, the
+    # rank of its first vertex depends on the order of the vertexes
+    def min_rank(block):
+        return min(vertex.rank for vertex in block.vertexes)
+
     def plausible_causal_splitters(block, the_other_block):
         s = set()
         for v in block.vertexes:
@@ -259,7 +255,7 @@ def exists_causal_splitter(
                     # causal splitter HAVE TO be blocks such that we KNOW they
                     # are in the new rscp of G' (the updated graph)
                     if (
-                        current_block.rank < block.rank
+                        min_rank(current_block) < min_rank(block)
                         or current_block == the_other_block
                     ):
                         s.add(id(edge.destination.qblock))
@@ -375,9 +371,8 @@ def merge_phase(
                 recursive_merge(ublock, u1block)
 
 
-def merge_step(vertex, X, visited_vertexes, cant_merge_dict):
-    vertex.visited = True
-    visited_vertexes.append(vertex)
+def merge_step(vertex, X, epoch, cant_merge_dict):
+    vertex.visit_epoch = epoch
 
     # try to merge this block
     if not vertex.qblock.tried_merge:
@@ -412,23 +407,37 @@ def merge_step(vertex, X, visited_vertexes, cant_merge_dict):
         vertex.qblock.tried_merge = True
 
     for edge in vertex.image:
-        if not edge.destination.visited:
-            merge_step(edge.destination, X, visited_vertexes, cant_merge_dict)
+        if edge.destination.visit_epoch != epoch:
+            merge_step(edge.destination, X, epoch, cant_merge_dict)
 
 
-def preprocess_initial_partition(qblocks: List[_Block]):
+def preprocess_initial_partition(
+    qblocks: List[_Block], subgraph_epoch: int = None
+):
     """
     Preprocess the given partition to split blocks which contain leafs and
     non-leafs.
 
     :param qblocks: A partition.
+    :param subgraph_epoch: If not `None`, leafs are the vertexes having no
+        successor in the subgraph identified by this epoch (see
+        :func:`bispy.utilities.graph_entities._Vertex.restrict_to_subgraph`).
+        Defaults to `None`.
     """
     for block in qblocks:
         leafs = []
         non_leafs = []
 
         for vertex in block.vertexes:
-            if len(vertex.image) == 0:
+            if subgraph_epoch is None:
+                is_leaf = len(vertex.image) == 0
+            else:
+                is_leaf = all(
+                    edge.destination.subgraph_epoch != subgraph_epoch
+                    for edge in vertex.image
+                )
+
+            if is_leaf:
                 leafs.append(vertex)
             else:
                 non_leafs.append(vertex)
@@ -458,8 +467,8 @@ def merge_split_phase(
     # where each couple can't be merged
     cant_merge_dict = {}
 
-    # keep track in order to remove the 'visited' flag
-    visited_vertexes = []
+    # vertexes visited by the merge phase are stamped with this epoch
+    epoch = new_epoch()
 
     # a partition containing all the touched blocks
     X = []
@@ -467,15 +476,11 @@ def merge_split_phase(
     # visit G in order of decreasing finishing times of the first DFS
     for vertex in finishing_time_list:
         # a vertex may be reached more than one time
-        if not vertex.visited:
-            merge_step(vertex, X, visited_vertexes, cant_merge_dict)
+        if vertex.visit_epoch != epoch:
+            merge_step(vertex, X, epoch, cant_merge_dict)
 
     X = list(filter(lambda block: not block.deteached, X))
 
-    # clear visited flag
-    for vx in visited_vertexes:
-        vx.visited = False
-
     # reset block.visited flag (was set by first DFS) and tried_merge
     for block in qpartition:
         block.visited = False
@@ -488,6 +493,9 @@ def merge_split_phase(
     # we need to scale in order to use PTA (and then scale back)
     scaled_to_nonscaled = []
 
+    # the subgraph of the vertexes in X
+    subgraph_epoch = new_epoch()
+
     xblock = _XBlock()
     for block in X:
         # this is needed for PTA
@@ -497,7 +505,7 @@ def merge_split_phase(
 
         for vx in block.vertexes:
             # mark as reachable by PTA
-            vx.allow_visit = True
+            vx.subgraph_epoch = subgraph_epoch
 
             # scale label in order to use PTA
             vx.scale_label(len(scaled_to_nonscaled))
@@ -515,30 +523,31 @@ def merge_split_phase(
 
     for block in X:
         for vx in block.vertexes:
-            vx.restrict_to_subgraph(validation=lambda v: v.allow_visit)
+            vx.restrict_to_subgraph(subgraph_epoch)
 
     # apply PTA and append the blocks to the new partition
-    preprocess_initial_partition(X)
-    X2 = paige_tarjan_qblocks(X)
+    preprocess_initial_partition(X, subgraph_epoch)
+    X2 = paige_tarjan_qblocks(X, subgraph_epoch)
     new_qpartition.extend(X2)
 
     for block in X2:
         for vx in block.vertexes:
-            # restore the original image/counterimage
+            # restore the original counts
             vx.back_to_original_graph()
-            # clean allow_visit
-            vx.allow_visit = False
             # restore original label
             vx.back_to_original_label()
 
-    # select the blocks which are the result of a split
-    # split, and clean block.visited
+    # select the blocks which are the result of a split, and clean
+    # block.is_new_qblock. each split may move the vertexes of the blocks
+    # of X2 to new blocks, therefore we take a snapshot of the splitters
+    splitters = []
     for block in filter(attrgetter("is_new_qblock"), X2):
-        # split
-        new_qpartition = ranked_split(new_qpartition, block, max_rank)
-        # clean
+        splitters.append(list(block.vertexes))
         block.is_new_qblock = False
 
+    for splitter in splitters:
+        new_qpartition = ranked_split(new_qpartition, splitter, max_rank)
+
     return new_qpartition
 
 
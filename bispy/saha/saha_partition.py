@@ -3,9 +3,27 @@ from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
     convert_to_integer_graph,
     back_to_original,
+    inverse_mapping,
+)
+from bispy.utilities.csr_graph import CSRGraph
+from bispy.utilities.node_table import NodeTable
+from bispy.utilities.edge_arrays import EdgeArrayGraph, labels_to_partition
+from bispy.utilities.sparse_matrix import as_csr_graph
+from bispy.utilities.graph_decorator import (
+    check_graph_rank,
+    decorate_nx_graph,
+    to_tuple_list,
+)
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.graph_rank import GraphRank
+from bispy.utilities.graph_file import (
+    MappedGraph,
+    as_mapped_graph_input,
+    decorate_mapped_graph,
+    open_graph_file,
 )
-from bispy.utilities.graph_decorator import decorate_nx_graph, to_tuple_list
 from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks
+import os
 import networkx as nx
 from typing import Union, List, Dict, Any, Tuple
 from bispy.utilities.graph_entities import _QBlock, _Vertex
@@ -18,8 +36,9 @@ class SahaPartition:
 
     :param qblocks: The current partition of the nodes of the graph.
     :param qblocks: Nodes in the graph.
-    :param node_to_idx: A `dict` which maps nodes from the original graph
-        to nodes of the isomorphic integer graph (see
+    :param node_to_idx: A `dict` (or a
+        :class:`bispy.utilities.node_table.NodeTable`) which maps nodes from
+        the original graph to nodes of the isomorphic integer graph (see
         :mod:`bispy.utilities.graph_normalization`).
     """
 
@@ -27,11 +46,17 @@ class SahaPartition:
         self,
         qblocks: List[_QBlock],
         vertexes: List[_QBlock],
-        node_to_idx: Dict[Any, int],
+        node_to_idx: Union[Dict[Any, int], NodeTable],
     ):
         self.qblocks = qblocks
         self.vertexes = vertexes
         self.node_to_idx = node_to_idx
+        # computed once, used to translate the maximum bisimulation after
+        # each new edge
+        if node_to_idx is not None:
+            self.idx_to_node = inverse_mapping(node_to_idx)
+        else:
+            self.idx_to_node = None
 
     def add_edge(
         self, edge: Tuple[Any, Any], verbose=True
@@ -53,14 +78,18 @@ class SahaPartition:
         # to be able to insert a new edge mentioning the original nodes
         if self.node_to_idx is not None:
             edge = (self.node_to_idx[edge[0]], self.node_to_idx[edge[1]])
+        return self._add_integer_edge(edge, verbose)
 
+    def _add_integer_edge(
+        self, edge: Tuple[int, int], verbose: bool
+    ) -> Union[None, List[Tuple[Any]]]:
         self.qblocks = saha_algorithm(self.qblocks, self.vertexes, edge)
         if verbose:
             max_bisi = to_tuple_list(self.qblocks)
             if self.node_to_idx is None:
                 return max_bisi
             else:
-                return back_to_original(max_bisi, self.node_to_idx)
+                return back_to_original(max_bisi, self.idx_to_node)
 
     def add_edges(
         self, edges: List[Tuple[Any, Any]], verbose: bool = True
@@ -76,59 +105,167 @@ class SahaPartition:
             if `verbose` is `True`.
         """
 
+        if self.node_to_idx is not None:
+            # translate the whole batch at once
+            edges = list(edges)
+            if isinstance(self.node_to_idx, NodeTable):
+                sources = self.node_to_idx.indexes(edge[0] for edge in edges)
+                targets = self.node_to_idx.indexes(edge[1] for edge in edges)
+            else:
+                sources = [self.node_to_idx[edge[0]] for edge in edges]
+                targets = [self.node_to_idx[edge[1]] for edge in edges]
+            edges = list(zip(sources, targets))
+
         for idx, edge in enumerate(edges):
             if idx == len(edges) - 1 and verbose:
-                return self.add_edge(edge)
+                return self._add_integer_edge(edge, True)
             else:
-                self.add_edge(edge, verbose=False)
+                self._add_integer_edge(edge, False)
 
 
 def saha(
-    graph, initial_partition=None, is_integer_graph=False
+    graph,
+    initial_partition=None,
+    is_integer_graph=False,
+    bulk_build=False,
+    compact_node_ids=False,
+    rank: GraphRank = None,
 ) -> SahaPartition:
     """
     Returns an instance of the class :class:`SahaPartition` which can be used
     to recompute the maximum bisimulation incrementally.
 
-    :param graph: The initial graph.
+    :param graph: The initial graph (a `networkx.DiGraph`, or a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, a
+        :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`, a
+        `scipy.sparse` adjacency matrix, a
+        :class:`bispy.utilities.graph_file.MappedGraph` or the path of a
+        *BisPy* graph file). If the file was written by
+        :func:`bispy.utilities.graph_file.write_decorated_graph`, the stored
+        topological order of the images, SCCs and *rank* are used.
     :initial_partition: The initial partition, or labeling set. This is
         **not** the partition from which we start, but an indication of which
         nodes cannot be bisimilar. Defaultsto `None`, in which case the trivial
-        labeling set (one block which contains all the nodes) is used.
+        labeling set (one block which contains all the nodes) is used (or the
+        one stored in the *BisPy* graph file, if any).
     :param is_integer_graph: If `True`, the function assumes that
         the graph is integer, and skips the integer check (may slightly
         improve performance). Defaults to `False`.
+    :param bulk_build: If `True`, the cyclic garbage collector is disabled
+        while the graph is decorated and the initial maximum bisimulation is
+        computed (see :func:`bispy.utilities.bulk_build.bulk_build_mode`).
+        Defaults to `False`.
+    :param compact_node_ids: If `True` and the graph is not integer, nodes
+        are mapped to integers using a
+        :class:`bispy.utilities.node_table.NodeTable` instead of a `dict`,
+        which saves memory if the graph is kept for a long time (node names
+        must be comparable). Graph files always contain integer graphs.
+        Defaults to `False`.
+    :param rank: The precomputed *rank* of the graph (see
+        :func:`bispy.utilities.graph_rank.graph_rank`), which is not
+        computed again. Only integer graphs are supported. It **must** be the
+        rank of this exact graph, since only the number of nodes and edges
+        is checked. If the graph file stores the rank, the stored one is
+        used. Defaults to `None`.
     """
 
-    if not isinstance(graph, nx.DiGraph):
-        raise Exception("graph should be a directed graph (nx.DiGraph)")
+    if isinstance(graph, (str, os.PathLike)):
+        with open_graph_file(graph) as mapped_graph:
+            return saha(
+                mapped_graph,
+                initial_partition,
+                is_integer_graph,
+                bulk_build,
+                compact_node_ids,
+                rank,
+            )
+    if isinstance(graph, MappedGraph) and graph.is_decorated:
+        # the decoration stored in the file is reused, the rank stored in the
+        # file is the one of this graph. graph files contain integer graphs,
+        # therefore no table of nodes is needed
+        check_graph_rank(rank, graph)
+        with bulk_build_mode(bulk_build):
+            vertexes, q_partition = decorate_mapped_graph(
+                graph, initial_partition
+            )
+            q_partition = paige_tarjan_qblocks(q_partition)
+        return SahaPartition(q_partition, vertexes, None)
 
-    # if True, the input graph is already an integer graph
-    original_graph_is_integer = is_integer_graph or check_normal_integer_graph(
-        graph
-    )
-    if not original_graph_is_integer:
-        # convert the graph to an "integer" graph
-        integer_graph, node_to_idx = convert_to_integer_graph(graph)
-
-        if initial_partition is not None:
-            # convert the initial partition to a integer partition
-            integer_initial_partition = [
-                [node_to_idx[old_node] for old_node in block]
-                for block in initial_partition
-            ]
+    # BisPy graph files are mapped in memory, scipy.sparse adjacency
+    # matrixes are read without any copy
+    with as_mapped_graph_input(graph, initial_partition) as (
+        graph,
+        initial_partition,
+    ):
+        graph = as_csr_graph(graph)
+
+        if not isinstance(graph, (nx.DiGraph, CSRGraph, EdgeArrayGraph)):
+            raise Exception(
+                "graph should be a directed graph (nx.DiGraph, CSRGraph or "
+                "EdgeArrayGraph)"
+            )
+
+        # if True, the input graph is already an integer graph
+        original_graph_is_integer = (
+            is_integer_graph or check_normal_integer_graph(graph)
+        )
+        if not original_graph_is_integer:
+            if rank is not None:
+                raise ValueError("A precomputed rank needs an integer graph")
+            # convert the graph to an "integer" graph
+            integer_graph, node_to_idx = convert_to_integer_graph(
+                graph, compact=compact_node_ids
+            )
+
+            if initial_partition is not None:
+                # convert the initial partition to a integer partition
+                integer_initial_partition = [
+                    [node_to_idx[old_node] for old_node in block]
+                    for block in initial_partition
+                ]
+            else:
+                integer_initial_partition = None
         else:
-            integer_initial_partition = None
-    else:
-        integer_graph = graph
-        integer_initial_partition = initial_partition
-        node_to_idx = None
-
-    vertexes, q_partition = decorate_nx_graph(
-        integer_graph,
-        integer_initial_partition,
-    )
+            integer_graph = graph
+            integer_initial_partition = initial_partition
+            node_to_idx = None
+
+        with bulk_build_mode(bulk_build):
+            vertexes, q_partition = decorate_nx_graph(
+                integer_graph, integer_initial_partition, rank=rank
+            )
 
-    # compute the current maximum bisimulation
-    q_partition = paige_tarjan_qblocks(q_partition)
-    return SahaPartition(q_partition, vertexes, node_to_idx)
+            # compute the current maximum bisimulation
+            q_partition = paige_tarjan_qblocks(q_partition)
+        return SahaPartition(q_partition, vertexes, node_to_idx)
+
+
+def saha_from_arrays(
+    nvertexes, sources, targets, labels=None, bulk_build=False
+) -> SahaPartition:
+    """
+    Returns an instance of the class :class:`SahaPartition` for the *integer*
+    graph whose nodes are :math:`0, \\dots, \\textit{nvertexes}-1` and whose
+    edges are
+    :math:`\\langle \\textit{sources}[i], \\textit{targets}[i] \\rangle`. The
+    *BisPy* representation of the graph is built directly from the arrays
+    (see :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`), without any
+    `networkx.DiGraph`.
+
+    :param nvertexes: The number of nodes in the graph.
+    :param sources: Sources of the edges (a list, an `array.array` or a
+        *NumPy* array of integers).
+    :param targets: Destinations of the edges (same length of `sources`).
+    :param labels: The label of each node, nodes having different labels
+        cannot be bisimilar (see
+        :func:`bispy.utilities.edge_arrays.labels_to_partition`). Defaults to
+        `None`, in which case the trivial labeling set is used.
+    :param bulk_build: See :func:`saha`. Defaults to `False`.
+    """
+
+    return saha(
+        EdgeArrayGraph(nvertexes, sources, targets),
+        None if labels is None else labels_to_partition(labels),
+        is_integer_graph=True,
+        bulk_build=bulk_build,
+    )
@@ -0,0 +1,151 @@
+from array import array
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, List, Tuple
+
+from bispy.utilities.csr_graph import _bucket, index_typecode
+
+_get_qblock = attrgetter("qblock")
+
+
+class BlockLabels:
+    """A partition of the nodes :math:`0, \\dots, n-1` of an integer graph,
+    represented by a dense integer array such that `labels[v]` is the block
+    which contains the node :math:`v`. This takes one machine word per node,
+    while a list of tuples takes several Python objects per node.
+
+    Block ids are *canonical*: blocks are numbered in increasing order of
+    their smallest node, namely :math:`0` is the block of the node
+    :math:`0`, and so on. Therefore two instances represent the same
+    partition if and only if their arrays are equal. Create instances using
+    :meth:`from_partition` or :meth:`from_vertexes`.
+
+        >>> partition = BlockLabels.from_partition([(3, 1), (2,), (0,)], 4)
+        >>> partition.labels
+        array('i', [0, 1, 2, 1])
+        >>> partition.block_offsets, partition.block_members
+        (array('i', [0, 1, 3, 4]), array('i', [0, 1, 3, 2]))
+
+    :param labels: The canonical block id of each node.
+    :param nblocks: The number of blocks. Defaults to `None`, in which case
+        it's computed from `labels`.
+    """
+
+    def __init__(self, labels: array, nblocks: int = None):
+        self.labels = labels
+        if nblocks is None:
+            nblocks = max(labels) + 1 if len(labels) > 0 else 0
+        self._nblocks = nblocks
+        self._block_offsets = None
+        self._block_members = None
+
+    @classmethod
+    def from_partition(
+        cls, partition: Iterable[Iterable[int]], nvertexes: int
+    ) -> "BlockLabels":
+        """Build the labels of the given partition (for instance a list of
+        tuples).
+
+        :param partition: A partition of the nodes
+            :math:`0, \\dots, \\textit{nvertexes}-1`.
+        :param nvertexes: The number of nodes.
+        """
+
+        labels = array(index_typecode(nvertexes), [-1]) * nvertexes
+        for idx, block in enumerate(partition):
+            for node in block:
+                labels[node] = idx
+        if -1 in labels:
+            raise ValueError("the partition should cover all the nodes")
+        return cls._canonical(labels, nvertexes)
+
+    @classmethod
+    def from_vertexes(cls, vertexes: List) -> "BlockLabels":
+        """Build the labels of the partition induced by the attribute
+        `qblock` of the given vertexes (see
+        :class:`bispy.utilities.graph_entities._Vertex`). This takes a single
+        pass over the vertexes, without the intermediate list of tuples
+        built by :func:`bispy.utilities.graph_decorator.to_tuple_list`.
+
+        :param vertexes: The vertexes of an integer graph, such that
+            `vertexes[i].label` is :math:`i`.
+        """
+
+        return cls._canonical(map(_get_qblock, vertexes), len(vertexes))
+
+    @classmethod
+    def _canonical(cls, blocks: Iterable, nvertexes: int) -> "BlockLabels":
+        # `blocks` yields the block of each node (any hashable object). block
+        # ids are assigned in order of first occurrence, which is the
+        # increasing order of the smallest node of each block
+        ids = {}
+        get_id = ids.setdefault
+        labels = array(index_typecode(nvertexes))
+        append = labels.append
+        for block in blocks:
+            append(get_id(block, len(ids)))
+        return cls(labels, len(ids))
+
+    def number_of_blocks(self) -> int:
+        """The number of blocks of the partition."""
+        return self._nblocks
+
+    def _build_blocks(self):
+        nblocks = self.number_of_blocks()
+        self._block_offsets, self._block_members = _bucket(
+            nblocks,
+            self.labels,
+            range(len(self.labels)),
+            len(self.labels),
+            index_typecode(len(self.labels)),
+        )
+
+    @property
+    def block_offsets(self) -> array:
+        """Offsets of the members of each block in :attr:`block_members`
+        (computed the first time they are needed)."""
+        if self._block_offsets is None:
+            self._build_blocks()
+        return self._block_offsets
+
+    @property
+    def block_members(self) -> array:
+        """The nodes grouped by block: the members of the block :math:`b`
+        are `block_members[block_offsets[b]:block_offsets[b+1]]`, in
+        increasing order."""
+        if self._block_members is None:
+            self._build_blocks()
+        return self._block_members
+
+    def block(self, block_id: int) -> array:
+        """The nodes in the given block, in increasing order.
+
+        :param block_id: The id of a block.
+        """
+
+        start = self.block_offsets[block_id]
+        end = self.block_offsets[block_id + 1]
+        return self.block_members[start:end]
+
+    def to_tuple_list(self) -> List[Tuple[int]]:
+        """Convert the partition to a list of tuples, sorted by block id."""
+
+        members = iter(self.block_members)
+        offsets = self.block_offsets
+        return [
+            tuple(islice(members, offsets[idx + 1] - offsets[idx]))
+            for idx in range(self._nblocks)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BlockLabels):
+            return NotImplemented
+        return self.labels == other.labels
+
+    def __repr__(self):
+        return "BlockLabels(nodes={}, blocks={})".format(
+            len(self.labels), self.number_of_blocks()
+        )
@@ -0,0 +1,44 @@
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def bulk_build_mode(enabled: bool = True, freeze: bool = False):
+    """Context manager which disables the cyclic garbage collector of
+    *CPython* while the *BisPy* representation of a graph is built or
+    refined.
+
+    Decorating a graph allocates a few objects for each vertex and edge in a
+    single burst, and each allocation pushes the collector towards a new
+    collection, which has to traverse every object built so far. None of
+    those objects is garbage, therefore the collections are wasted time. The
+    previous state of the collector is restored on exit, hence the context
+    manager can be nested.
+
+        >>> with bulk_build_mode():
+        ...     vertexes, qblocks = decorate_nx_graph(graph)
+
+    :param enabled: If `False`, the context manager does nothing. Defaults to
+        `True`.
+    :param freeze: If `True`, on exit all the objects tracked by the
+        collector (including the graph built inside the block) are moved to
+        the permanent generation (see `gc.freeze`), so that subsequent
+        collections ignore them. Useful if the graph is kept alive for a long
+        time (for instance by *Saha*'s algorithm). Note that frozen objects
+        are never collected until `gc.unfreeze` is called. Defaults to
+        `False`.
+    """
+
+    if not enabled:
+        yield
+        return
+
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if freeze:
+            gc.freeze()
+        if was_enabled:
+            gc.enable()
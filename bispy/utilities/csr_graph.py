@@ -0,0 +1,261 @@
+from array import array
+from typing import Iterable, Iterator, Tuple
+import networkx as nx
+
+_INT32_MAX = 2**31 - 1
+
+
+def index_typecode(max_value: int) -> str:
+    """Return the typecode of the smallest signed integer `array.array` type
+    (32 or 64 bit) able to store all the values in the interval
+    :math:`[0, \\textit{max_value}]`.
+
+    :param max_value: The biggest value which must be representable.
+    """
+
+    if max_value <= _INT32_MAX:
+        return "i"
+    else:
+        return "q"
+
+
+def _zeros(typecode: str, size: int) -> array:
+    return array(typecode, bytes(array(typecode).itemsize * size))
+
+
+def _bucket(
+    nvertexes: int,
+    keys: Iterable[int],
+    values: Iterable[int],
+    nedges: int,
+    typecode: str,
+) -> Tuple[array, array]:
+    # counting sort of the pairs (key,value) by key: the first array holds
+    # the offset of each key, the second the values grouped by key
+    offsets = _zeros(typecode, nvertexes + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for idx in range(nvertexes):
+        offsets[idx + 1] += offsets[idx]
+
+    grouped = _zeros(typecode, nedges)
+    position = array(typecode, offsets)
+    for key, value in zip(keys, values):
+        grouped[position[key]] = value
+        position[key] += 1
+
+    return offsets, grouped
+
+
+class CSRGraph:
+    """Compressed-sparse-row representation of a directed *integer* graph
+    (nodes are the integers :math:`0, \\dots, n-1`, see
+    :mod:`bispy.utilities.graph_normalization`).
+
+    The image of the node :math:`v` is stored in
+    `image[image_offsets[v]:image_offsets[v+1]]`, and the counterimage in
+    `counterimage[counterimage_offsets[v]:counterimage_offsets[v+1]]`. The four
+    arrays are instances of `array.array` containing 32-bit integers (or 64-bit
+    integers if the size of the graph requires it), therefore the memory
+    needed to store the graph is linear in the number of machine words.
+
+    Instances may be passed to `paige_tarjan`, `dovier_piazza_policriti` and
+    `saha` in place of a `networkx.DiGraph`. Create instances using
+    :meth:`from_edges`, :meth:`from_nx_graph` or :meth:`from_scipy_sparse`.
+
+    :param nvertexes: The number of nodes in the graph.
+    :param image_offsets: Offsets of the image of each node in `image`.
+    :param image: Destination nodes grouped by source.
+    :param counterimage_offsets: Offsets of the counterimage of each node in
+        `counterimage`. If `None`, the counterimage is computed from the
+        image the first time it is needed (the algorithms in *BisPy* only
+        need the image). Defaults to `None`.
+    :param counterimage: Source nodes grouped by destination. Defaults to
+        `None`.
+    """
+
+    def __init__(
+        self,
+        nvertexes: int,
+        image_offsets,
+        image,
+        counterimage_offsets=None,
+        counterimage=None,
+    ):
+        self._nvertexes = nvertexes
+        self.image_offsets = image_offsets
+        self.image = image
+        self._counterimage_offsets = counterimage_offsets
+        self._counterimage = counterimage
+
+    @classmethod
+    def from_edges(
+        cls, nvertexes: int, sources: Iterable[int], targets: Iterable[int]
+    ):
+        """Build the CSR representation of the graph whose nodes are
+        :math:`0, \\dots, \\textit{nvertexes}-1` and whose edges are
+        :math:`\\langle \\textit{sources}[i], \\textit{targets}[i] \\rangle`.
+        The construction is a counting sort, which takes :math:`O(|V| + |E|)`.
+        A `ValueError` is raised if an endpoint is not a node of the graph.
+
+        :param nvertexes: The number of nodes in the graph.
+        :param sources: Sources of the edges.
+        :param targets: Destinations of the edges (same length of `sources`).
+        """
+
+        if not isinstance(sources, (list, array)):
+            sources = list(sources)
+        if not isinstance(targets, (list, array)):
+            targets = list(targets)
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets must have the same length")
+        for nodes in (sources, targets):
+            if len(nodes) > 0 and (min(nodes) < 0 or max(nodes) >= nvertexes):
+                raise ValueError(
+                    "sources and targets must be in the range [0, {})".format(
+                        nvertexes
+                    )
+                )
+
+        typecode = index_typecode(max(nvertexes, len(sources)))
+
+        image_offsets, image = _bucket(
+            nvertexes, sources, targets, len(sources), typecode
+        )
+        counterimage_offsets, counterimage = _bucket(
+            nvertexes, targets, sources, len(sources), typecode
+        )
+        return cls(
+            nvertexes, image_offsets, image, counterimage_offsets, counterimage
+        )
+
+    @classmethod
+    def from_scipy_sparse(cls, matrix):
+        """Build the CSR representation of the graph whose adjacency matrix is
+        the given `scipy.sparse` matrix (there's an edge from :math:`i` to
+        :math:`j` if and only if the entry :math:`(i,j)` is non-zero).
+
+        If `matrix` is a `csr_matrix` (or `csr_array`) in canonical format
+        without explicit zeros, its arrays `indptr` and `indices` are used as
+        the image of the graph without any copy. Other formats are converted
+        to CSR by *SciPy* first. The counterimage is computed only if needed.
+
+        :param matrix: A square `scipy.sparse` matrix.
+        """
+
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("the adjacency matrix should be square")
+
+        matrix = matrix.tocsr()
+        # duplicate entries would become multiple edges, explicit zeros
+        # would become edges
+        if not matrix.has_canonical_format or not matrix.data.all():
+            matrix = matrix.copy()
+            matrix.sum_duplicates()
+            matrix.eliminate_zeros()
+
+        # indexing a memoryview yields Python ints, much faster than
+        # indexing a NumPy array element by element
+        return cls(
+            matrix.shape[0],
+            memoryview(matrix.indptr),
+            memoryview(matrix.indices),
+        )
+
+    @classmethod
+    def from_nx_graph(cls, graph: nx.DiGraph):
+        """Build the CSR representation of the given *NetworkX* integer graph.
+
+        :param graph: An integer graph (see
+            :mod:`bispy.utilities.graph_normalization`).
+        """
+
+        sources = []
+        targets = []
+        for source, target in graph.edges:
+            sources.append(source)
+            targets.append(target)
+        return cls.from_edges(len(graph.nodes), sources, targets)
+
+    def _build_counterimage(self):
+        nedges = len(self.image)
+        typecode = index_typecode(max(self._nvertexes, nedges))
+
+        sources = _zeros(typecode, nedges)
+        image_offsets = self.image_offsets
+        for source in range(self._nvertexes):
+            for idx in range(image_offsets[source], image_offsets[source + 1]):
+                sources[idx] = source
+
+        self._counterimage_offsets, self._counterimage = _bucket(
+            self._nvertexes, self.image, sources, nedges, typecode
+        )
+
+    @property
+    def counterimage_offsets(self):
+        """Offsets of the counterimage of each node in `counterimage`."""
+        if self._counterimage_offsets is None:
+            self._build_counterimage()
+        return self._counterimage_offsets
+
+    @property
+    def counterimage(self):
+        """Source nodes grouped by destination."""
+        if self._counterimage is None:
+            self._build_counterimage()
+        return self._counterimage
+
+    @property
+    def nodes(self) -> range:
+        """The nodes of the graph."""
+        return range(self._nvertexes)
+
+    @property
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """The edges of the graph, grouped by source."""
+        image_offsets = self.image_offsets
+        image = self.image
+        for source in range(self._nvertexes):
+            for idx in range(image_offsets[source], image_offsets[source + 1]):
+                yield (source, image[idx])
+
+    def number_of_nodes(self) -> int:
+        return self._nvertexes
+
+    def number_of_edges(self) -> int:
+        return len(self.image)
+
+    def successors(self, node: int) -> memoryview:
+        """The image of the given node (no copy is made).
+
+        :param node: A node of the graph.
+        """
+
+        start = self.image_offsets[node]
+        end = self.image_offsets[node + 1]
+        return memoryview(self.image)[start:end]
+
+    def predecessors(self, node: int) -> memoryview:
+        """The counterimage of the given node (no copy is made).
+
+        :param node: A node of the graph.
+        """
+
+        start = self.counterimage_offsets[node]
+        end = self.counterimage_offsets[node + 1]
+        return memoryview(self.counterimage)[start:end]
+
+    def to_nx_graph(self) -> nx.DiGraph:
+        """Convert this graph to a `networkx.DiGraph`."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_edges_from(self.edges)
+        return graph
+
+    def __len__(self):
+        return self._nvertexes
+
+    def __repr__(self):
+        return "CSRGraph(nodes={}, edges={})".format(
+            self._nvertexes, len(self.image)
+        )
@@ -0,0 +1,123 @@
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+
+# struct formats of the integer types accepted by `_integer_sequence`
+_INTEGER_FORMATS = frozenset("bBhHiIlLqQnN")
+
+
+def _integer_sequence(values):
+    # lists and array.array are used as they are, NumPy arrays (and any other
+    # object which exposes a one-dimensional buffer of integers) are wrapped
+    # in a memoryview, which yields Python ints without copying the buffer.
+    # returns None if `values` is a buffer of some other type
+    if isinstance(values, (list, array)):
+        return values
+
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return list(values)
+
+    if view.ndim != 1 or view.format.lstrip("@") not in _INTEGER_FORMATS:
+        return None
+    return view
+
+
+def _as_index_sequence(values, name: str):
+    sequence = _integer_sequence(values)
+    if sequence is None:
+        raise ValueError(
+            "{} should be a one-dimensional array of integers".format(name)
+        )
+    return sequence
+
+
+def _check_bounds(values, nvertexes: int, name: str):
+    if len(values) > 0 and (min(values) < 0 or max(values) >= nvertexes):
+        raise ValueError(
+            "{} should contain integers in [0, {})".format(name, nvertexes)
+        )
+
+
+class EdgeArrayGraph:
+    """A directed *integer* graph (nodes are the integers
+    :math:`0, \\dots, n-1`) given by the number of its nodes and two arrays
+    of integers, such that the edges are
+    :math:`\\langle \\textit{sources}[i], \\textit{targets}[i] \\rangle`.
+
+    The arrays may be lists, instances of `array.array` or *NumPy* arrays,
+    and are not copied: the *BisPy* representation of the graph is built by
+    iterating them once, therefore no `networkx.DiGraph` (and no
+    :class:`bispy.utilities.csr_graph.CSRGraph`) is needed. Instances may be
+    passed to `paige_tarjan`, `dovier_piazza_policriti` and `saha` in place
+    of a `networkx.DiGraph`.
+
+    :param nvertexes: The number of nodes in the graph.
+    :param sources: Sources of the edges.
+    :param targets: Destinations of the edges (same length of `sources`).
+    """
+
+    def __init__(self, nvertexes: int, sources, targets):
+        sources = _as_index_sequence(sources, "sources")
+        targets = _as_index_sequence(targets, "targets")
+
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets must have the same length")
+        _check_bounds(sources, nvertexes, "sources")
+        _check_bounds(targets, nvertexes, "targets")
+
+        self._nvertexes = nvertexes
+        self.sources = sources
+        self.targets = targets
+
+    @property
+    def nodes(self) -> range:
+        """The nodes of the graph."""
+        return range(self._nvertexes)
+
+    @property
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """The edges of the graph, in the order of the arrays."""
+        return zip(self.sources, self.targets)
+
+    def number_of_nodes(self) -> int:
+        return self._nvertexes
+
+    def number_of_edges(self) -> int:
+        return len(self.sources)
+
+    def __len__(self):
+        return self._nvertexes
+
+    def __repr__(self):
+        return "EdgeArrayGraph(nodes={}, edges={})".format(
+            self._nvertexes, len(self.sources)
+        )
+
+
+def labels_to_partition(labels: Iterable) -> List[List[int]]:
+    """Convert an array of labels to the corresponding initial partition
+    (labeling set): the node :math:`v` is in the same block of the nodes
+    having the label `labels[v]`. Blocks are sorted by the first occurrence
+    of their label.
+
+        >>> labels_to_partition([0, 1, 0, 2])
+        [[0, 2], [1], [3]]
+
+    :param labels: The label of each node of the graph (any hashable value).
+    """
+
+    # labels which are not integers (e.g. a NumPy array of strings) are
+    # iterated as they are
+    integer_labels = _integer_sequence(labels)
+    if integer_labels is not None:
+        labels = integer_labels
+
+    blocks = {}
+    for node, label in enumerate(labels):
+        block = blocks.get(label)
+        if block is None:
+            blocks[label] = [node]
+        else:
+            block.append(node)
+    return list(blocks.values())
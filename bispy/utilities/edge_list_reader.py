@@ -0,0 +1,147 @@
+import io
+import os
+from array import array
+from typing import Any, Callable, Dict, Iterator, Tuple, Union
+
+from bispy.utilities.csr_graph import _INT32_MAX
+from bispy.utilities.edge_arrays import EdgeArrayGraph
+
+_DEFAULT_CHUNK_SIZE = 2**20
+
+
+class _EdgeListBuilder:
+    # interns node names into dense ids (in order of first appearance) and
+    # appends the ids of the endpoints of each edge to two growable arrays
+
+    __slots__ = ("node_to_idx", "sources", "targets")
+
+    def __init__(self):
+        self.node_to_idx = {}
+        self.sources = array("i")
+        self.targets = array("i")
+
+    def intern(self, node) -> int:
+        node_to_idx = self.node_to_idx
+        idx = node_to_idx.get(node)
+        if idx is None:
+            idx = len(node_to_idx)
+            if idx > _INT32_MAX and self.sources.typecode == "i":
+                # switch to 64-bit ids
+                self.sources = array("q", self.sources)
+                self.targets = array("q", self.targets)
+            node_to_idx[node] = idx
+        return idx
+
+    def add_line(self, line: str, delimiter, comments, nodetype):
+        if comments is not None:
+            line = line.split(comments, 1)[0]
+        tokens = line.split(delimiter)
+        if delimiter is not None:
+            tokens = [token.strip() for token in tokens]
+            tokens = [token for token in tokens if token]
+        if not tokens:
+            return
+        if len(tokens) < 2:
+            raise ValueError("Invalid edge: {}".format(line.strip()))
+
+        source, target = tokens[0], tokens[1]
+        if nodetype is not None:
+            source, target = nodetype(source), nodetype(target)
+
+        self.add_edge(source, target)
+
+    def add_edge(self, source, target):
+        self.sources.append(self.intern(source))
+        self.targets.append(self.intern(target))
+
+
+def read_lines(
+    file: Union[str, os.PathLike, io.TextIOBase],
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """Iterate over the lines of a text file (without the trailing newline),
+    reading the file in chunks of `chunk_size` characters. Only the current
+    chunk and the current line are kept in memory.
+
+    :param file: The path of the file, or a file opened in text mode.
+    :param chunk_size: The number of characters read from the file at once.
+        Defaults to :math:`2^{20}`.
+    :param encoding: The encoding of the file (ignored if `file` is already
+        open). Defaults to `"utf-8"`.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size should be positive")
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "r", encoding=encoding) as opened_file:
+            yield from read_lines(opened_file, chunk_size)
+        return
+
+    # the last line of each chunk may be incomplete, we keep it for the next
+    # chunk
+    remainder = ""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+
+        lines = (remainder + chunk).split("\n")
+        remainder = lines.pop()
+        yield from lines
+    yield remainder
+
+
+def read_edge_list(
+    file: Union[str, os.PathLike, io.TextIOBase],
+    delimiter: str = None,
+    comments: str = "#",
+    nodetype: Callable[[str], Any] = None,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Tuple[EdgeArrayGraph, Dict[Any, int]]:
+    """Read a directed graph from a text file which contains one edge per
+    line (the source and the destination of the edge, separated by
+    whitespace or by `delimiter`; additional columns are ignored).
+
+    The file is read in chunks of `chunk_size` characters, and node names are
+    mapped on the fly to integers :math:`0, \\dots, n-1` (in order of first
+    appearance), which are appended to two growable `array.array`
+    instances. Therefore no `networkx.DiGraph` is built, and the memory
+    needed is roughly the size of the final representation (two integers
+    for each edge, plus the mapping of node names). Duplicate lines produce
+    duplicate edges, which do not change the maximum bisimulation.
+
+        >>> graph, node_to_idx = read_edge_list("graph.txt")
+        >>> rscp = back_to_original(paige_tarjan(graph), node_to_idx)
+
+    :param file: The path of the file, or a file opened in text mode.
+    :param delimiter: The string which separates the columns. Defaults to
+        `None`, in which case columns are separated by whitespace.
+    :param comments: Characters after this string (up to the end of the line)
+        are ignored. Defaults to `"#"`.
+    :param nodetype: If not `None`, a function which converts node names
+        (for instance `int`). Defaults to `None`, in which case nodes are
+        strings.
+    :param chunk_size: The number of characters read from the file at once.
+        Defaults to :math:`2^{20}`.
+    :param encoding: The encoding of the file (ignored if `file` is already
+        open). Defaults to `"utf-8"`.
+    :returns: A tuple whose items are:
+
+        0. The integer graph, as an instance of
+           :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`;
+        1. A `dict` which maps each node name to its integer, which may be
+           passed to
+           :func:`bispy.utilities.graph_normalization.back_to_original`.
+    """
+
+    builder = _EdgeListBuilder()
+    for line in read_lines(file, chunk_size, encoding):
+        builder.add_line(line, delimiter, comments, nodetype)
+
+    graph = EdgeArrayGraph(
+        len(builder.node_to_idx), builder.sources, builder.targets
+    )
+    return graph, builder.node_to_idx
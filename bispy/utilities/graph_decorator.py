@@ -1,13 +1,38 @@
 import networkx as nx
+from array import array
 from bispy.utilities.graph_entities import (
+    _LightVertex,
     _Vertex,
+    _CompactLightVertex,
+    _CompactVertex,
     _Edge,
-    _Count,
+    _CountTable,
+    _LightQBlock,
     _QBlock,
     _XBlock,
+    new_epoch,
 )
-from typing import List, Tuple, Union, Set
-from bispy.utilities.rank_computation import compute_rank as func_compute_rank
+from operator import attrgetter
+from typing import Any, Iterator, List, Tuple, Union, Set
+from bispy.utilities.rank_computation import (
+    compute_rank as func_compute_rank,
+    assign_rank,
+    csr_rank,
+)
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.sparse_matrix import as_csr_graph
+from bispy.utilities.csr_graph import CSRGraph, index_typecode
+
+# NumPy is optional: if available, the images of CSR graphs are sorted
+# topologically with a single vectorized sort
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_get_label = attrgetter("label")
+# adjacency lists of the vertexes released by `iter_blocks`
+_RELEASED = ()
 
 _BLACK = 10
 _GRAY = 11
@@ -18,6 +43,24 @@ def _trivial_initial_partition(nvertexes):
     return [tuple(range(nvertexes))]
 
 
+def check_graph_rank(rank, graph):
+    """Raise a `ValueError` if the given precomputed *rank* (see
+    :func:`bispy.utilities.graph_rank.graph_rank`) was computed for a graph
+    having a different number of nodes or edges than `graph`.
+
+    :param rank: A :class:`bispy.utilities.graph_rank.GraphRank`, or `None`
+        (nothing is checked).
+    :param graph: The graph (anything having the methods `number_of_nodes`
+        and `number_of_edges`).
+    """
+
+    if rank is not None and (
+        rank.number_of_nodes() != graph.number_of_nodes()
+        or rank.number_of_edges() not in (None, graph.number_of_edges())
+    ):
+        raise ValueError("The rank was computed for a different graph")
+
+
 # this is a FUNDAMENTAL part of the PTA algorithm: we need a stable initial
 # partition with respect to the set V, but a partition where leafs and
 # non-leafs are in the same block can't be stable
@@ -67,11 +110,15 @@ def counterimage_dfs(
     colors: List[int],
 ):
     """
-    Recursively visit :math:`G^{-1}` starting from the vertex in the position
+    Visit :math:`G^{-1}` starting from the vertex in the position
     `current_vertex_idx` of the list `vertexes`. Meanwhile fill
     `finishing_list` everytime time the counterimage of a vertex is completely
     visited.
 
+    The visit uses an explicit stack instead of recursion (therefore it works
+    on graphs of any depth), and the vertexes finish in the same order of a
+    recursive DFS.
+
     :param current_vertex_idx: The current vertex to be visited.
     :param vertexes: List of vertexes in the graph.
     :param finishing_list: List of vertexes in order of increasing finishing
@@ -83,26 +130,43 @@ def counterimage_dfs(
         first call of the function.
     """
 
+    _counterimage_dfs(current_vertex_idx, vertexes, finishing_list, colors, [])
+
+
+def _counterimage_dfs(
+    current_vertex_idx: int,
+    vertexes: List[_Vertex],
+    finishing_list: List[_Vertex],
+    colors: List[int],
+    stack: List,
+):
+    # `stack` is an empty list, which may be reused among several visits. it
+    # contains the vertexes whose counterimage is being visited, each one
+    # followed by an iterator over the rest of its counterimage
+    push = stack.append
+
     # mark this vertex as "visiting"
     colors[current_vertex_idx] = _GRAY
-    # visit the counterimage of the current vertex
-    for edge in vertexes[current_vertex_idx].counterimage:
-        counterimage_vertex = edge.source
-
-        # if the vertex isn't white, a visit is occurring, or has already
-        # occurred.
-        if colors[counterimage_vertex.label] == _WHITE:
-            counterimage_dfs(
-                current_vertex_idx=counterimage_vertex.label,
-                vertexes=vertexes,
-                finishing_list=finishing_list,
-                colors=colors,
-            )
-    # this vertex visit is over: add the vertex to the ordered list of
-    # finished vertexes
-    finishing_list.append(vertexes[current_vertex_idx])
-    # mark this vertex as "visited"
-    colors[current_vertex_idx] = _BLACK
+    push(current_vertex_idx)
+    push(iter(vertexes[current_vertex_idx].predecessors()))
+    while stack:
+        for counterimage_vertex in stack[-1]:
+            # if the vertex isn't white, a visit is occurring, or has already
+            # occurred.
+            counterimage_idx = counterimage_vertex.label
+            if colors[counterimage_idx] == _WHITE:
+                colors[counterimage_idx] = _GRAY
+                push(counterimage_idx)
+                push(iter(vertexes[counterimage_idx].predecessors()))
+                break
+        else:
+            stack.pop()
+            vertex_idx = stack.pop()
+            # this vertex visit is over: add the vertex to the ordered list
+            # of finished vertexes
+            finishing_list.append(vertexes[vertex_idx])
+            # mark this vertex as "visited"
+            colors[vertex_idx] = _BLACK
 
 
 def compute_counterimage_finishing_time_list(
@@ -112,20 +176,39 @@ def compute_counterimage_finishing_time_list(
     Compute the finishing time of each vertex of :math:`G` for a DFS
     of :math:`G^{-1}`.
 
+    The iterators kept on the stack of the DFS are never garbage, on deep
+    graphs the cyclic garbage collector may traverse them over and over:
+    use :func:`bispy.utilities.bulk_build.bulk_build_mode` (or the
+    `bulk_build` parameter of the algorithms) to avoid it.
+
     :param vertexes: Vertexes of :math:`G`.
     """
 
     counterimage_dfs_colors = [_WHITE for _ in range(len(vertexes))]
     counterimage_finishing_list = []
+    stack = []
     # perform counterimage DFS
     for idx in range(len(vertexes)):
-        if counterimage_dfs_colors[idx] == _WHITE:
-            counterimage_dfs(
-                current_vertex_idx=idx,
-                vertexes=vertexes,
-                finishing_list=counterimage_finishing_list,
-                colors=counterimage_dfs_colors,
-            )
+        if counterimage_dfs_colors[idx] != _WHITE:
+            continue
+
+        # fast path: if the counterimage of the vertex has already been
+        # visited, the vertex finishes immediately
+        for counterimage_vertex in vertexes[idx].predecessors():
+            if counterimage_dfs_colors[counterimage_vertex.label] == _WHITE:
+                break
+        else:
+            counterimage_finishing_list.append(vertexes[idx])
+            counterimage_dfs_colors[idx] = _BLACK
+            continue
+
+        _counterimage_dfs(
+            idx,
+            vertexes,
+            counterimage_finishing_list,
+            counterimage_dfs_colors,
+            stack,
+        )
     return counterimage_finishing_list
 
 
@@ -135,23 +218,36 @@ def as_bispy_graph(
     build_image,
     set_count,
     set_xblock,
+    lightweight=False,
+    edge_objects=True,
 ) -> Tuple[List[_Vertex], List[_QBlock]]:
     """
     Create the *BisPy* representation of the given graph. There are several
     options to enable/disable depending on which algorithm in *BisPy* you
     plan to use.
 
-    :param graph: The graph.
+    :param graph: The graph (a `networkx.DiGraph` or a
+        :class:`bispy.utilities.csr_graph.CSRGraph`).
     :param initial_partition: The initial partition (or labeling set) imposed
         on vertexes of the graph. Used to divide nodes in blocks.
     :param build_image: If `True`, we compute the image of each vertex.
-    :param set_count: If `True`, we set the attribute `count` of each vertex
-        to an appropriate instance of
-        :class:`bispy.utilities.graph_entities._Count`.
+    :param set_count: If `True`, we set the attribute `count` of each edge
+        to an appropriate slot of a new
+        :class:`bispy.utilities.graph_entities._CountTable`.
     :param set_xblock: If `True` we set the attribute `xblock` of each block
         of the partition to an instance of
         :class:`bispy.utilities.graph_entities._XBlock` (the same for each
         block). If `False`, we set the attribute to `None`.
+    :param lightweight: If `True`, vertexes and blocks are instances of
+        :class:`bispy.utilities.graph_entities._LightVertex` and
+        :class:`bispy.utilities.graph_entities._LightQBlock`, which only carry
+        the attributes needed by *Paige-Tarjan*'s algorithm. Defaults to
+        `False`.
+    :param edge_objects: If `False`, the image and counterimage of each
+        vertex are lists of vertexes, and no instance of
+        :class:`bispy.utilities.graph_entities._Edge` is created (see
+        :class:`bispy.utilities.graph_entities._CompactAdjacency`). Defaults
+        to `True`.
     :returns: A tuple whose items are:
 
         0. List of vertexes in the graph;
@@ -160,6 +256,13 @@ def as_bispy_graph(
         Both the items are in *BisPy* representation.
     """
 
+    if lightweight:
+        vertex_class = _LightVertex if edge_objects else _CompactLightVertex
+        qblock_class = _LightQBlock
+    else:
+        vertex_class = _Vertex if edge_objects else _CompactVertex
+        qblock_class = _QBlock
+
     if initial_partition is None:
         initial_partition = _trivial_initial_partition(len(graph.nodes))
 
@@ -171,21 +274,31 @@ def as_bispy_graph(
     initial_x_block = _XBlock() if set_xblock else None
 
     for idx, block in enumerate(initial_partition):
-        qblock = _QBlock([], initial_x_block)
+        qblock = qblock_class([], initial_x_block)
         qblocks.append(qblock)
         for vx in block:
-            new_vertex = _Vertex(label=vx)
+            new_vertex = vertex_class(label=vx)
             vertexes[vx] = new_vertex
             qblock.append_vertex(new_vertex)
             new_vertex.initial_partition_block_id = idx
 
     if set_count:
-        # holds the references to Count objects to assign to the edges.
+        # holds the slots of the counts to assign to the edges.
         # count(x) = count(x,V) = |V \cap E({x})| = |E({x})|
+        # the number of slots in use never exceeds |V| + |E|
+        count_table = _CountTable(len(vertexes) + graph.number_of_edges())
         vertex_count = [None for _ in graph.nodes]
+        for vertex in vertexes:
+            vertex.count_table = count_table
+            if not edge_objects:
+                vertex.counterimage_counts = array(count_table.values.typecode)
     else:
         vertex_count = None
 
+    if not edge_objects:
+        _add_compact_edges(graph, vertexes, build_image, vertex_count)
+        return (vertexes, qblocks)
+
     # build the counterimage. the image will be constructed using the order
     # imposed by the rank algorithm
     for edge in graph.edges:
@@ -195,13 +308,13 @@ def as_bispy_graph(
         if set_count:
             # if this is the first outgoing edge for the vertex edge[0], we
             # need to create a new Count instance
-            if not vertex_count[edge[0]]:
+            if vertex_count[edge[0]] is None:
                 # in this case None represents the intitial XBlock, namely the
                 # whole V
-                vertex_count[edge[0]] = _Count(my_edge.source)
+                vertex_count[edge[0]] = count_table.new_slot()
 
             my_edge.count = vertex_count[edge[0]]
-            my_edge.count.value += 1
+            count_table.values[my_edge.count] += 1
 
         if build_image:
             my_edge.source.add_to_image(my_edge)
@@ -210,6 +323,27 @@ def as_bispy_graph(
     return (vertexes, qblocks)
 
 
+def _add_compact_edges(graph, vertexes, build_image, vertex_count):
+    # the same of the loop in `as_bispy_graph`, without `_Edge` instances
+    if vertex_count is not None:
+        count_table = vertexes[0].count_table
+
+    for source_idx, destination_idx in graph.edges:
+        source = vertexes[source_idx]
+        destination = vertexes[destination_idx]
+
+        if vertex_count is not None:
+            if vertex_count[source_idx] is None:
+                vertex_count[source_idx] = count_table.new_slot()
+            slot = vertex_count[source_idx]
+            count_table.values[slot] += 1
+            destination.counterimage_counts.append(slot)
+
+        if build_image:
+            source.image.append(destination)
+        destination.counterimage.append(source)
+
+
 # this re-arranges the image of each vertex in a convenient order for further
 # visits
 def build_vertexes_image(finishing_time_list: List[_Vertex]):
@@ -226,25 +360,156 @@ def build_vertexes_image(finishing_time_list: List[_Vertex]):
     # use the standard vertex ordering
     vertex_count = [None for _ in range(len(finishing_time_list))]
 
-    visited_vertexes = []
+    epoch = new_epoch()
     for time_list_idx in range(len(finishing_time_list) - 1, -1, -1):
         vertex = finishing_time_list[time_list_idx]
 
         # use the counterimage of the current vertex to update the images of
         # the nodes in the counterimage of the current vertex.
-        for edge in vertex.counterimage:
+        for item in vertex.counterimage:
+            # with compact adjacency the image contains the vertexes
+            if vertex.edge_objects:
+                source = item.source
+            else:
+                source = item
+                item = vertex
+
             # we don't want to duplicate an already existent image, therefore
             # we reset the image of each vertex we visit
-            if not edge.source.visited:
-                edge.source.visit()
-                edge.source.image = []
-                visited_vertexes.append(edge.source)
+            if source.visit_epoch != epoch:
+                source.visit_epoch = epoch
+                source.image = []
 
-            edge.source.add_to_image(edge)
+            source.add_to_image(item)
 
-    # unvisit vertexes
-    for visited_vx in visited_vertexes:
-        visited_vx.release()
+
+def csr_counterimage_finishing_time_list(graph: CSRGraph) -> array:
+    """
+    Compute the finishing time of each node of :math:`G` for a DFS of
+    :math:`G^{-1}`, using only the arrays of the given CSR graph. The DFS
+    follows the counterimages in the order in which they are stored in
+    `graph`, therefore the nodes finish in the same order of
+    :func:`compute_counterimage_finishing_time_list` if the counterimage of
+    each node is sorted by source (e.g. if `graph` was built from edges
+    sorted by source).
+
+    :param graph: The graph.
+    :returns: The nodes of :math:`G` sorted by increasing finishing time.
+    """
+
+    nvertexes = graph.number_of_nodes()
+    counterimage_offsets = graph.counterimage_offsets
+    counterimage = graph.counterimage
+
+    finishing_time_list = array(index_typecode(nvertexes))
+    visited = bytearray(nvertexes)
+    # pairs (node, position of the next node in counterimage)
+    stack = []
+    for root in range(nvertexes):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        stack.append((root, counterimage_offsets[root]))
+        while stack:
+            current, position = stack.pop()
+            end = counterimage_offsets[current + 1]
+            while position < end:
+                source = counterimage[position]
+                position += 1
+                if not visited[source]:
+                    visited[source] = 1
+                    stack.append((current, position))
+                    stack.append((source, counterimage_offsets[source]))
+                    break
+            else:
+                finishing_time_list.append(current)
+    return finishing_time_list
+
+
+def build_topological_csr_graph(
+    graph: CSRGraph, finishing_time_list=None
+) -> CSRGraph:
+    """
+    Build a copy of the given CSR graph whose images are arranged in the
+    order of :func:`build_vertexes_image` (inverse order of finishing time
+    for a DFS on :math:`G^{-1}`).
+
+    The images are built by a counting sort of the edges: the offsets of
+    the images don't change, and the counterimages are visited once in
+    inverse order of finishing time, while each source is appended to its
+    image. No vertex is needed, and the counterimage of `graph` is shared
+    with the new graph. If *NumPy* is available, the same counting sort is
+    vectorized: the edges are taken from the counterimage in inverse order
+    of finishing time, and then stably sorted by source with a radix sort.
+
+    :param graph: The graph.
+    :param finishing_time_list: The nodes of :math:`G` sorted by increasing
+        finishing time for a DFS on :math:`G^{-1}`. Defaults to `None`, in
+        which case it's computed with
+        :func:`csr_counterimage_finishing_time_list`.
+    """
+
+    if finishing_time_list is None:
+        finishing_time_list = csr_counterimage_finishing_time_list(graph)
+
+    image_offsets = graph.image_offsets
+    counterimage_offsets = graph.counterimage_offsets
+    counterimage = graph.counterimage
+    typecode = index_typecode(
+        max(graph.number_of_nodes(), graph.number_of_edges())
+    )
+
+    if np is not None:
+        nvertexes = graph.number_of_nodes()
+        nedges = len(counterimage)
+        # the counterimage groups the edges by destination: taking the
+        # destinations in inverse order of finishing time, we get the edges
+        # sorted by inverse finishing time of the destination
+        destinations = np.asarray(finishing_time_list)[::-1]
+        offsets = np.asarray(counterimage_offsets)
+        sizes = np.diff(offsets)[destinations]
+        positions = np.arange(nedges) + np.repeat(
+            offsets[destinations] - (np.cumsum(sizes) - sizes), sizes
+        )
+        sources = np.asarray(counterimage)[positions]
+        destinations = np.repeat(destinations, sizes)
+        # stable counting sort of the edges by source, one digit of 16 bits
+        # at a time (NumPy sorts 16-bit integers with a radix sort)
+        order = np.arange(nedges)
+        shift = 0
+        while True:
+            digit = ((sources[order] >> shift) & 0xFFFF).astype(np.uint16)
+            order = order[np.argsort(digit, kind="stable")]
+            shift += 16
+            if (nvertexes - 1) >> shift <= 0:
+                break
+        image = destinations[order].astype(np.dtype(typecode))
+        return CSRGraph(
+            nvertexes,
+            array(typecode, image_offsets),
+            array(typecode, image.tobytes()),
+            counterimage_offsets,
+            counterimage,
+        )
+
+    image = array(typecode, bytes(array(typecode).itemsize)) * len(
+        counterimage
+    )
+    position = array(typecode, image_offsets)
+    for destination in reversed(finishing_time_list):
+        start = counterimage_offsets[destination]
+        end = counterimage_offsets[destination + 1]
+        for source in counterimage[start:end]:
+            image[position[source]] = destination
+            position[source] += 1
+
+    return CSRGraph(
+        graph.number_of_nodes(),
+        array(typecode, image_offsets),
+        image,
+        counterimage_offsets,
+        counterimage,
+    )
 
 
 def decorate_nx_graph(
@@ -255,17 +520,23 @@ def decorate_nx_graph(
     compute_rank: bool = True,
     set_xblock: bool = True,
     preprocess: bool = True,
+    lightweight: bool = False,
+    edge_objects: bool = True,
+    bulk_build: bool = False,
+    rank=None,
 ) -> Tuple[List[_Vertex], List[_QBlock]]:
     """
     Create the *BisPy* representation of the given graph.
 
-    :param graph: The graph, in *NetworkX* representation.
+    :param graph: The graph, in *NetworkX* representation (or a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, or a `scipy.sparse`
+        adjacency matrix, whose arrays are read without any copy).
     :param initial_partition: The initial partition, or labeling set, imposed
         on the nodes of the graph. Defaults to the trivial labeling set (one
         block which contains all the nodes in the graph).
-    :param set_count: If `True`, we set the attribute `count` of each vertex
-        to an appropriate instance of
-        :class:`bispy.utilities.graph_entities._Count`. If `False`, the
+    :param set_count: If `True`, we set the attribute `count` of each edge
+        to an appropriate slot of a new
+        :class:`bispy.utilities.graph_entities._CountTable`. If `False`, the
         attribute is set to `None`. Defaults to `True`.
     :param topological_sorted_images: If `True`, the image of each vertex
         is computed using the function :func:`build_vertexes_image`. If
@@ -282,6 +553,30 @@ def decorate_nx_graph(
     :param preprocess: Preprocess the initial partition to split blocks which
         contain both leafs and non-leafs. Fundamental for *Paige-Tarjan*'s
         algorithm, may be disabled for other algorithms.
+    :param lightweight: If `True`, vertexes and blocks are instances of
+        :class:`bispy.utilities.graph_entities._LightVertex` and
+        :class:`bispy.utilities.graph_entities._LightQBlock`, which take less
+        memory but can only be used by *Paige-Tarjan*'s algorithm. Not
+        compatible with `compute_rank`. Defaults to `False`.
+    :param edge_objects: If `False`, the image and counterimage of each
+        vertex are lists of vertexes, and the slots of the counts are stored
+        in `vertex.counterimage_counts` (no instance of
+        :class:`bispy.utilities.graph_entities._Edge` is created). This
+        roughly halves the memory needed for the edges, and is supported by
+        *Paige-Tarjan*'s and *Dovier-Piazza-Policriti*'s algorithms and by
+        the computation of the *rank*, but not by *Saha*'s algorithm.
+        Defaults to `True`.
+    :param bulk_build: If `True`, the cyclic garbage collector is disabled
+        while the graph is built (see
+        :func:`bispy.utilities.bulk_build.bulk_build_mode`). Defaults to
+        `False`.
+    :param rank: The precomputed *rank* of the graph, as an instance of
+        :class:`bispy.utilities.graph_rank.GraphRank` (see
+        :func:`bispy.utilities.graph_rank.graph_rank`). If not `None`, the
+        rank is not computed again, and `compute_rank` is ignored. It
+        **must** be the rank of this exact graph: only the number of nodes
+        and edges is checked, a rank computed for a different graph may
+        silently produce a wrong result. Defaults to `None`.
     :returns: A tuple whose items are:
 
         0. List of vertexes of the graph;
@@ -290,25 +585,58 @@ def decorate_nx_graph(
         Both items are in *BisPy* representation.
     """
 
+    if rank is not None:
+        compute_rank = True
+    if lightweight and compute_rank:
+        raise ValueError("Lightweight vertexes do not support the rank")
+
+    graph = as_csr_graph(graph)
+
     if initial_partition is None:
         initial_partition = _trivial_initial_partition(len(graph.nodes))
 
-    tp = as_bispy_graph(
-        graph,
-        initial_partition,
-        set_count=set_count,
-        build_image=(not topological_sorted_images),
-        set_xblock=set_xblock,
+    check_graph_rank(rank, graph)
+
+    # the rank of CSR graphs is computed on the integer arrays of the graph
+    # (see csr_rank), which is much faster than the visits of the vertexes
+    csr_compute_rank = compute_rank and (
+        rank is not None or isinstance(graph, CSRGraph)
     )
 
-    qpartition = decorate_bispy_graph(
-        tp[0],
-        initial_partition=initial_partition,
-        set_count=False,
-        topological_sorted_images=topological_sorted_images,
-        compute_rank=compute_rank,
-        preprocess=preprocess,
+    # the images of CSR graphs are sorted on the arrays of the graph (see
+    # build_topological_csr_graph), and then built in the order of the
+    # edges
+    csr_sorted_images = topological_sorted_images and isinstance(
+        graph, CSRGraph
     )
+    if csr_sorted_images:
+        graph = build_topological_csr_graph(graph)
+
+    with bulk_build_mode(bulk_build):
+        tp = as_bispy_graph(
+            graph,
+            initial_partition,
+            set_count=set_count,
+            build_image=(csr_sorted_images or not topological_sorted_images),
+            set_xblock=set_xblock,
+            lightweight=lightweight,
+            edge_objects=edge_objects,
+        )
+
+        qpartition = decorate_bispy_graph(
+            tp[0],
+            initial_partition=initial_partition,
+            set_count=False,
+            topological_sorted_images=(
+                topological_sorted_images and not csr_sorted_images
+            ),
+            compute_rank=(compute_rank and not csr_compute_rank),
+            preprocess=preprocess,
+        )
+        if rank is not None:
+            assign_rank(tp[0], rank.scc, rank.scc_rank, rank.scc_wf)
+        elif csr_compute_rank:
+            assign_rank(tp[0], *csr_rank(graph))
 
     if qpartition is not None:
         return (tp[0], qpartition)
@@ -316,6 +644,28 @@ def decorate_nx_graph(
         return tp
 
 
+def _set_compact_count(vertexes: List[_Vertex]):
+    # the same of `set_count` in `decorate_bispy_graph` for vertexes with
+    # compact adjacency. the slot of each source is stored in `aux_count`
+    count_table = _CountTable(
+        len(vertexes) + sum(len(vertex.counterimage) for vertex in vertexes)
+    )
+    epoch = new_epoch()
+    for vertex in vertexes:
+        vertex.count_table = count_table
+        for source in vertex.counterimage:
+            if source.visit_epoch != epoch:
+                source.visit_epoch = epoch
+                source.aux_count = count_table.new_slot()
+            count_table.values[source.aux_count] += 1
+
+    for vertex in vertexes:
+        vertex.counterimage_counts = array(
+            count_table.values.typecode,
+            (source.aux_count for source in vertex.counterimage),
+        )
+
+
 def decorate_bispy_graph(
     vertexes: List[_Vertex],
     initial_partition: List[Tuple[int]] = None,
@@ -331,9 +681,9 @@ def decorate_bispy_graph(
     :param initial_partition: The initial partition, or labeling set, imposed
         on the nodes of the graph. Defaults to the trivial labeling set (one
         block which contains all the nodes in the graph).
-    :param set_count: If `True`, we set the attribute `count` of each vertex
-        to an appropriate instance of
-        :class:`bispy.utilities.graph_entities._Count`. If `False`, the
+    :param set_count: If `True`, we set the attribute `count` of each edge
+        to an appropriate slot of a new
+        :class:`bispy.utilities.graph_entities._CountTable`. If `False`, the
         attribute is set to `None`. Defaults to `True`.
     :param topological_sorted_images: If `True`, the image of each vertex
         is computed using the function :func:`build_vertexes_image`. If
@@ -365,13 +715,20 @@ def decorate_bispy_graph(
             for vx in block:
                 vertexes[vx].initial_partition_block_id = idx
 
-    if set_count:
+    if set_count and not vertexes[0].edge_objects:
+        _set_compact_count(vertexes)
+    elif set_count:
         # set count reference
+        count_table = _CountTable(
+            len(vertexes) + sum(len(vertex.image) for vertex in vertexes)
+        )
         for vertex in vertexes:
-            count = _Count(vertex)
-            for edge in vertex.image:
-                edge.count = count
-                edge.count.value += 1
+            vertex.count_table = count_table
+            if len(vertex.image) > 0:
+                count = count_table.new_slot()
+                for edge in vertex.image:
+                    edge.count = count
+                count_table.values[count] = len(vertex.image)
 
     if topological_sorted_images:
         finishing_time_list = compute_counterimage_finishing_time_list(
@@ -400,5 +757,51 @@ def to_tuple_list(qblocks: List[_QBlock]) -> List[Tuple]:
     ]
 
 
+def iter_blocks(
+    qblocks: List[_QBlock], idx_to_node: List[Any] = None
+) -> Iterator[Tuple]:
+    """Yield the blocks of the given partition one at a time, as tuples of
+    labels (in the same order of :func:`to_tuple_list`).
+
+    The partition is consumed by the iteration: each block is removed from
+    `qblocks` (and from its block of :math:`X`) before being yielded, and
+    the adjacency lists of its vertexes are dropped. Therefore the memory
+    taken by the blocks already yielded can be reclaimed before the
+    iteration is over, if no other reference to them is kept.
+
+    :param qblocks: A partition, which is emptied during the iteration.
+    :param idx_to_node: If not `None`, the inverse of the mapping used to
+        obtain the integer graph (see
+        :func:`bispy.utilities.graph_normalization.inverse_mapping`), which
+        is used to translate each block back to the original nodes. Defaults
+        to `None`.
+    """
+
+    # blocks are popped from the end of the list
+    qblocks.reverse()
+    while qblocks:
+        qblock = qblocks.pop()
+        vertexes = qblock.vertexes
+        qblock.vertexes = []
+        qblock.size = 0
+        qblock.split_helper_block = None
+        if qblock.xblock is not None:
+            qblock.xblock.remove_qblock(qblock)
+
+        for vertex in vertexes:
+            vertex._qblock = None
+            vertex.image = _RELEASED
+            vertex.counterimage = _RELEASED
+
+        block = tuple(map(_get_label, vertexes))
+        if idx_to_node is not None:
+            block = tuple(map(idx_to_node.__getitem__, block))
+
+        # the generator must not keep any reference to the block while it's
+        # suspended
+        del qblock, vertexes
+        yield block
+
+
 def to_set(qblocks: List[Tuple[int]]) -> Set:
     return set(frozenset(block) for block in qblocks)
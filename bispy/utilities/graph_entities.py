@@ -1,46 +1,94 @@
-from llist import dllist, dllistnode
 from typing import Iterable, Callable, Any, Union, List
+from itertools import count
+from operator import attrgetter
+from bispy.utilities.csr_graph import index_typecode, _zeros
 
+# source of the epochs used to stamp visited vertexes
+_epochs = count(1)
 
-class _Vertex:
-    """BisPy representation of a vertex. Contains several data structures which
-    provide :math:`O(1)` access to the :math:`E(\\textit{vertex})` and
-    :math:`E^{-1}(\\textit{vertex})`, as well as attributes to store temporary
-    information used among different parts of the algorithm (make sure to reset
-    them when they are not needed anymore).
+
+def new_epoch() -> int:
+    """Return a new *epoch*, namely an integer greater than any epoch returned
+    before. Traversals stamp the vertexes they visit with the current epoch,
+    therefore a vertex has been visited iff its stamp is equal to the current
+    epoch, and no cleanup pass is needed to reset the marks when the traversal
+    ends.
+    """
+
+    return next(_epochs)
+
+
+_edge_source = attrgetter("source")
+_edge_destination = attrgetter("destination")
+
+
+class _LightVertex:
+    """Lightweight *BisPy* representation of a vertex, which carries only the
+    attributes needed by *Paige-Tarjan*'s algorithm. Contains several data
+    structures which provide :math:`O(1)` access to the
+    :math:`E(\\textit{vertex})` and :math:`E^{-1}(\\textit{vertex})`, as well
+    as attributes to store temporary information used among different parts
+    of the algorithm (visit marks are epoch stamps, see :func:`new_epoch`, and
+    do not need to be reset).
+
+    Algorithms which need the *rank*, *strongly connected components* or the
+    bookkeeping of *Saha*'s algorithm should use :class:`_Vertex`.
 
     :param int label: A unique integer ID which identifies this vertex.
     """
 
+    __slots__ = (
+        "_label",
+        "_qblock",
+        "_position",
+        "visit_epoch",
+        "image",
+        "counterimage",
+        "aux_count",
+        "second_splitter_epoch",
+        "initial_partition_block_id",
+        "count_table",
+        "counterimage_counts",
+    )
+
+    # `image` and `counterimage` contain instances of `_Edge`
+    edge_objects = True
+
     def __init__(self, label):
         """Constructor method"""
         self._label = label
         self._qblock = None
 
-        # the dllistobject which refers to this vertex inside the dllist inside
-        # the QBlock which contains this vertex
-        self._dllistnode = None
+        # the index of this vertex inside the list of vertexes of the QBlock
+        # which contains this vertex
+        self._position = None
 
-        # a property shared by many algorithms, reset it to False after usage
-        self.visited = False
+        # the epoch (see `new_epoch`) of the last traversal which visited this
+        # vertex, shared by many algorithms
+        self.visit_epoch = 0
 
         # a list of `_Edge` instances from `self` to the `_Vertex` instances in
-        # the image of this `_Vertex`.
+        # the image of this `_Vertex` (a list of vertexes if `edge_objects`
+        # is `False`).
         self.image = []
         # a list of `_Edge` instances from `self` to the `_Vertex` instances in
-        # the counterimage of this `_Vertex`.
+        # the counterimage of this `_Vertex` (a list of vertexes if
+        # `edge_objects` is `False`).
         self.counterimage = []
 
+        # a slot of `count_table`, meaningful only if `visit_epoch` is the
+        # epoch of the current traversal
         self.aux_count = None
-        self.in_second_splitter = False
-
-        self._original_label = label
+        self.second_splitter_epoch = 0
 
         self.initial_partition_block_id = None
 
-        self.allow_visit = False
+        # the `_CountTable` which holds the values referenced by `aux_count`
+        # and by the edges in the image of this vertex
+        self.count_table = None
 
-        self._scc = None
+        # used only if `edge_objects` is `False`, see `_CompactAdjacency`
+        self.counterimage_counts = None
 
     @property
     def label(self):
@@ -48,18 +96,67 @@ class _Vertex:
         change if a method like :func:`scale_label` is called."""
         return self._label
 
-    @property
-    def original_label(self):
-        """The original label assigned to this :class:`_Vertex` instance.
-        Does not change (ever!)."""
-        return self._original_label
-
     @property
     def qblock(self):
         """The :class:`_QBlock` instance that this :class:`_Vertex` belongs to
         at the moment."""
         return self._qblock
 
+    def add_to_counterimage(self, edge):
+        self.counterimage.append(edge)
+
+    def add_to_image(self, edge):
+        self.image.append(edge)
+
+    def predecessors(self) -> Iterable["_LightVertex"]:
+        """The vertexes in the counterimage of this vertex (no copy is
+        made)."""
+        return map(_edge_source, self.counterimage)
+
+    def successors(self) -> Iterable["_LightVertex"]:
+        """The vertexes in the image of this vertex (no copy is made)."""
+        return map(_edge_destination, self.image)
+
+    def __repr__(self):
+        return "V{}".format(self.label)
+
+
+class _Vertex(_LightVertex):
+    """BisPy representation of a vertex. Extends :class:`_LightVertex` with
+    the attributes needed to compute the *rank* and to run
+    *Dovier-Piazza-Policriti*'s and *Saha*'s algorithms.
+
+    :param int label: A unique integer ID which identifies this vertex.
+    """
+
+    __slots__ = (
+        "_original_label",
+        "subgraph_epoch",
+        "_scc",
+        "_original_count",
+        "reachable_epoch",
+    )
+
+    def __init__(self, label):
+        """Constructor method"""
+        super().__init__(label)
+
+        self._original_label = label
+
+        # the epoch of the last subgraph this vertex was part of
+        self.subgraph_epoch = 0
+        # the epoch of the last computation of the SCCs reachable from a
+        # vertex which reached this vertex (see `kosaraju`)
+        self.reachable_epoch = 0
+
+        self._scc = None
+
+    @property
+    def original_label(self):
+        """The original label assigned to this :class:`_Vertex` instance.
+        Does not change (ever!)."""
+        return self._original_label
+
     @property
     def scc(self):
         """The :class:`_SCC` instance that this :class:`_Vertex` belongs to
@@ -112,86 +209,147 @@ class _Vertex:
         """
         self._label = self.original_label
 
-    # creates a subgraph which contains only vertexes of the
-    # same rank of this vertex.
-    def restrict_to_subgraph(self, validation: Callable[[Any], bool]):
+    # makes this vertex part of a subgraph (e.g. vertexes of the same rank).
+    # no copy of the image/counterimage is made.
+    def restrict_to_subgraph(self, subgraph_epoch: int):
         """
-        Restrict the image and counterimage only to vertexes that satisfy the
-        given validation function, and resets the value of the associated
-        :class:`_Count` instanced.
-
-        Also sets `_original_img`, `_original_counterimg`, `_original_count`,
-        which can then be recovered using :func:`back_to_original_graph`.
-
-        :param validation: A function which returns `True` when the vertex
-            given as argument is accepted in the subgraph.
-        :type validation: Callable[[_Vertex], bool]
+        Make this vertex part of the subgraph whose vertexes are stamped with
+        `subgraph_epoch` (see :func:`new_epoch`). The subgraph is a *view* of
+        the graph: the image and counterimage are not copied, algorithms
+        which support subgraphs (like
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan_qblocks`) skip
+        the edges whose endpoints are not stamped with `subgraph_epoch`.
+
+        This method assigns a new slot of the :class:`_CountTable` to the
+        edges in the image of this vertex which belong to the subgraph, and
+        stores the original slot in `_original_count`, which can then be
+        recovered using :func:`back_to_original_graph`. Each vertex of the
+        subgraph must be stamped before calling this method.
+
+        :param subgraph_epoch: The epoch which identifies the subgraph.
         """
 
-        # this will be called just before calling PTA, therefore set the _Count
-        # instance for each _Edge
-
-        self._original_img = self.image
-        self.image = []
+        self.subgraph_epoch = subgraph_epoch
 
+        # this will be called just before calling PTA, therefore set the count
+        # slot for each _Edge
         self._original_count = None
-        count = _Count(self)
+        count = None
 
-        for edge in self._original_img:
-            if validation(edge.destination):
-                self.add_to_image(edge)
+        for edge in self.image:
+            if self._original_count is None:
+                self._original_count = edge.count
 
-                if self._original_count is None:
-                    self._original_count = edge.count
+            if edge.destination.subgraph_epoch == subgraph_epoch:
+                if count is None:
+                    count = self.count_table.new_slot()
 
                 # set the count for this _Edge, and increment the counter
                 edge.count = count
-                count.value += 1
-
-        self._original_counterimg = self.counterimage
-        self.counterimage = []
-
-        for edge in self._original_counterimg:
-            if validation(edge.source):
-                self.add_to_counterimage(edge)
+                self.count_table.values[count] += 1
 
     def back_to_original_graph(self):
         """
-        Recover the original image, counterimage and associated values
-        of :class:`_Count`, must be called after a call to
-        :func:`restrict_to_subgraph`.
+        Recover the original slots of the :class:`_CountTable` (the slots
+        used in the subgraph are released), must be called after a call to
+        :func:`restrict_to_subgraph` and before the creation of another
+        subgraph.
         """
 
-        self.image = self._original_img
-        self.counterimage = self._original_counterimg
+        subgraph_epoch = self.subgraph_epoch
 
+        # slots are never shared among different vertexes, therefore we can
+        # release the slots referenced by the edges in the subgraph
+        subgraph_slots = set()
         for edge in self.image:
+            if edge.destination.subgraph_epoch == subgraph_epoch:
+                subgraph_slots.add(edge.count)
             edge.count = self._original_count
+        for slot in subgraph_slots:
+            self.count_table.release_slot(slot)
 
         self._original_count = None
-        self._original_counterimg = None
-        self._original_img = None
 
-    def add_to_counterimage(self, edge):
-        self.counterimage.append(edge)
 
-    def add_to_image(self, edge):
-        self.image.append(edge)
+class _CompactAdjacency:
+    """Mixin for vertexes whose `image` and `counterimage` are lists of
+    vertexes instead of lists of :class:`_Edge` (no object is allocated for
+    the edges of the graph). The slot of :class:`_CountTable` of the edge
+    :math:`\\langle \\textit{counterimage}[i], \\textit{vertex} \\rangle`
+    is `counterimage_counts[i]`, an `array.array` parallel to `counterimage`.
+    """
 
-    def visit(self):
-        self.visited = True
+    __slots__ = ()
 
-    def release(self):
-        self.visited = False
+    edge_objects = False
 
-    def added_to_second_splitter(self):
-        self.in_second_splitter = True
+    def predecessors(self):
+        return self.counterimage
 
-    def clear_second_splitter_flag(self):
-        self.in_second_splitter = False
+    def successors(self):
+        return self.image
 
-    def __repr__(self):
-        return "V{}".format(self.label)
+
+class _CompactLightVertex(_CompactAdjacency, _LightVertex):
+    """A :class:`_LightVertex` with compact adjacency (see
+    :class:`_CompactAdjacency`).
+
+    :param int label: A unique integer ID which identifies this vertex.
+    """
+
+    __slots__ = ()
+
+
+class _CompactVertex(_CompactAdjacency, _Vertex):
+    """A :class:`_Vertex` with compact adjacency (see
+    :class:`_CompactAdjacency`). Not supported by *Saha*'s algorithm.
+
+    :param int label: A unique integer ID which identifies this vertex.
+    """
+
+    __slots__ = ()
+
+    def restrict_to_subgraph(self, subgraph_epoch: int):
+        """See :func:`_Vertex.restrict_to_subgraph`. Since slots are stored on
+        the counterimage side, this method assigns a new slot to the edges
+        from the vertexes of the subgraph to this vertex.
+
+        :param subgraph_epoch: The epoch which identifies the subgraph.
+        """
+
+        # the slot of each source is taken the first time we find the source
+        # (sources are visited with `subgraph_epoch`), and its original slot
+        # is stored in the source.
+        self.subgraph_epoch = subgraph_epoch
+
+        counts = self.counterimage_counts
+        values = self.count_table.values
+        for idx, source in enumerate(self.counterimage):
+            if source.subgraph_epoch == subgraph_epoch:
+                if source.visit_epoch != subgraph_epoch:
+                    source.visit_epoch = subgraph_epoch
+                    source._original_count = counts[idx]
+                    source.aux_count = self.count_table.new_slot()
+
+                counts[idx] = source.aux_count
+                values[source.aux_count] += 1
+
+    def back_to_original_graph(self):
+        """See :func:`_Vertex.back_to_original_graph`."""
+
+        subgraph_epoch = self.subgraph_epoch
+
+        counts = self.counterimage_counts
+        values = self.count_table.values
+        for idx, source in enumerate(self.counterimage):
+            if source.subgraph_epoch == subgraph_epoch:
+                slot = counts[idx]
+                # slots in use have a positive value: we set the value to
+                # zero in order to release each slot only once
+                if values[slot] != 0:
+                    values[slot] = 0
+                    self.count_table.release_slot(slot)
+                counts[idx] = source._original_count
 
 
 class _Edge:
@@ -201,6 +359,8 @@ class _Edge:
     :param destination: The destination of the edge.
     """
 
+    __slots__ = ("source", "destination", "_count")
+
     def __init__(self, source: _Vertex, destination: _Vertex):
         self.source = source
         self.destination = destination
@@ -208,9 +368,9 @@ class _Edge:
 
     @property
     def count(self):
-        """Holds the value :math:`|E({\\textit{source}}) \\cap S|`, where
-        :math:`S` is the block of the partition :math:`X` that `destination`
-        belongs to.
+        """The slot of the :class:`_CountTable` of `source` which holds the
+        value :math:`|E({\\textit{source}}) \\cap S|`, where :math:`S` is the
+        block of the partition :math:`X` that `destination` belongs to.
         """
 
         return self._count
@@ -237,141 +397,159 @@ class _Edge:
         return "<{},{}>".format(self.source, self.destination)
 
 
-class _QBlock:
-    """A block of the partition :math:`Q`. This is also used as a
-    general-purpose block by *Dovier-Piazza-Policriti*'s and *Saha*'s
-    algorithms.
+class _LightQBlock:
+    """A block of the partition :math:`Q` which carries only the attributes
+    needed by *Paige-Tarjan*'s algorithm. Blocks used by
+    *Dovier-Piazza-Policriti*'s and *Saha*'s algorithms should be instances of
+    :class:`_QBlock`.
 
-    This class uses a *Doubly-Linked-List* to store the set vertexes inside
-    the block, therefore we are able to remove a node in :math:`O(1)`.
+    The vertexes inside the block are stored in a list, and each vertex
+    knows its index in that list (`vertex._position`). A vertex is removed by
+    moving the last vertex of the list into its position, therefore we are
+    able to remove a node in :math:`O(1)` without allocating or freeing any
+    object. Note that the order of the vertexes in the block is not
+    preserved.
 
     :param vertexes: Vertexes in the block.
     :param xblock: The block of :math:`X` that this block belongs to.
     :type xblock: _XBlock
     """
 
-    def __init__(self, vertexes: List[_Vertex], xblock):
-        self.vertexes = dllist([])
+    __slots__ = (
+        "vertexes",
+        "size",
+        "split_helper_block",
+        "_position",
+        "_xblock",
+        "is_new_qblock",
+    )
+
+    def __init__(self, vertexes: List[_LightVertex], xblock):
+        self.vertexes = []
 
         for vertex in vertexes:
             self.append_vertex(vertex)
 
-        self.size = self.vertexes.size
+        self.size = len(self.vertexes)
         self.split_helper_block = None
-        self.dllistnode = None
-        self.visited = False
+        # the index of this block inside the list of blocks of its XBlock
+        self._position = None
 
+        self._xblock = None
         if xblock is not None:
             xblock.append_qblock(self)
 
-        self.deteached = False
-        self.tried_merge = False
-
         self.is_new_qblock = False
 
-    @property
-    def rank(self) -> int:
-        """
-        The rank of all the vertexes in this block (note that in general
-        one may create a :class:`_QBlock` from an arbitrary set of vertexes,
-        in that case we cannot say in general that those vertexes have all
-        the same rank).
-        """
-
-        if self.vertexes.first is not None:
-            return self.vertexes.first.value.rank
-        else:
-            return None
-
     @property
     def xblock(self):
         """
         The block of :math:`X` this block belongs to.
         """
 
-        if hasattr(self, "_xblock"):
-            return self._xblock
-        else:
-            return None
+        return self._xblock
 
     @xblock.setter
     def xblock(self, value):
         self._xblock = value
 
     # this doesn't check if the vertex is a duplicate.
-    # make sure that vertex is a proper _Vertex, not a dllistnode
-    def append_vertex(self, vertex: _Vertex):
+    def append_vertex(self, vertex: _LightVertex):
         """
         Append a new vertex to this block. This also sets the attributes
-        `vertex._dllistnode` and `vertex._qblock`, and updates the attribute
+        `vertex._position` and `vertex._qblock`, and updates the attribute
         `size`.
 
         :param vertex: The new vertex to be added.
         """
 
-        vertex._dllistnode = self.vertexes.append(vertex)
-        self.size = self.vertexes.size
+        vertex._position = len(self.vertexes)
+        self.vertexes.append(vertex)
+        self.size = len(self.vertexes)
         vertex._qblock = self
 
-    def remove_vertex(self, vertex: _Vertex):
+    def remove_vertex(self, vertex: _LightVertex):
         """
         Remove a vertex to this block. This also resets the attribute
         `vertex._qblock`, and updates the attribute `size`.
 
-        This function uses the attribute `vertex._dllistnode` to
-        modify the Doubly-Linked-List in the attribute `vertexes` in
-        :math:`O(1)`.
+        This function uses the attribute `vertex._position` to move the last
+        vertex of the list in the attribute `vertexes` in place of the removed
+        vertex, which takes :math:`O(1)`.
 
         :param vertex: The new vertex to be added.
         """
 
-        self.vertexes.remove(vertex._dllistnode)
-        self.size = self.vertexes.size
+        last_vertex = self.vertexes.pop()
+        if last_vertex is not vertex:
+            self.vertexes[vertex._position] = last_vertex
+            last_vertex._position = vertex._position
+        self.size = len(self.vertexes)
         vertex._qblock = None
 
-    def initialize_split_helper_block(self):
-        self.split_helper_block = _QBlock([], self.xblock)
+    def initialize_split_helper_block(self, pool=None):
+        """Create the block which receives the vertexes split from this
+        block, and append it to the same block of :math:`X`.
+
+        :param pool: If not `None`, the helper block is taken from this
+            :class:`bispy.paige_tarjan.refinement_pool.RefinementPool` when
+            possible. Defaults to `None`.
+        """
+
+        if pool is None:
+            self.split_helper_block = type(self)([], self.xblock)
+        else:
+            self.split_helper_block = pool.take_qblock(type(self), self.xblock)
 
     def reset_helper_block(self):
         self.split_helper_block = None
 
-    def initialize_split_helper_block(self):
-        self.split_helper_block = _QBlock([], self.xblock)
+    def recycle(self, xblock):
+        """Reset the attributes of an empty block taken from a
+        :class:`bispy.paige_tarjan.refinement_pool.RefinementPool`, and
+        append it to the given block of :math:`X`.
 
-    def initial_partition_block_id(self):
-        if self.vertexes.size > 0:
-            return self.vertexes.first.value.initial_partition_block_id
-        else:
-            return None
-
-    def merge(self, block2):
+        :param xblock: The block of :math:`X` that this block is going to
+            belong to.
+        :type xblock: _XBlock
         """
-        Add all the vertexes in `block2` to this block, and then set
-        the attribute `block2.deteached` to `True`.
 
-        :param block2: The block to be merged into `self`.
-        :type block2: _QBlock
+        self.size = 0
+        self.split_helper_block = None
+        self.is_new_qblock = False
+        xblock.append_qblock(self)
+
+    def exchange_vertexes(self, other):
+        """Exchange the vertexes of this block with the vertexes of `other`
+        without moving them one by one. Vertexes keep their position inside
+        the list of vertexes.
+
+        :param other: Another block of :math:`Q`.
+        :type other: _LightQBlock
         """
 
-        for vertex in block2.vertexes:
-            self.append_vertex(vertex)
-        block2.deteached = True
+        self.vertexes, other.vertexes = other.vertexes, self.vertexes
+        self.size, other.size = other.size, self.size
+        for vertex in self.vertexes:
+            vertex._qblock = self
+        for vertex in other.vertexes:
+            vertex._qblock = other
 
     def __repr__(self):
         return "Q({})".format(
             ",".join([str(vertex) for vertex in self.vertexes])
-        ) + ("DET" if self.deteached else "")
+        )
 
-    def fast_mitosis(self, extract_vertexes: List[_Vertex]):
+    def fast_mitosis(self, extract_vertexes: List[_LightVertex]):
         """Extract a subset of vertexes from this block to create a new block.
 
         :param extract_vertexes: The subset of vertexes to be extracted.
         :return: The new block which contains the vertexes in
             `extract_vertexes`.
-        :rtype: _QBlock
+        :rtype: _LightQBlock
         """
 
-        new_block = _QBlock([], self.xblock)
+        new_block = type(self)([], self.xblock)
         for vertex in extract_vertexes:
             self.remove_vertex(vertex)
             new_block.append_vertex(vertex)
@@ -379,10 +557,10 @@ class _QBlock:
 
     # only for testing purposes
     def _mitosis(self, vertexes1, vertexes2):
-        new_block = _QBlock([], self.xblock)
+        new_block = type(self)([], self.xblock)
 
         for to_remove in vertexes2:
-            for vertex in self.vertexes:
+            for vertex in list(self.vertexes):
                 if to_remove == vertex.label:
                     self.remove_vertex(vertex)
                     new_block.append_vertex(vertex)
@@ -390,30 +568,105 @@ class _QBlock:
         return new_block
 
 
+class _QBlock(_LightQBlock):
+    """A block of the partition :math:`Q`. This is also used as a
+    general-purpose block by *Dovier-Piazza-Policriti*'s and *Saha*'s
+    algorithms.
+
+    See :class:`_LightQBlock` for a description of the way vertexes are
+    stored.
+
+    :param vertexes: Vertexes in the block.
+    :param xblock: The block of :math:`X` that this block belongs to.
+    :type xblock: _XBlock
+    """
+
+    __slots__ = ("visited", "deteached", "tried_merge")
+
+    def __init__(self, vertexes: List[_Vertex], xblock):
+        super().__init__(vertexes, xblock)
+
+        self.visited = False
+        self.deteached = False
+        self.tried_merge = False
+
+    def recycle(self, xblock):
+        super().recycle(xblock)
+
+        self.visited = False
+        self.deteached = False
+        self.tried_merge = False
+
+    @property
+    def rank(self) -> int:
+        """
+        The rank of all the vertexes in this block (note that in general
+        one may create a :class:`_QBlock` from an arbitrary set of vertexes,
+        in that case we cannot say in general that those vertexes have all
+        the same rank).
+        """
+
+        if self.vertexes:
+            return self.vertexes[0].rank
+        else:
+            return None
+
+    def initial_partition_block_id(self):
+        if self.vertexes:
+            return self.vertexes[0].initial_partition_block_id
+        else:
+            return None
+
+    def merge(self, block2):
+        """
+        Add all the vertexes in `block2` to this block, and then set
+        the attribute `block2.deteached` to `True`.
+
+        :param block2: The block to be merged into `self`.
+        :type block2: _QBlock
+        """
+
+        for vertex in block2.vertexes:
+            self.append_vertex(vertex)
+        block2.deteached = True
+
+    def __repr__(self):
+        return super().__repr__() + ("DET" if self.deteached else "")
+
+
 class _XBlock:
     """A block of the partition :math:`X`.
 
-    This class uses a *Doubly-Linked-List* to store the set vertexes inside
-    the block, therefore we are able to remove a block in :math:`O(1)`.
+    The blocks of :math:`Q` are stored in a list in the same way of the
+    vertexes of :class:`_LightQBlock`, therefore we are able to remove a block
+    in :math:`O(1)`.
+
+    The attribute `rank` is set by the Ranked *Paige-Tarjan*'s algorithm
+    (see :mod:`bispy.saha.ranked_compound_xblocks_container`), and is `None`
+    otherwise.
     """
 
+    __slots__ = ("qblocks", "rank")
+
     def __init__(self):
-        self.qblocks = dllist([])
+        self.qblocks = []
+        self.rank = None
 
     @property
     def size(self):
         """The number of blocks of :math:`Q` in this block of :math:`X`."""
-        return self.qblocks.size
+        return len(self.qblocks)
 
     def append_qblock(self, qblock: _QBlock):
         """Insert a new block of :math:`Q` in this block. This also sets the
-        attributes `qblock.dllistnode` and `qblock.xblock`.
+        attributes `qblock._position` and `qblock.xblock`.
 
         :param: The block of :math:`Q` to be inserted.
         :returns: `self`, to allow chain insertions.
         :rtype: _XBlock"""
 
-        qblock.dllistnode = self.qblocks.append(qblock)
+        qblock._position = len(self.qblocks)
+        self.qblocks.append(qblock)
         qblock.xblock = self
         return self
 
@@ -424,21 +677,65 @@ class _XBlock:
         :param: The block of :math:`Q` to be removed.
         """
 
-        self.qblocks.remove(qblock.dllistnode)
+        last_qblock = self.qblocks.pop()
+        if last_qblock is not qblock:
+            self.qblocks[qblock._position] = last_qblock
+            last_qblock._position = qblock._position
         qblock.xblock = None
 
     def __repr__(self):
         return "X[{}]".format(",".join(str(qblock) for qblock in self.qblocks))
 
 
-# holds the value of count(vertex,_XBlock) = |_XBlock \cap E({vertex})|
-class _Count:
-    def __init__(self, vertex: _Vertex):
-        self.vertex = vertex
-        self.value = 0
+class _CountTable:
+    """Holds the values :math:`\\textit{count}(x,S) = |S \\cap E({x})|`,
+    where :math:`x` is a vertex and :math:`S` is a block of the partition
+    :math:`X`, in a preallocated integer array. Each value occupies a *slot*,
+    and edges (and `_LightVertex.aux_count`) hold the index of their slot.
+    Slots are recycled when released, therefore *Paige-Tarjan*'s refinement
+    steps do not allocate new objects.
+
+    :param capacity: The number of slots to preallocate. The table grows
+        automatically if more slots are needed.
+    """
+
+    __slots__ = ("values", "_used", "_free_slots")
+
+    def __init__(self, capacity: int = 0):
+        self.values = _zeros(index_typecode(capacity), capacity)
+        # number of slots taken at least once
+        self._used = 0
+        self._free_slots = []
+
+    def new_slot(self) -> int:
+        """Take a slot (whose value is zero) and return its index."""
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.values[slot] = 0
+        else:
+            slot = self._used
+            if slot == len(self.values):
+                self.values.append(0)
+            self._used += 1
+        return slot
+
+    def release_slot(self, slot: int):
+        """Release the given slot, which may be returned by a future call to
+        :func:`new_slot`.
+
+        :param slot: A slot which is not referenced anymore.
+        """
+
+        self._free_slots.append(slot)
+
+    def __len__(self):
+        return self._used - len(self._free_slots)
 
     def __repr__(self):
-        return "C{}:{}".format(self.vertex, self.value)
+        return "CountTable(slots={}, capacity={})".format(
+            len(self), len(self.values)
+        )
 
 
 class _SCC:
@@ -448,6 +745,16 @@ class _SCC:
     :param label: A unique ID.
     """
 
+    __slots__ = (
+        "_label",
+        "_rank",
+        "_image",
+        "_counterimage",
+        "_vertexes",
+        "visited",
+        "_wf",
+    )
+
     def __init__(self, label: int):
         self._label = label
         self._rank = float("-inf")
@@ -523,31 +830,29 @@ class _SCC:
 
         self._image.clear()
         for vx in self._vertexes:
-            for edge in vx.image:
+            for destination in vx.successors():
                 # edge towards self
-                if edge.destination.scc == self:
+                if destination.scc == self:
                     self._wf = False
                 else:
                     # NO! there's no guarantee that the visit occurs
                     # in the right order. we can't rely on the .wf
                     # field of successors, since it may not be the truth
-                    # if not edge.destination.wf:
+                    # if not destination.wf:
                     #    self._wf = False
-                    self._image[
-                        edge.destination.scc.label
-                    ] = edge.destination.scc
+                    self._image[destination.scc.label] = destination.scc
 
     def compute_counterimage(self):
         """Compute the counterimage of this SCC."""
 
         self._counterimage.clear()
         for vx in self._vertexes:
-            for edge in vx.counterimage:
+            for source in vx.predecessors():
                 # edge towards self, don't include
-                if edge.source.scc == self:
+                if source.scc == self:
                     continue
                 else:
-                    self._counterimage[edge.source.scc.label] = edge.source.scc
+                    self._counterimage[source.scc.label] = source.scc
 
     def destroy(self):
         """Destroy this SCC (image, counterimage and vertexes set)."""
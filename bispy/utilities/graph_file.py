@@ -0,0 +1,473 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Tuple, Union
+
+import networkx as nx
+
+from bispy.utilities.block_labels import BlockLabels
+from bispy.utilities.graph_decorator import (
+    as_bispy_graph,
+    build_topological_csr_graph,
+    preprocess_initial_partition,
+)
+from bispy.utilities.graph_entities import _QBlock, _Vertex
+from bispy.utilities.csr_graph import CSRGraph, index_typecode
+from bispy.utilities.edge_arrays import EdgeArrayGraph, labels_to_partition
+from bispy.utilities.graph_normalization import check_normal_integer_graph
+from bispy.utilities.rank_computation import assign_rank, csr_rank
+from bispy.utilities.sparse_matrix import as_csr_graph
+
+# layout of a BisPy graph file (all the integers are little-endian):
+#
+#   header (64 bytes): magic, version, size in bytes of the integers which
+#       follow (4 or 8), flags, number of nodes, number of edges;
+#   image offsets (nvertexes + 1 integers);
+#   image (nedges integers);
+#   labels (nvertexes integers, only if the flag _HAS_LABELS is set): the
+#       index of the block of the initial partition of each node;
+#   decoration (only if the flag _HAS_DECORATION is set, in which case the
+#       image of each node is in topological order and the number of SCCs
+#       follows the header fields): counterimage offsets (nvertexes + 1
+#       integers), counterimage (nedges integers), the SCC of each node
+#       (nvertexes integers), the rank of each SCC (_NO_RANK stands for
+#       -inf) and the well-foundedness of each SCC (0 or 1).
+#
+# each array starts at an offset which is a multiple of 8 bytes.
+_MAGIC = b"BISPYGR\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQQ")
+_HEADER_SIZE = 64
+_DECORATION_HEADER = struct.Struct("<Q")
+_HAS_LABELS = 1
+_HAS_DECORATION = 2
+_NO_RANK = -1
+
+_TYPECODES = {4: "i", 8: "q"}
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _write_array(file, values, typecode: str):
+    if not isinstance(values, array) or values.typecode != typecode:
+        # iter(): the items of bytes-like objects (e.g. a bytearray) are
+        # converted one by one, not read as raw machine values
+        values = array(typecode, iter(values))
+    if sys.byteorder == "big":
+        values = array(typecode, values)
+        values.byteswap()
+    file.write(values)
+    # pad to the next multiple of 8 bytes
+    nbytes = len(values) * values.itemsize
+    file.write(bytes(_aligned(nbytes) - nbytes))
+
+
+def _write_csr(path, graph: CSRGraph, labels, decoration=None):
+    nvertexes = graph.number_of_nodes()
+    nedges = graph.number_of_edges()
+    typecode = index_typecode(max(nvertexes, nedges))
+    itemsize = array(typecode).itemsize
+
+    flags = 0
+    if labels is not None:
+        flags |= _HAS_LABELS
+    if decoration is not None:
+        flags |= _HAS_DECORATION
+
+    with open(path, "wb") as file:
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, itemsize, flags, nvertexes, nedges
+        )
+        if decoration is not None:
+            # the number of SCCs
+            header += _DECORATION_HEADER.pack(len(decoration[1]))
+        file.write(header + bytes(_HEADER_SIZE - len(header)))
+
+        _write_array(file, graph.image_offsets, typecode)
+        _write_array(file, graph.image, typecode)
+        if labels is not None:
+            _write_array(file, labels, typecode)
+        if decoration is not None:
+            _write_array(file, graph.counterimage_offsets, typecode)
+            _write_array(file, graph.counterimage, typecode)
+            for values in decoration:
+                _write_array(file, values, typecode)
+
+
+def write_nx_graph(
+    path: Union[str, os.PathLike],
+    graph: nx.DiGraph,
+    initial_partition: Iterable[Iterable[int]] = None,
+):
+    """Write the given *integer* graph (see
+    :mod:`bispy.utilities.graph_normalization`) to a *BisPy* graph file,
+    which can be opened with :func:`open_graph_file`.
+
+    :param path: The path of the file.
+    :param graph: An integer graph (a `networkx.DiGraph`, a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, a
+        :class:`bispy.utilities.edge_arrays.EdgeArrayGraph` or a
+        `scipy.sparse` adjacency matrix).
+    :param initial_partition: If not `None`, the initial partition (or
+        labeling set) is stored in the file as well. Defaults to `None`.
+    """
+
+    graph = _integer_csr_graph(graph)
+
+    if initial_partition is not None:
+        labels = BlockLabels.from_partition(
+            initial_partition, graph.number_of_nodes()
+        ).labels
+    else:
+        labels = None
+
+    _write_csr(path, graph, labels)
+
+
+def write_edge_arrays(
+    path: Union[str, os.PathLike],
+    nvertexes: int,
+    sources,
+    targets,
+    labels=None,
+):
+    """Write the *integer* graph whose nodes are
+    :math:`0, \\dots, \\textit{nvertexes}-1` and whose edges are
+    :math:`\\langle \\textit{sources}[i], \\textit{targets}[i] \\rangle` to a
+    *BisPy* graph file, which can be opened with :func:`open_graph_file`.
+
+    :param path: The path of the file.
+    :param nvertexes: The number of nodes in the graph.
+    :param sources: Sources of the edges (a list, an `array.array` or a
+        *NumPy* array of integers).
+    :param targets: Destinations of the edges (same length of `sources`).
+    :param labels: If not `None`, the label of each node, which determines
+        the initial partition stored in the file (see
+        :func:`bispy.utilities.edge_arrays.labels_to_partition`). Defaults to
+        `None`.
+    """
+
+    graph = EdgeArrayGraph(nvertexes, sources, targets)
+    write_nx_graph(
+        path,
+        graph,
+        None if labels is None else labels_to_partition(labels),
+    )
+
+
+def _integer_csr_graph(graph) -> CSRGraph:
+    graph = as_csr_graph(graph)
+    if not check_normal_integer_graph(graph):
+        raise ValueError("Only integer graphs can be written to a file")
+
+    if isinstance(graph, EdgeArrayGraph):
+        return CSRGraph.from_edges(
+            graph.number_of_nodes(), graph.sources, graph.targets
+        )
+    elif not isinstance(graph, CSRGraph):
+        return CSRGraph.from_nx_graph(graph)
+    return graph
+
+
+def write_decorated_graph(
+    path: Union[str, os.PathLike],
+    graph: nx.DiGraph,
+    initial_partition: Iterable[Iterable[int]] = None,
+):
+    """Decorate the given *integer* graph (see
+    :func:`bispy.utilities.graph_decorator.decorate_nx_graph`) and write it
+    to a *BisPy* graph file, together with the information which does not
+    depend on the initial partition: the topological order of the image of
+    each node, the *strongly connected components*, their *rank* and their
+    well-foundedness.
+
+    Graphs loaded from the file with :func:`decorate_mapped_graph` skip the
+    expensive part of the decoration (the DFS on :math:`G^{-1}` and the
+    computation of the rank), therefore the preprocessing is paid only once
+    if the maximum bisimulation of the same graph is computed with many
+    labeling sets.
+
+    :param path: The path of the file.
+    :param graph: An integer graph, see :func:`write_nx_graph`.
+    :param initial_partition: If not `None`, the initial partition (or
+        labeling set) is stored in the file as well. Defaults to `None`.
+    """
+
+    graph = _integer_csr_graph(graph)
+    nvertexes = graph.number_of_nodes()
+
+    # the decoration is computed on the arrays of the graph, without any
+    # vertex: the image of each node in topological order, the SCCs (in
+    # topological order), their rank and their well-foundedness
+    decorated_graph = build_topological_csr_graph(graph)
+    scc, scc_rank, scc_wf = csr_rank(decorated_graph)
+
+    if initial_partition is not None:
+        labels = BlockLabels.from_partition(
+            initial_partition, nvertexes
+        ).labels
+    else:
+        labels = None
+
+    _write_csr(
+        path, decorated_graph, labels, decoration=(scc, scc_rank, scc_wf)
+    )
+
+
+class MappedGraph:
+    """A graph stored in a *BisPy* graph file, mapped in memory with
+    `mmap`. Opening the file takes constant time, since the arrays are read
+    lazily from the page cache (which is shared among processes which open
+    the same file).
+
+    Instances may be passed to `paige_tarjan` and `dovier_piazza_policriti`
+    in place of a `networkx.DiGraph`, in which case the initial partition
+    stored in the file is used (if any). Create instances using
+    :func:`open_graph_file`.
+
+    :param path: The path of the file.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        if sys.byteorder != "little":
+            raise ValueError(
+                "BisPy graph files can be mapped only on little-endian "
+                "machines"
+            )
+
+        with open(path, "rb") as file:
+            header = file.read(_HEADER_SIZE)
+            if len(header) < _HEADER_SIZE or not header.startswith(_MAGIC):
+                raise ValueError("{} is not a BisPy graph file".format(path))
+            # the mapping stays valid after the file is closed
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, version, itemsize, flags, nvertexes, nedges = _HEADER.unpack_from(
+            header
+        )
+        if version != _VERSION or itemsize not in _TYPECODES:
+            raise ValueError("Unsupported BisPy graph file: {}".format(path))
+        typecode = _TYPECODES[itemsize]
+
+        view = memoryview(self._mmap)
+        self._views = []
+
+        def next_array(start, length):
+            end = start + length * itemsize
+            if end > len(view):
+                raise ValueError("Truncated BisPy graph file: {}".format(path))
+            self._views.append(view[start:end].cast(typecode))
+            return self._views[-1], _aligned(end)
+
+        image_offsets, offset = next_array(_HEADER_SIZE, nvertexes + 1)
+        image, offset = next_array(offset, nedges)
+        if flags & _HAS_LABELS:
+            self.labels, offset = next_array(offset, nvertexes)
+        else:
+            self.labels = None
+
+        if flags & _HAS_DECORATION:
+            (nsccs,) = _DECORATION_HEADER.unpack_from(header, _HEADER.size)
+            counterimage_offsets, offset = next_array(offset, nvertexes + 1)
+            counterimage, offset = next_array(offset, nedges)
+            self.scc, offset = next_array(offset, nvertexes)
+            self.scc_rank, offset = next_array(offset, nsccs)
+            self.scc_wf, offset = next_array(offset, nsccs)
+        else:
+            counterimage_offsets = None
+            counterimage = None
+            self.scc = None
+            self.scc_rank = None
+            self.scc_wf = None
+        self._views.append(view)
+
+        self.graph = CSRGraph(
+            nvertexes, image_offsets, image, counterimage_offsets, counterimage
+        )
+
+    @property
+    def is_decorated(self) -> bool:
+        """`True` if the file was written by :func:`write_decorated_graph`
+        (see :func:`decorate_mapped_graph`)."""
+        return self.scc is not None
+
+    def initial_partition(self) -> Union[None, List[List[int]]]:
+        """The initial partition stored in the file, or `None` if the file
+        doesn't contain one."""
+
+        if self.labels is None:
+            return None
+        return labels_to_partition(self.labels)
+
+    def number_of_nodes(self) -> int:
+        return self.graph.number_of_nodes()
+
+    def number_of_edges(self) -> int:
+        return self.graph.number_of_edges()
+
+    def close(self):
+        """Unmap the file. Any array obtained from the graph becomes
+        invalid."""
+
+        self.graph = None
+        self.labels = None
+        self.scc = None
+        self.scc_rank = None
+        self.scc_wf = None
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "MappedGraph(nodes={}, edges={})".format(
+            self.number_of_nodes(), self.number_of_edges()
+        )
+
+
+def open_graph_file(path: Union[str, os.PathLike]) -> MappedGraph:
+    """Open a *BisPy* graph file (written by :func:`write_nx_graph` or
+    :func:`write_edge_arrays`) without reading it.
+
+        >>> with open_graph_file("graph.bispy") as mapped_graph:
+        ...     rscp = paige_tarjan(mapped_graph)
+
+    :param path: The path of the file.
+    """
+
+    return MappedGraph(path)
+
+
+def decorate_mapped_graph(
+    mapped_graph: Union[str, os.PathLike, MappedGraph],
+    initial_partition: Iterable[Iterable[int]] = None,
+    set_count: bool = True,
+    set_xblock: bool = True,
+    preprocess: bool = True,
+    edge_objects: bool = True,
+) -> Tuple[List[_Vertex], List[_QBlock]]:
+    """Create the *BisPy* representation of a graph stored by
+    :func:`write_decorated_graph`, as
+    :func:`bispy.utilities.graph_decorator.decorate_nx_graph` would do
+    (with `topological_sorted_images` and `compute_rank` set to `True`),
+    using the initial partition given for this query. The order of the
+    images, the SCCs, the rank and the well-foundedness of each vertex are
+    read from the file instead of being computed.
+
+        >>> write_decorated_graph("graph.bispy", graph)
+        >>> with open_graph_file("graph.bispy") as mapped_graph:
+        ...     for labeling_set in labeling_sets:
+        ...         vertexes, qblocks = decorate_mapped_graph(
+        ...             mapped_graph, labeling_set
+        ...         )
+
+    :param mapped_graph: A :class:`MappedGraph` (or the path of the file).
+    :param initial_partition: The initial partition. Defaults to `None`, in
+        which case the one stored in the file (if any) or the trivial
+        labeling set is used.
+    :param set_count: See
+        :func:`bispy.utilities.graph_decorator.decorate_nx_graph`. Defaults
+        to `True`.
+    :param set_xblock: See
+        :func:`bispy.utilities.graph_decorator.decorate_nx_graph`. Defaults
+        to `True`.
+    :param preprocess: See
+        :func:`bispy.utilities.graph_decorator.decorate_nx_graph`. Defaults
+        to `True`.
+    :param edge_objects: See
+        :func:`bispy.utilities.graph_decorator.decorate_nx_graph`. Defaults
+        to `True`.
+    :returns: A tuple whose items are:
+
+        0. List of vertexes of the graph;
+        1. List of blocks of the initial partition.
+    """
+
+    if not isinstance(mapped_graph, MappedGraph):
+        with open_graph_file(mapped_graph) as opened_graph:
+            return decorate_mapped_graph(
+                opened_graph,
+                initial_partition,
+                set_count,
+                set_xblock,
+                preprocess,
+                edge_objects,
+            )
+
+    if not mapped_graph.is_decorated:
+        raise ValueError(
+            "The file doesn't contain a decorated graph, see "
+            "write_decorated_graph"
+        )
+
+    if initial_partition is None:
+        initial_partition = mapped_graph.initial_partition()
+    if initial_partition is None:
+        initial_partition = [range(mapped_graph.number_of_nodes())]
+
+    # the image of each vertex is built in the order of the file, namely in
+    # topological order
+    vertexes, qblocks = as_bispy_graph(
+        mapped_graph.graph,
+        initial_partition,
+        build_image=True,
+        set_count=set_count,
+        set_xblock=set_xblock,
+        edge_objects=edge_objects,
+    )
+
+    # _NO_RANK is the same sentinel used by assign_rank
+    assign_rank(
+        vertexes, mapped_graph.scc, mapped_graph.scc_rank, mapped_graph.scc_wf
+    )
+
+    if preprocess:
+        qblocks = preprocess_initial_partition(vertexes, initial_partition)
+    return vertexes, qblocks
+
+
+@contextmanager
+def as_mapped_graph_input(
+    graph, initial_partition
+) -> Iterator[Tuple[object, Union[None, Iterable[Iterable[int]]]]]:
+    """Context manager which, if `graph` is a path or a
+    :class:`MappedGraph`, yields the
+    :class:`bispy.utilities.csr_graph.CSRGraph` stored in the file and the
+    initial partition (the one stored in the file, unless
+    `initial_partition` is not `None`). Otherwise it yields the arguments
+    unchanged. If `graph` is a path, the file is closed on exit, therefore
+    the graph must not be used outside the `with` block.
+
+        >>> with as_mapped_graph_input("graph.bispy", None) as (
+        ...     graph, initial_partition
+        ... ):
+        ...     rscp = paige_tarjan(graph, initial_partition)
+
+    :param graph: The input graph, or the path of a *BisPy* graph file.
+    :param initial_partition: The initial partition passed by the user.
+    """
+
+    if isinstance(graph, (str, os.PathLike)):
+        with open_graph_file(graph) as mapped_graph:
+            with as_mapped_graph_input(
+                mapped_graph, initial_partition
+            ) as mapped_input:
+                yield mapped_input
+        return
+
+    if isinstance(graph, MappedGraph):
+        if initial_partition is None:
+            initial_partition = graph.initial_partition()
+        graph = graph.graph
+    yield graph, initial_partition
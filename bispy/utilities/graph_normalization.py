@@ -1,33 +1,62 @@
 import networkx as nx
-from typing import Dict, Tuple, Any, List
+from array import array
+from itertools import repeat
+from typing import Dict, Tuple, Any, List, Union
+from bispy.utilities.csr_graph import CSRGraph, index_typecode
+from bispy.utilities.edge_arrays import EdgeArrayGraph
+from bispy.utilities.node_table import NodeTable
 
 
 def convert_to_integer_graph(
-    graph: nx.Graph,
-) -> Tuple[nx.Graph, Dict[Any, int]]:
-    """Convert the given graph to an isomorphic integer graph.
+    graph: nx.Graph, compact: bool = False
+) -> Tuple[EdgeArrayGraph, Union[Dict[Any, int], NodeTable]]:
+    """Convert the given graph to an isomorphic integer graph. The edges of
+    the integer graph are written directly to two integer arrays, therefore
+    no intermediate `networkx.DiGraph` is built.
 
     :param graph: The input graph.
+    :param compact: If `True`, the mapping is a
+        :class:`bispy.utilities.node_table.NodeTable` (which takes much less
+        memory than a `dict`, but requires comparable node names) and the
+        integer of each node is its position in the sorted list of nodes.
+        Defaults to `False`.
     :returns: A tuple whose items are:
 
-        0. The integer ismorphic graph;
-        1. A `dict` which may be used to recover the original graph.
+        0. The integer ismorphic graph, as an instance of
+           :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`;
+        1. A `dict` (or a :class:`bispy.utilities.node_table.NodeTable`)
+           which may be used to recover the original graph.
     """
 
-    integer_graph = nx.DiGraph()
-
-    # add new integer nodes
-    integer_graph.add_nodes_from(range(len(graph.nodes)))
-
     # map old nodes to integer nodes
-    node_to_idx = {old_node: idx for idx, old_node in enumerate(graph.nodes)}
-
-    # add integer edges
-    integer_graph.add_edges_from(
-        (node_to_idx[edge[0]], node_to_idx[edge[1]]) for edge in graph.edges
-    )
-
-    return integer_graph, node_to_idx
+    if compact:
+        node_to_idx = NodeTable(graph.nodes)
+        get_idx = node_to_idx.index
+        get_indexes = node_to_idx.indexes
+    else:
+        node_to_idx = {
+            old_node: idx for idx, old_node in enumerate(graph.nodes)
+        }
+        get_idx = node_to_idx.__getitem__
+
+        def get_indexes(nodes):
+            return map(get_idx, nodes)
+
+    typecode = index_typecode(len(node_to_idx))
+    sources = array(typecode)
+    targets = array(typecode)
+
+    if isinstance(graph, nx.DiGraph):
+        # the image of each node is translated with a single call
+        for old_node, image in graph.adjacency():
+            sources.extend(repeat(get_idx(old_node), len(image)))
+            targets.extend(get_indexes(image))
+    else:
+        for source, destination in graph.edges:
+            sources.append(get_idx(source))
+            targets.append(get_idx(destination))
+
+    return EdgeArrayGraph(len(node_to_idx), sources, targets), node_to_idx
 
 
 def check_normal_integer_graph(graph: nx.Graph) -> bool:
@@ -36,14 +65,45 @@ def check_normal_integer_graph(graph: nx.Graph) -> bool:
     :param graph: The input graph.
     """
 
-    return (
-        all(map(lambda node: isinstance(node, int) and node >= 0, graph.nodes))
-        and max(graph.nodes) == len(graph.nodes) - 1
-    )
+    # nodes of a CSRGraph (or EdgeArrayGraph) are integers by construction
+    if isinstance(graph, (CSRGraph, EdgeArrayGraph)):
+        return True
+
+    # nodes are distinct, therefore they are 0,...,n-1 if and only if they
+    # are integers in [0,n)
+    nvertexes = len(graph.nodes)
+    for node in graph.nodes:
+        if not isinstance(node, int) or node < 0 or node >= nvertexes:
+            return False
+    return True
+
+
+def inverse_mapping(
+    node_to_idx: Union[Dict[Any, int], NodeTable],
+) -> List[Any]:
+    """Compute the inverse of the mapping returned by
+    :func:`convert_to_integer_graph` (the :math:`i`-th item of the list is
+    the node of the original graph whose integer is :math:`i`). The list may
+    be passed to :func:`back_to_original` in place of the mapping, in order
+    to compute the inverse only once.
+
+    :param node_to_idx: The mapping returned by
+        :func:`convert_to_integer_graph`.
+    """
+
+    # the inverse of a NodeTable is its sorted list of names
+    if isinstance(node_to_idx, NodeTable):
+        return node_to_idx.names
+
+    idx_to_node = [None] * len(node_to_idx)
+    for node, idx in node_to_idx.items():
+        idx_to_node[idx] = node
+    return idx_to_node
 
 
 def back_to_original(
-    partition: List[Tuple[int]], node_to_idx: Tuple[nx.Graph, Dict[Any, int]]
+    partition: List[Tuple[int]],
+    node_to_idx: Union[Dict[Any, int], NodeTable, List[Any]],
 ) -> List[Tuple[Any]]:
     """Convert the given partition of the nodes of an integer graph to the
     representation which uses nodes from the original graph using the mapping
@@ -51,11 +111,17 @@ def back_to_original(
 
     :param partition: The partition of the set of nodes of an integer graph.
     :param node_to_idx: The mapping returned by
-        :func:`convert_to_integer_graph`.
+        :func:`convert_to_integer_graph`, or its inverse computed by
+        :func:`inverse_mapping` (faster if the function is called many
+        times with the same mapping).
     """
 
     # create a mapping from idx to the original nodes
-    idx_to_node = sorted(node_to_idx, key=lambda node: node_to_idx[node])
+    if isinstance(node_to_idx, (dict, NodeTable)):
+        idx_to_node = inverse_mapping(node_to_idx)
+    else:
+        idx_to_node = node_to_idx
+    get_node = idx_to_node.__getitem__
 
     # compute the RSCP of the original graph
-    return [tuple(idx_to_node[idx] for idx in block) for block in partition]
+    return [tuple(map(get_node, block)) for block in partition]
@@ -0,0 +1,211 @@
+import os
+import weakref
+from array import array
+from typing import Union
+
+import networkx as nx
+
+from bispy.utilities.csr_graph import CSRGraph, index_typecode
+from bispy.utilities.edge_arrays import EdgeArrayGraph
+from bispy.utilities.graph_file import MappedGraph, open_graph_file
+from bispy.utilities.graph_normalization import check_normal_integer_graph
+from bispy.utilities.rank_computation import _MINUS_INFINITY, csr_rank
+from bispy.utilities.sparse_matrix import as_csr_graph, is_sparse_matrix
+
+# id(graph) -> (weak reference to graph, version of the graph, GraphRank).
+# graphs are compared by identity (scipy.sparse matrixes are not hashable),
+# entries are removed when the graph is garbage collected
+_cache = {}
+
+
+class GraphRank:
+    """The *rank* and the well-foundedness of the nodes of an integer graph,
+    stored per *strongly connected component* (all the nodes in an SCC have
+    the same rank and well-foundedness). Instances are returned by
+    :func:`graph_rank`, and may be passed to
+    :func:`bispy.dovier_piazza_policriti.dovier_piazza_policriti.dovier_piazza_policriti`
+    and :func:`bispy.saha.saha_partition.saha` in order to skip the
+    computation of the rank.
+
+    Ranks are integers, and :math:`-1` stands for :math:`-\\infty`.
+
+        >>> rank = graph_rank(networkx.DiGraph([(0, 1), (1, 2), (2, 2)]))
+        >>> rank.rank, rank.wf
+        (array('i', [-1, -1, -1]), bytearray(b'\\x00\\x00\\x00'))
+
+    :param scc: The index of the SCC of each node. SCCs are numbered in
+        topological order.
+    :param scc_rank: The rank of each SCC.
+    :param scc_wf: `1` if the SCC is well-founded, `0` otherwise.
+    :param nedges: The number of edges of the graph, `None` if unknown.
+        Defaults to `None`.
+    """
+
+    def __init__(self, scc, scc_rank, scc_wf, nedges: int = None):
+        self.scc = scc
+        self.scc_rank = scc_rank
+        self.scc_wf = scc_wf
+        self._nedges = nedges
+        self._rank = None
+        self._wf = None
+
+    def number_of_nodes(self) -> int:
+        return len(self.scc)
+
+    def number_of_edges(self) -> int:
+        """The number of edges of the graph (`None` if unknown)."""
+        return self._nedges
+
+    def number_of_sccs(self) -> int:
+        return len(self.scc_rank)
+
+    @property
+    def rank(self) -> array:
+        """The rank of each node (:math:`-1` stands for :math:`-\\infty`)."""
+        if self._rank is None:
+            self._rank = array(
+                index_typecode(len(self.scc)),
+                map(self.scc_rank.__getitem__, self.scc),
+            )
+        return self._rank
+
+    @property
+    def wf(self) -> bytearray:
+        """`1` if the node is well-founded, `0` otherwise."""
+        if self._wf is None:
+            self._wf = bytearray(map(self.scc_wf.__getitem__, self.scc))
+        return self._wf
+
+    def max_rank(self) -> int:
+        """The maximum rank of a node (:math:`-1` if the graph is empty or
+        all its nodes have rank :math:`-\\infty`)."""
+        return max(self.scc_rank, default=_MINUS_INFINITY)
+
+    def __repr__(self):
+        return "GraphRank(nodes={}, sccs={})".format(
+            self.number_of_nodes(), self.number_of_sccs()
+        )
+
+
+def _version(graph):
+    # networkx graphs are usually modified in place: cached values are
+    # recomputed if the number of nodes or the set of edges changes (an edge
+    # may be replaced by another one). the other representations are not
+    # modified by BisPy
+    if isinstance(graph, nx.Graph):
+        return (graph.number_of_nodes(), hash(frozenset(graph.edges)))
+    if is_sparse_matrix(graph):
+        return (graph.shape, graph.nnz)
+    return None
+
+
+def _compute_graph_rank(graph) -> GraphRank:
+    if isinstance(graph, MappedGraph):
+        graph = graph.graph
+    graph = as_csr_graph(graph)
+    if not check_normal_integer_graph(graph):
+        raise ValueError("The rank can be computed only for integer graphs")
+    nedges = graph.number_of_edges()
+
+    if isinstance(graph, EdgeArrayGraph):
+        graph = CSRGraph.from_edges(
+            graph.number_of_nodes(), graph.sources, graph.targets
+        )
+    elif not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_nx_graph(graph)
+    return GraphRank(*csr_rank(graph), nedges=nedges)
+
+
+def _stored_graph_rank(graph: MappedGraph) -> GraphRank:
+    # the arrays are copied, since the views are released when the file is
+    # closed
+    return GraphRank(
+        *(
+            array(view.format, view)
+            for view in (graph.scc, graph.scc_rank, graph.scc_wf)
+        ),
+        nedges=graph.number_of_edges(),
+    )
+
+
+def graph_rank(
+    graph: Union[nx.DiGraph, CSRGraph, EdgeArrayGraph, MappedGraph, str],
+    cache: bool = True,
+) -> GraphRank:
+    """Compute the *rank* and the well-foundedness of each node of the given
+    *integer* graph (see :mod:`bispy.utilities.graph_normalization`),
+    without building the *BisPy* representation of the graph (see
+    :func:`bispy.utilities.rank_computation.csr_rank`).
+
+    The result is cached until `graph` is garbage collected, therefore
+    calling this function again on the same object only checks whether
+    the graph changed. Values cached for a `networkx.DiGraph` are recomputed
+    if the number of nodes or the set of edges changed, values cached for a
+    `scipy.sparse` matrix if its shape or number of non-zero entries
+    changed, use :func:`clear_rank_cache` after other changes. If `graph`
+    is a path, the file is closed before returning and the result is not
+    cached.
+
+        >>> graph = networkx.DiGraph([(0, 1), (1, 2)])
+        >>> rank = graph_rank(graph)
+        >>> dovier_piazza_policriti(graph, rank=rank)
+        [(2,), (1,), (0,)]
+
+    :param graph: An integer graph (a `networkx.DiGraph`, a
+        :class:`bispy.utilities.csr_graph.CSRGraph`, a
+        :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`, a
+        `scipy.sparse` adjacency matrix, a
+        :class:`bispy.utilities.graph_file.MappedGraph` or the path of a
+        *BisPy* graph file). The rank stored by
+        :func:`bispy.utilities.graph_file.write_decorated_graph` is used if
+        available.
+    :param cache: If `False`, the cache is neither read nor updated.
+        Defaults to `True`.
+    """
+
+    if isinstance(graph, (str, os.PathLike)):
+        # the file is closed before returning, nothing is cached since each
+        # call opens a new MappedGraph
+        with open_graph_file(graph) as mapped_graph:
+            if mapped_graph.is_decorated:
+                return _stored_graph_rank(mapped_graph)
+            return _compute_graph_rank(mapped_graph)
+    if isinstance(graph, MappedGraph) and graph.is_decorated:
+        # stored by write_decorated_graph, nothing to cache
+        return _stored_graph_rank(graph)
+    if not cache:
+        return _compute_graph_rank(graph)
+
+    key = id(graph)
+    version = _version(graph)
+    cached = _cache.get(key)
+    if cached is not None and cached[0]() is graph and cached[1] == version:
+        return cached[2]
+
+    rank = _compute_graph_rank(graph)
+    _cache[key] = (_weak_reference(graph, key), version, rank)
+    return rank
+
+
+def _weak_reference(graph, key: int) -> weakref.ref:
+    def remove(reference):
+        cached = _cache.get(key)
+        if cached is not None and cached[0] is reference:
+            del _cache[key]
+
+    return weakref.ref(graph, remove)
+
+
+def clear_rank_cache(graph=None):
+    """Remove the value cached by :func:`graph_rank` for the given graph (or
+    all the cached values if `graph` is `None`).
+
+    :param graph: A graph. Defaults to `None`.
+    """
+
+    if graph is None:
+        _cache.clear()
+    else:
+        cached = _cache.get(id(graph))
+        if cached is not None and cached[0]() is graph:
+            del _cache[id(graph)]
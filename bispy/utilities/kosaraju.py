@@ -2,59 +2,100 @@ from bispy.utilities.graph_entities import (
     _Vertex,
     _Edge,
     _SCC,
+    new_epoch,
 )
-from typing import List, Dict, Set
+from bispy.utilities.csr_graph import CSRGraph, index_typecode
+from array import array
+from typing import List, Dict, Set, Tuple
+
+# all the visits below use an explicit stack instead of recursion, therefore
+# they work on graphs of any depth (e.g. long chains) without raising the
+# recursion limit. the stack of the DFSs on G contains pairs
+# (vertex, iterator over its successors), which are resumed in the same
+# order of a recursive visit
 
 
 def kosaraju(
     base,
     return_sccs=False,
     return_finishing_time_list=False,
+    tarjan=False,
 ):
+    """Compute the *strongly connected components* of a graph, and set the
+    attribute `scc` of each vertex. If `base` is a vertex, only the SCCs of
+    the vertexes which reach `base` are recomputed (this is used by
+    *Saha*'s algorithm after the addition of a new edge).
+
+    :param base: The vertexes of the graph, or a single vertex.
+    :param return_sccs: If `True`, return the list of new SCCs.
+    :param return_finishing_time_list: If `True`, return the list of the
+        visited vertexes, sorted by increasing finishing time of a DFS on
+        :math:`G`.
+    :param tarjan: If `True`, use *Tarjan*'s algorithm, which needs a single
+        DFS (SCCs are found in reverse topological order). Defaults to
+        `False`, in which case *Kosaraju*'s algorithm is used (a DFS on
+        :math:`G` followed by a visit of :math:`G^{-1}`).
+    """
+
     finishing_time_list = []
     available_labels = {}
 
     if isinstance(base, _Vertex):
+        # vertexes which reach base are stamped with reachable_epoch
+        reachable_epoch = new_epoch()
         vertexes = []
-        predecessors(base, vertexes)
-
-        # unvisit
-        for node in vertexes:
-            node.visited = False
-
-        based_sccs = True
+        predecessors(base, vertexes, reachable_epoch)
     else:
+        reachable_epoch = None
         vertexes = base
-        based_sccs = False
 
-    # visit G
-    for node in vertexes:
-        if not node.visited:
-            visit(node, finishing_time_list, available_labels, based_sccs)
-
-    # unvisit
-    for node in vertexes:
-        node.visited = False
+    epoch = new_epoch()
+    if tarjan:
+        components = []
+        for node in vertexes:
+            if node.visit_epoch != epoch:
+                tarjan_visit(
+                    node,
+                    finishing_time_list,
+                    available_labels,
+                    components,
+                    reachable_epoch,
+                    epoch,
+                )
+    else:
+        # visit G
+        for node in vertexes:
+            if node.visit_epoch != epoch:
+                visit(
+                    node,
+                    finishing_time_list,
+                    available_labels,
+                    reachable_epoch,
+                    epoch,
+                )
 
     scc_instances = []
     available_labels = list(available_labels.keys())
 
-    # visit G^{-1}
-    for i in range(len(finishing_time_list) - 1, -1, -1):
-        if finishing_time_list[i].scc is None:
-            if len(available_labels) > 0:
-                label = available_labels.pop()
-            else:
-                label = len(scc_instances)
-
-            scc_instance = _SCC(label=label)
-            scc_instances.append(scc_instance)
-
-            assign_scc(finishing_time_list[i], scc_instance, based_sccs)
+    def new_scc():
+        if len(available_labels) > 0:
+            label = available_labels.pop()
+        else:
+            label = len(scc_instances)
+        scc_instance = _SCC(label=label)
+        scc_instances.append(scc_instance)
+        return scc_instance
 
-    for node in vertexes:
-        if based_sccs:
-            del node.reachable_from_base
+    if tarjan:
+        for component in components:
+            scc_instance = new_scc()
+            for node in component:
+                scc_instance.add_vertex(node)
+    else:
+        # visit G^{-1}
+        for i in range(len(finishing_time_list) - 1, -1, -1):
+            if finishing_time_list[i].scc is None:
+                assign_scc(finishing_time_list[i], new_scc(), reachable_epoch)
 
     if return_finishing_time_list and return_sccs:
         return scc_instances, finishing_time_list
@@ -64,40 +105,41 @@ def kosaraju(
         return scc_instances
 
 
-def assign_scc(node: _Vertex, scc_instance: _SCC, based_scc_tree: bool):
+def assign_scc(node: _Vertex, scc_instance: _SCC, reachable_epoch: int):
     scc_instance.add_vertex(node)
 
-    for edge in node.counterimage:
-        source = edge.source
-        if edge.source.scc is None and (
-            not based_scc_tree
-            or (
-                hasattr(source, "reachable_from_base")
-                and source.reachable_from_base
-            )
-        ):
-            assign_scc(edge.source, scc_instance, based_scc_tree)
+    stack = [node]
+    while stack:
+        for source in stack.pop().predecessors():
+            if source.scc is None and (
+                reachable_epoch is None
+                or source.reachable_epoch == reachable_epoch
+            ):
+                scc_instance.add_vertex(source)
+                stack.append(source)
 
     return scc_instance
 
 
-def predecessors(node: _Vertex, reachable_vertexes: List[_Vertex]):
-    node.visited = True
-    node.reachable_from_base = True
+def predecessors(node: _Vertex, reachable_vertexes: List[_Vertex], epoch: int):
+    node.visit_epoch = epoch
+    node.reachable_epoch = epoch
     reachable_vertexes.append(node)
 
-    for edge in node.counterimage:
-        if not edge.source.visited:
-            predecessors(edge.source, reachable_vertexes)
+    stack = [iter(node.predecessors())]
+    while stack:
+        for source in stack[-1]:
+            if source.visit_epoch != epoch:
+                source.visit_epoch = epoch
+                source.reachable_epoch = epoch
+                reachable_vertexes.append(source)
+                stack.append(iter(source.predecessors()))
+                break
+        else:
+            stack.pop()
 
 
-def visit(
-    node: _Vertex,
-    finishing_time_list: List[_Vertex],
-    available_labels: Dict[int, bool],
-    based_scc_tree: bool,
-):
-    node.visited = True
+def _clear_scc(node: _Vertex, available_labels: Dict[int, bool]):
     if node.scc is not None:
         # we want to destroy this SCC, but we want to know which labels we can
         # use now
@@ -105,19 +147,161 @@ def visit(
         # clear SCC
         node.scc = None
 
-    for edge in node.image:
-        dest = edge.destination
-        if not dest.visited and (
-            not based_scc_tree
-            or (
-                hasattr(dest, "reachable_from_base")
-                and dest.reachable_from_base
-            )
-        ):
-            visit(
-                edge.destination,
-                finishing_time_list,
-                available_labels,
-                based_scc_tree,
-            )
-    finishing_time_list.append(node)
+
+def visit(
+    node: _Vertex,
+    finishing_time_list: List[_Vertex],
+    available_labels: Dict[int, bool],
+    reachable_epoch: int,
+    epoch: int,
+):
+    node.visit_epoch = epoch
+    _clear_scc(node, available_labels)
+
+    stack = [(node, iter(node.successors()))]
+    while stack:
+        current, successors = stack[-1]
+        for dest in successors:
+            if dest.visit_epoch != epoch and (
+                reachable_epoch is None
+                or dest.reachable_epoch == reachable_epoch
+            ):
+                dest.visit_epoch = epoch
+                _clear_scc(dest, available_labels)
+                stack.append((dest, iter(dest.successors())))
+                break
+        else:
+            stack.pop()
+            finishing_time_list.append(current)
+
+
+def tarjan_visit(
+    node: _Vertex,
+    finishing_time_list: List[_Vertex],
+    available_labels: Dict[int, bool],
+    components: List[List[_Vertex]],
+    reachable_epoch: int,
+    epoch: int,
+):
+    # index[v] is the discovery index of v while v is on the stack of
+    # Tarjan's algorithm, None after v has been assigned to a component. the
+    # stack of the DFS contains triples (vertex, discovery index, iterator
+    # over the successors)
+    index = {}
+    lowlink = []
+    scc_stack = []
+
+    node.visit_epoch = epoch
+    _clear_scc(node, available_labels)
+    index[node] = 0
+    lowlink.append(0)
+    scc_stack.append(node)
+    stack = [(node, 0, iter(node.successors()))]
+    while stack:
+        current, current_index, successors = stack[-1]
+        for dest in successors:
+            if (
+                reachable_epoch is not None
+                and dest.reachable_epoch != reachable_epoch
+            ):
+                continue
+
+            if dest.visit_epoch != epoch:
+                dest.visit_epoch = epoch
+                _clear_scc(dest, available_labels)
+                dest_index = len(lowlink)
+                index[dest] = dest_index
+                lowlink.append(dest_index)
+                scc_stack.append(dest)
+                stack.append((dest, dest_index, iter(dest.successors())))
+                break
+
+            dest_index = index.get(dest)
+            # dest is on the stack
+            if dest_index is not None and dest_index < lowlink[current_index]:
+                lowlink[current_index] = dest_index
+        else:
+            stack.pop()
+            finishing_time_list.append(current)
+
+            current_lowlink = lowlink[current_index]
+            if current_lowlink == current_index:
+                # current is the root of a SCC
+                component = []
+                while True:
+                    vertex = scc_stack.pop()
+                    index[vertex] = None
+                    component.append(vertex)
+                    if vertex is current:
+                        break
+                components.append(component)
+            elif current_lowlink < lowlink[stack[-1][1]]:
+                # current isn't the root of the DFS tree, otherwise it would
+                # be the root of a SCC
+                lowlink[stack[-1][1]] = current_lowlink
+
+
+def csr_kosaraju(graph: CSRGraph) -> Tuple[int, array]:
+    """Compute the *strongly connected components* of an integer graph in
+    CSR representation using *Kosaraju*'s algorithm. No object is created
+    for nodes or SCCs, the visits only use the arrays of `graph` and stacks
+    of integers.
+
+    :param graph: The graph.
+    :returns: A tuple whose items are:
+
+        0. The number of SCCs;
+        1. An array whose :math:`i`-th item is the index of the SCC of the
+           node :math:`i`. SCCs are numbered in *topological* order (each
+           edge goes from an SCC to itself or to a greater SCC).
+    """
+
+    nvertexes = graph.number_of_nodes()
+    image_offsets = graph.image_offsets
+    image = graph.image
+
+    # visit G. the stack contains pairs (node, position of the next
+    # successor in image)
+    finishing_time_list = []
+    visited = bytearray(nvertexes)
+    stack = []
+    for root in range(nvertexes):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        stack.append((root, image_offsets[root]))
+        while stack:
+            current, position = stack.pop()
+            end = image_offsets[current + 1]
+            while position < end:
+                dest = image[position]
+                position += 1
+                if not visited[dest]:
+                    visited[dest] = 1
+                    stack.append((current, position))
+                    stack.append((dest, image_offsets[dest]))
+                    break
+            else:
+                finishing_time_list.append(current)
+
+    # visit G^{-1}
+    counterimage_offsets = graph.counterimage_offsets
+    counterimage = graph.counterimage
+    scc_of = array(index_typecode(nvertexes), [-1]) * nvertexes
+    nsccs = 0
+    for root in reversed(finishing_time_list):
+        if scc_of[root] != -1:
+            continue
+        scc_of[root] = nsccs
+        stack.append(root)
+        while stack:
+            current = stack.pop()
+            start = counterimage_offsets[current]
+            end = counterimage_offsets[current + 1]
+            for source in counterimage[start:end]:
+                if scc_of[source] == -1:
+                    scc_of[source] = nsccs
+                    stack.append(source)
+        nsccs += 1
+
+    return nsccs, scc_of
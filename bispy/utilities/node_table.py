@@ -0,0 +1,109 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable, List
+
+from bispy.utilities.csr_graph import index_typecode
+
+
+class NodeTable:
+    """A compact replacement of the `dict` which maps the nodes of a graph
+    (for instance URIs or tuples) to the nodes of the isomorphic integer
+    graph (see :mod:`bispy.utilities.graph_normalization`).
+
+    Names are kept in a sorted list, and the integer of a node is its
+    position in the list. Therefore the table takes one pointer per node
+    (a `dict` takes roughly ten times as much), the inverse lookup is an
+    index in the list, and the forward lookup is a binary search. Names
+    must be comparable (for instance all strings, or all tuples of strings).
+
+    Instances may be used in place of the `dict` `node_to_idx` (e.g.
+    `table[name]` is the integer of `name`).
+
+    :param names: The names of the nodes (without duplicates).
+    """
+
+    __slots__ = ("names",)
+
+    def __init__(self, names: Iterable[Any]):
+        try:
+            self.names = sorted(names)
+        except TypeError:
+            raise ValueError(
+                "Node names should be comparable (e.g. all strings, or all "
+                "tuples of strings)"
+            )
+
+        names = self.names
+        for idx in range(1, len(names)):
+            if names[idx - 1] == names[idx]:
+                raise ValueError("Duplicate node: {}".format(names[idx]))
+
+    def index(self, name) -> int:
+        """The integer of the given node.
+
+        :param name: A node of the original graph.
+        """
+
+        names = self.names
+        try:
+            idx = bisect_left(names, name)
+        except TypeError:
+            raise KeyError(name)
+        if idx == len(names) or names[idx] != name:
+            raise KeyError(name)
+        return idx
+
+    __getitem__ = index
+
+    def indexes(self, names: Iterable[Any]) -> array:
+        """The integers of the given nodes, in the same order.
+
+        This is a convenience loop which does a binary search for each node
+        (like :meth:`index`), and stores the results in a compact array.
+        Names are arbitrary Python objects, therefore the lookups are not
+        vectorized.
+
+        :param names: An iterable of nodes of the original graph.
+        """
+
+        table = self.names
+        nnames = len(table)
+        ids = array(index_typecode(nnames))
+        append = ids.append
+        for name in names:
+            try:
+                idx = bisect_left(table, name)
+            except TypeError:
+                raise KeyError(name)
+            if idx == nnames or table[idx] != name:
+                raise KeyError(name)
+            append(idx)
+        return ids
+
+    def names_of(self, ids: Iterable[int]) -> List[Any]:
+        """The nodes whose integers are the given ones, in the same order.
+
+        :param ids: An iterable of integers.
+        """
+
+        return list(map(self.names.__getitem__, ids))
+
+    def __contains__(self, name) -> bool:
+        try:
+            self.index(name)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def items(self):
+        """Pairs `(name, integer)`, like `dict.items`."""
+        return zip(self.names, range(len(self.names)))
+
+    def __repr__(self):
+        return "NodeTable(nodes={})".format(len(self.names))
@@ -0,0 +1,166 @@
+import io
+import os
+from typing import Any, Dict, List, Tuple, Union
+
+from bispy.utilities.edge_arrays import EdgeArrayGraph, labels_to_partition
+from bispy.utilities.edge_list_reader import (
+    _DEFAULT_CHUNK_SIZE,
+    _EdgeListBuilder,
+    read_lines,
+)
+
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+
+_NO_TYPES = frozenset()
+
+
+def _literal_end(text: str) -> int:
+    # index of the end of the literal at the beginning of `text`, including
+    # its language tag or datatype (if any)
+    idx = 0
+    while True:
+        idx = text.find('"', idx + 1)
+        if idx == -1:
+            raise ValueError("Unterminated literal: {}".format(text))
+        # the quote is escaped if it follows an odd number of backslashes
+        backslashes = 0
+        while text[idx - 1 - backslashes] == "\\":
+            backslashes += 1
+        if backslashes % 2 == 0:
+            break
+
+    end = idx + 1
+    if text.startswith("^^<", end):
+        return text.index(">", end) + 1
+    if text.startswith("@", end):
+        while end < len(text) and (text[end].isalnum() or text[end] in "@-"):
+            end += 1
+    return end
+
+
+def parse_triple(line: str) -> Union[None, Tuple[str, str, str]]:
+    """Split a line of an N-Triples file into its subject, predicate and
+    object, which are returned in their N-Triples syntax (IRIs between
+    angle brackets, blank nodes prefixed by `_:`, literals between double
+    quotes, possibly followed by a language tag or a datatype).
+
+    :param line: A line of an N-Triples file.
+    :returns: A tuple `(subject, predicate, object)`, or `None` if the line
+        is empty or is a comment.
+    """
+
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    tokens = line.split(None, 2)
+    if len(tokens) < 3:
+        raise ValueError("Invalid triple: {}".format(line))
+    subject, predicate, rest = tokens
+
+    if rest.startswith('"'):
+        end = _literal_end(rest)
+    elif rest.startswith("<"):
+        end = rest.index(">") + 1
+    else:
+        # blank node, the final dot may follow it without whitespace
+        end = len(rest.split(None, 1)[0])
+        if rest[end - 1] == "." and not rest[end:].lstrip().startswith("."):
+            end -= 1
+
+    obj = rest[:end]
+    if not rest[end:].lstrip().startswith("."):
+        raise ValueError("Invalid triple: {}".format(line))
+    return subject, predicate, obj
+
+
+def read_ntriples(
+    file: Union[str, os.PathLike, io.TextIOBase],
+    predicate_nodes: bool = False,
+    type_predicate: str = RDF_TYPE,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Tuple[EdgeArrayGraph, List[List[int]], Dict[Any, int]]:
+    """Read an RDF graph from an N-Triples file in a single streaming pass,
+    and build the integer graph and the initial partition (labeling set)
+    needed to compute its structural summary (the maximum bisimulation).
+
+    Subjects and objects are mapped on the fly to integers
+    :math:`0, \\dots, n-1` (see
+    :func:`bispy.utilities.edge_list_reader.read_edge_list`), and each
+    triple becomes an edge from its subject to its object, with the
+    exception of the triples whose predicate is `type_predicate`
+    (`rdf:type`): these are not edges, the set of types of a node is its
+    label instead. Two nodes are in the same block of the initial partition
+    if and only if they have the same set of types (nodes without types,
+    including literals, are in the same block).
+
+        >>> graph, initial_partition, node_to_idx = read_ntriples("kg.nt")
+        >>> rscp = back_to_original(
+        ...     paige_tarjan(graph, initial_partition), node_to_idx
+        ... )
+
+    :param file: The path of the file, or a file opened in text mode.
+    :param predicate_nodes: If `True`, each triple
+        :math:`\\langle s, p, o \\rangle` (except type triples) becomes an
+        intermediate node between :math:`s` and :math:`o`, whose label is
+        the predicate :math:`p`, instead of an edge. Therefore two nodes are
+        bisimilar only if they have the same outgoing predicates. The name
+        of the intermediate node (in the returned mapping) is the tuple
+        `(s, p, o)`. Defaults to `False`, in which case predicates are
+        ignored.
+    :param type_predicate: The predicate of the triples which determine the
+        labeling set, in N-Triples syntax. Defaults to `rdf:type`.
+    :param chunk_size: The number of characters read from the file at once.
+        Defaults to :math:`2^{20}`.
+    :param encoding: The encoding of the file (ignored if `file` is already
+        open). Defaults to `"utf-8"`.
+    :returns: A tuple whose items are:
+
+        0. The integer graph, as an instance of
+           :class:`bispy.utilities.edge_arrays.EdgeArrayGraph`;
+        1. The initial partition (a list of blocks of integers);
+        2. A `dict` which maps each node (in N-Triples syntax) to its
+           integer, which may be passed to
+           :func:`bispy.utilities.graph_normalization.back_to_original`.
+    """
+
+    builder = _EdgeListBuilder()
+    node_to_idx = builder.node_to_idx
+    # types (or predicate) of the nodes which have one, by integer id
+    labels = {}
+
+    for line in read_lines(file, chunk_size, encoding):
+        triple = parse_triple(line)
+        if triple is None:
+            continue
+        subject, predicate, obj = triple
+
+        if predicate == type_predicate:
+            idx = builder.intern(subject)
+            types = labels.get(idx)
+            if types is None:
+                labels[idx] = {obj}
+            else:
+                types.add(obj)
+        elif predicate_nodes:
+            # duplicate triples are the same intermediate node
+            if triple in node_to_idx:
+                continue
+            builder.add_edge(subject, triple)
+            labels[node_to_idx[triple]] = predicate
+            builder.add_edge(triple, obj)
+        else:
+            builder.add_edge(subject, obj)
+
+    def node_label(idx):
+        label = labels.get(idx, _NO_TYPES)
+        # the label of a resource is its set of types, the label of an
+        # intermediate node is its predicate
+        return frozenset(label) if isinstance(label, set) else label
+
+    nvertexes = len(node_to_idx)
+    initial_partition = labels_to_partition(map(node_label, range(nvertexes)))
+
+    graph = EdgeArrayGraph(nvertexes, builder.sources, builder.targets)
+    return graph, initial_partition, node_to_idx
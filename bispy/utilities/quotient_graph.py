@@ -0,0 +1,65 @@
+from array import array
+from operator import attrgetter
+from typing import List, Union
+
+import networkx as nx
+
+from bispy.utilities.csr_graph import CSRGraph, index_typecode
+
+_get_qblock = attrgetter("qblock")
+
+
+def quotient_graph(
+    qblocks: List, networkx_graph: bool = False
+) -> Union[CSRGraph, nx.DiGraph]:
+    """Build the quotient of a graph with respect to the given partition
+    (for instance the RSCP returned by
+    :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan_qblocks`): the
+    :math:`i`-th node of the quotient is the block `qblocks[i]`, and there's
+    an edge from :math:`B_i` to :math:`B_j` if and only if there's an edge
+    from a vertex of :math:`B_i` to a vertex of :math:`B_j`.
+
+    The quotient is built from the internal representation of the graph,
+    visiting each edge once: the blocks reached by the vertexes of a block
+    are collected (and deduplicated) in a set, which is then sorted and
+    appended to the image of the block. Therefore no pass over the original
+    graph is needed.
+
+        >>> vertexes, qblocks = decorate_nx_graph(graph)
+        >>> rscp = paige_tarjan_qblocks(qblocks)
+        >>> quotient = quotient_graph(rscp)
+
+    :param qblocks: A partition of the vertexes of a decorated graph (a
+        list of :class:`bispy.utilities.graph_entities._QBlock`).
+    :param networkx_graph: If `True`, the quotient is returned as a
+        `networkx.DiGraph`. Defaults to `False`, in which case the quotient
+        is a :class:`bispy.utilities.csr_graph.CSRGraph`.
+    :returns: The quotient graph, whose nodes are the integers
+        :math:`0, \\dots, k-1` (:math:`k` is the number of blocks), in the
+        same order of
+        :func:`bispy.utilities.graph_decorator.to_tuple_list`.
+    """
+
+    block_id = {qblock: idx for idx, qblock in enumerate(qblocks)}
+    get_block_id = block_id.__getitem__
+
+    image_offsets = [0]
+    image = []
+    for qblock in qblocks:
+        reached = set()
+        for vertex in qblock.vertexes:
+            reached.update(
+                map(get_block_id, map(_get_qblock, vertex.successors()))
+            )
+        image.extend(sorted(reached))
+        image_offsets.append(len(image))
+
+    nblocks = len(qblocks)
+    typecode = index_typecode(max(nblocks, len(image)))
+    quotient = CSRGraph(
+        nblocks, array(typecode, image_offsets), array(typecode, image)
+    )
+
+    if networkx_graph:
+        return quotient.to_nx_graph()
+    return quotient
@@ -0,0 +1,87 @@
+from typing import Iterable, Tuple
+
+from bispy.utilities.csr_graph import CSRGraph
+
+# SciPy is an optional dependency: it's imported only when a sparse matrix is
+# actually used.
+
+
+def is_sparse_matrix(graph) -> bool:
+    """Check whether the given object is a `scipy.sparse` matrix (or array).
+    *SciPy* is not imported if the object doesn't come from *SciPy*.
+
+    :param graph: Any object.
+    """
+
+    if not type(graph).__module__.startswith("scipy.sparse"):
+        return False
+
+    from scipy.sparse import issparse
+
+    return issparse(graph)
+
+
+def as_csr_graph(graph):
+    """If `graph` is a `scipy.sparse` adjacency matrix, return the
+    corresponding :class:`bispy.utilities.csr_graph.CSRGraph` (see
+    :meth:`bispy.utilities.csr_graph.CSRGraph.from_scipy_sparse`), otherwise
+    return `graph` unchanged.
+
+    :param graph: The input graph.
+    """
+
+    if is_sparse_matrix(graph):
+        return CSRGraph.from_scipy_sparse(graph)
+    return graph
+
+
+def quotient_sparse_matrix(graph, partition: Iterable[Tuple]):
+    """Build the adjacency matrix of the quotient of `graph` with respect to
+    `partition`: the :math:`i`-th row/column corresponds to the :math:`i`-th
+    block of the partition, and there's an edge from the block :math:`B_i` to
+    the block :math:`B_j` if and only if there's an edge from a node of
+    :math:`B_i` to a node of :math:`B_j`. Requires *SciPy*.
+
+    :param graph: The graph (a `networkx.DiGraph`, a `scipy.sparse`
+        adjacency matrix, or a :class:`bispy.utilities.csr_graph.CSRGraph`).
+    :param partition: A partition of the nodes of the graph, for instance
+        the maximum bisimulation.
+    :returns: A boolean `scipy.sparse.csr_matrix` of shape :math:`(k,k)`,
+        where :math:`k` is the number of blocks of the partition.
+    """
+
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    partition = list(partition)
+
+    if is_sparse_matrix(graph) or isinstance(graph, CSRGraph):
+        graph = as_csr_graph(graph)
+
+        block_of = np.empty(graph.number_of_nodes(), dtype=np.intp)
+        for idx, block in enumerate(partition):
+            block_of[list(block)] = idx
+
+        image_offsets = np.asarray(graph.image_offsets)
+        sources = np.repeat(
+            np.arange(graph.number_of_nodes()), np.diff(image_offsets)
+        )
+        rows = block_of[sources]
+        cols = block_of[np.asarray(graph.image)]
+    else:
+        block_of = {}
+        for idx, block in enumerate(partition):
+            for node in block:
+                block_of[node] = idx
+
+        rows = []
+        cols = []
+        for source, destination in graph.edges:
+            rows.append(block_of[source])
+            cols.append(block_of[destination])
+
+    # SciPy merges duplicate entries
+    return csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, cols)),
+        shape=(len(partition), len(partition)),
+    )
@@ -44,5 +44,6 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     python_requires=">=3.5",
     license="MIT",
-    install_requires=["networkx", "llist"],
+    install_requires=["networkx"],
+    extras_require={"sparse": ["scipy"]},
 )
@@ -148,3 +148,42 @@ def test_balanced_tree_initial_partition():
     assert to_set(
         dovier_piazza_policriti(graph, initial_partition=initial_partition)
     ) == to_set(paige_tarjan(graph, initial_partition=initial_partition))
+
+
+def test_dpp_separates_leafs_of_rank_subgraph():
+    # 6 and 9 have the same rank, but only 9 has a successor at its rank
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(15))
+    graph.add_edges_from(
+        [
+            (0, 11),
+            (1, 0),
+            (2, 9),
+            (3, 9),
+            (3, 10),
+            (4, 9),
+            (6, 7),
+            (6, 12),
+            (7, 1),
+            (8, 0),
+            (9, 2),
+            (9, 7),
+            (9, 13),
+            (11, 7),
+            (14, 3),
+        ]
+    )
+    assert to_set(dovier_piazza_policriti(graph)) == to_set(
+        paige_tarjan(graph)
+    )
+
+
+@pytest.mark.parametrize("nodes", [5, 10, 15, 20, 30])
+@pytest.mark.parametrize("seed", range(20))
+def test_dpp_random_cyclic_graphs(nodes, seed):
+    graph = nx.gnm_random_graph(
+        nodes, int(nodes * 1.3), seed=seed, directed=True
+    )
+    assert to_set(dovier_piazza_policriti(graph)) == to_set(
+        paige_tarjan(graph)
+    )
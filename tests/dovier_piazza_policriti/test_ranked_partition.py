@@ -26,7 +26,7 @@ def test_create_initial_partition(graph):
         rank = float("-inf") if idx == 0 else idx - 1
 
         # right number of vertexes
-        assert partition[idx][0].vertexes.size == [
+        assert partition[idx][0].size == [
             vertex.rank == rank for vertex in vertexes
         ].count(True)
         # right rank
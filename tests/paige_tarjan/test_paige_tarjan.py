@@ -1,6 +1,5 @@
 import pytest
 import networkx as nx
-from llist import dllist, dllistnode
 import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
 import itertools
 from bispy.utilities.graph_normalization import (
@@ -19,6 +18,7 @@ from bispy.utilities.graph_entities import (
     _Edge,
     _QBlock,
     _XBlock,
+    new_epoch,
 )
 from bispy.paige_tarjan.paige_tarjan import (
     split,
@@ -28,9 +28,15 @@ from bispy.paige_tarjan.paige_tarjan import (
     refine,
     paige_tarjan,
     paige_tarjan_qblocks,
+    paige_tarjan_iter,
     preprocess_initial_partition,
 )
-from bispy.utilities.graph_decorator import decorate_nx_graph, to_set
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    iter_blocks,
+    to_set,
+    to_tuple_list,
+)
 import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
 
 
@@ -79,7 +85,7 @@ def test_initialize_right_types(graph, initial_partition):
     _, q_partition = decorate_nx_graph(graph, initial_partition)
 
     for qblock in q_partition:
-        assert isinstance(qblock.vertexes, dllist)
+        assert isinstance(qblock.vertexes, list)
 
     for qblock in q_partition:
         for vertex in qblock.vertexes:
@@ -98,7 +104,7 @@ def test_count_initialize(graph, initial_partition):
 
     for vertex in vertexes:
         for edge in vertex.image:
-            assert edge.count.value == len(vertex.image)
+            assert vertex.count_table.values[edge.count] == len(vertex.image)
 
 
 @pytest.mark.parametrize(
@@ -149,12 +155,9 @@ def test_choose_qblock():
     assert splitter == qblocks[1]
 
     # check if compound block has been modified properly
-    assert compoundblock.qblocks.size == 2
+    assert compoundblock.size == 2
 
-    compoundblock_qblocks = set()
-    for i in range(2):
-        compoundblock_qblocks.add(compoundblock.qblocks.nodeat(i).value)
-    assert compoundblock_qblocks == set([qblocks[0], qblocks[2]])
+    assert set(compoundblock.qblocks) == set([qblocks[0], qblocks[2]])
 
 
 @pytest.mark.parametrize(
@@ -202,13 +205,12 @@ def test_build_block_counterimage_aux_count(graph, initial_partition):
                     if block_counterimage[idx].label == edge[0]:
                         right_count[idx] += 1
 
+        # aux_count left by the previous iteration must be ignored
         assert right_count == [
-            vertex.aux_count.value for vertex in block_counterimage
+            vertex.count_table.values[vertex.aux_count]
+            for vertex in block_counterimage
         ]
 
-        for vertex in block_counterimage:
-            vertex.aux_count = None
-
 
 # error "dllistnode belongs to another list" triggered by split when using the
 # result of build_block_counterimage
@@ -228,9 +230,6 @@ def test_vertex_taken_from_right_list(graph, initial_partition):
         assert True
 
 
-# error "dllistnode belongs to another list" triggered by split when using the
-# result of build_block_counterimage
-# error "dllistnode doesn't belong to a list"
 @pytest.mark.parametrize(
     "graph, initial_partition", test_cases.graph_partition_tuples
 )
@@ -238,12 +237,15 @@ def test_can_remove_any_vertex_from_its_list(graph, initial_partition):
     vertexes, q_partition = decorate_nx_graph(graph, initial_partition)
 
     for qblock in q_partition:
-        vertex = qblock.vertexes.first
-        while vertex is not None:
-            qblock.vertexes.remove(vertex)
-            vertex = vertex.next
-            # check that this doesn't raise an exception
-            assert True
+        for vertex in list(qblock.vertexes):
+            qblock.remove_vertex(vertex)
+
+            assert vertex not in qblock.vertexes
+            assert qblock.size == len(qblock.vertexes)
+            # positions of the remaining vertexes are still valid
+            for idx, other in enumerate(qblock.vertexes):
+                assert other._position == idx
+        assert qblock.size == 0
 
 
 @pytest.mark.parametrize(
@@ -395,14 +397,17 @@ def test_increase_n_of_xblocks_after_refinement(graph, initial_partition):
 @pytest.mark.parametrize(
     "graph, initial_partition", test_cases.graph_partition_tuples
 )
-def test_reset_aux_count_after_refinement(graph, initial_partition):
+def test_aux_count_not_reused_after_refinement(graph, initial_partition):
     vertexes, q_partition = decorate_nx_graph(graph, initial_partition)
     xblock = q_partition[0].xblock
 
     refine([xblock], [xblock])
 
-    for vertex in vertexes:
-        assert vertex.aux_count is None
+    qblock = q_partition[0]
+    for vertex in build_block_counterimage(qblock):
+        assert vertex.count_table.values[vertex.aux_count] == sum(
+            edge.destination.qblock == qblock for edge in vertex.image
+        )
 
 
 def test_count_after_refinement():
@@ -448,7 +453,7 @@ def test_count_after_refinement():
                 ok_count[xblock_index(edge.destination.qblock.xblock)][
                     vertex.label
                 ]
-                == edge.count.value
+                == vertex.count_table.values[edge.count]
             )
 
 
@@ -463,7 +468,9 @@ def test_no_negative_edge_counts(graph, initial_partition):
 
     for vertex in vertexes:
         for edge in vertex.image:
-            assert edge.count is None or edge.count.value > 0
+            assert (
+                edge.count is None or vertex.count_table.values[edge.count] > 0
+            )
 
 
 @pytest.mark.parametrize(
@@ -503,6 +510,63 @@ def test_pt_correctness(graph, initial_partition, expected_q_partition):
     )
 
 
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+@pytest.mark.parametrize("edge_objects", [True, False])
+def test_pt_on_subgraph(
+    graph, initial_partition, expected_q_partition, edge_objects
+):
+    # add a node outside the subgraph connected to each node of graph (we
+    # preserve leafs, since leafs are handled by the preprocessing)
+    noise = len(graph.nodes)
+    noisy_graph = nx.DiGraph(graph)
+    noisy_graph.add_node(noise)
+    for node in graph.nodes:
+        noisy_graph.add_edge(noise, node)
+        if graph.out_degree(node) > 0:
+            noisy_graph.add_edge(node, noise)
+
+    vertexes, q_partition = decorate_nx_graph(
+        noisy_graph,
+        list(initial_partition) + [(noise,)],
+        topological_sorted_images=False,
+        compute_rank=False,
+        edge_objects=edge_objects,
+    )
+    noise_qblock = vertexes[noise].qblock
+    noise_qblock.xblock.remove_qblock(noise_qblock)
+    q_partition.remove(noise_qblock)
+
+    count_table = vertexes[0].count_table
+    used_slots = len(count_table)
+
+    subgraph_epoch = new_epoch()
+    for vertex in vertexes[:noise]:
+        vertex.subgraph_epoch = subgraph_epoch
+    for vertex in vertexes[:noise]:
+        vertex.restrict_to_subgraph(subgraph_epoch)
+        # no copy
+        assert len(vertex.image) == noisy_graph.out_degree(vertex.label)
+
+    rscp = paige_tarjan_qblocks(q_partition, subgraph_epoch)
+    assert to_set(to_tuple_list(rscp)) == to_set(expected_q_partition)
+
+    for vertex in vertexes[:noise]:
+        vertex.back_to_original_graph()
+    for vertex in vertexes:
+        if edge_objects:
+            for edge in vertex.image:
+                assert count_table.values[edge.count] == len(vertex.image)
+        else:
+            for source, slot in zip(
+                vertex.counterimage, vertex.counterimage_counts
+            ):
+                assert count_table.values[slot] == len(source.image)
+    assert len(count_table) == used_slots
+
+
 def test_pt_no_initial_partition():
     graph = test_cases.build_full_graphs(10)
     paige_tarjan(graph)
@@ -569,3 +633,49 @@ def test_pt_same_initial_partition(graph, initial_partition):
                 vertex.initial_partition_block_id
                 == vertex_to_initial_partition_id[vertex.label]
             )
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_paige_tarjan_iter(graph, initial_partition, expected_q_partition):
+    blocks = paige_tarjan_iter(graph, initial_partition)
+    assert not isinstance(blocks, list)
+    assert to_set(blocks) == to_set(expected_q_partition)
+
+
+def test_paige_tarjan_iter_non_integer_graph():
+    graph = nx.relabel_nodes(
+        nx.balanced_tree(2, 3, create_using=nx.DiGraph), lambda node: str(node)
+    )
+    assert to_set(paige_tarjan_iter(graph)) == to_set(paige_tarjan(graph))
+
+
+def test_iter_blocks_releases_blocks():
+    graph = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    vertexes, qblocks = decorate_nx_graph(graph)
+    rscp = paige_tarjan_qblocks(qblocks)
+    expected = to_tuple_list(rscp)
+    nblocks = len(rscp)
+
+    blocks = iter_blocks(rscp)
+    first = next(blocks)
+    assert first == expected[0]
+    assert len(rscp) == nblocks - 1
+    for label in first:
+        assert vertexes[label].qblock is None
+        assert len(vertexes[label].image) == 0
+
+    assert [first] + list(blocks) == expected
+    assert rscp == []
+
+
+def test_iter_blocks_translates_labels():
+    graph = nx.balanced_tree(2, 1, create_using=nx.DiGraph)
+    _, qblocks = decorate_nx_graph(graph)
+    rscp = paige_tarjan_qblocks(qblocks)
+    expected = [
+        tuple("abc"[label] for label in block) for block in to_tuple_list(rscp)
+    ]
+    assert list(iter_blocks(rscp, ["a", "b", "c"])) == expected
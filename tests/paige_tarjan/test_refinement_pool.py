@@ -0,0 +1,125 @@
+import pytest
+import networkx as nx
+import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
+
+from bispy.utilities.graph_entities import _QBlock, _XBlock
+from bispy.paige_tarjan.paige_tarjan import (
+    split,
+    paige_tarjan_qblocks,
+)
+from bispy.paige_tarjan.refinement_pool import RefinementPool, ScratchBuffer
+from bispy.utilities.graph_decorator import decorate_nx_graph, to_tuple_list
+from tests.paige_tarjan.rscp_utilities import is_stable_partition
+
+
+def test_scratch_buffer_keeps_storage():
+    buffer = ScratchBuffer()
+    buffer.fill(range(10))
+    assert list(buffer) == list(range(10))
+    assert buffer.capacity == 10
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert list(buffer) == []
+
+    buffer.append(3)
+    buffer.append(4)
+    assert list(buffer) == [3, 4]
+    assert buffer.capacity == 10
+
+
+def test_scratch_buffer_counts_reuses():
+    buffer = ScratchBuffer(2)
+
+    # the first use is not a reuse, even if no allocation is needed
+    buffer.clear()
+    buffer.fill(range(2))
+    assert buffer.reuses == 0
+
+    buffer.clear()
+    buffer.append(0)
+    assert buffer.reuses == 1
+
+    # the storage grows
+    buffer.clear()
+    buffer.fill(range(3))
+    assert buffer.reuses == 1
+
+    buffer.clear()
+    buffer.fill(range(3))
+    assert buffer.reuses == 2
+
+
+def test_pool_recycles_qblocks():
+    pool = RefinementPool()
+    xblock = _XBlock()
+
+    qblock = pool.take_qblock(_QBlock, xblock)
+    qblock.visited = True
+    assert pool.allocated_qblocks == 1
+
+    xblock.remove_qblock(qblock)
+    pool.release_qblock(qblock)
+    assert pool.free_qblocks == 1
+
+    other_xblock = _XBlock()
+    assert pool.take_qblock(_QBlock, other_xblock) is qblock
+    assert pool.reused_qblocks == 1
+    assert pool.free_qblocks == 0
+    assert qblock.xblock is other_xblock
+    assert not qblock.visited
+    assert qblock.size == 0
+
+
+def test_split_whole_block_keeps_qblock():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(4))
+    vertexes, q_partition = decorate_nx_graph(graph, [(0, 1), (2, 3)])
+    pool = RefinementPool()
+
+    new_qblocks, _, _ = split(vertexes[:3], pool)
+
+    # the first block is untouched, the second is split
+    assert len(new_qblocks) == 1
+    assert q_partition[0].size == 2
+    assert set(vertex.label for vertex in q_partition[0].vertexes) == {0, 1}
+    assert all(vertex.qblock is q_partition[0] for vertex in vertexes[:2])
+    assert q_partition[0].xblock.size == 3
+    assert pool.free_qblocks == 1
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_pt_with_pool(graph, initial_partition, expected_q_partition):
+    vertexes, q_partition = decorate_nx_graph(graph, initial_partition)
+    pool = RefinementPool()
+
+    rscp = paige_tarjan_qblocks(q_partition, pool=pool)
+
+    assert is_stable_partition(rscp)
+    assert set(frozenset(tp) for tp in to_tuple_list(rscp)) == set(
+        frozenset(tp) for tp in expected_q_partition
+    )
+    # each step after the first one reuses at most three buffers
+    assert pool.reused_buffers <= 3 * max(pool.refine_steps - 1, 0)
+
+
+def test_pool_counts_avoided_allocations():
+    graph = nx.DiGraph([(0, 1), (1, 2)])
+    vertexes, q_partition = decorate_nx_graph(graph, [(0, 1, 2)])
+    pool = RefinementPool()
+
+    paige_tarjan_qblocks(q_partition, pool=pool)
+
+    # Q = {0, 1}, {2} after the initial split of the leafs. the first step
+    # splits {0, 1} with respect to {2}, and allocates the buffers and two
+    # blocks. the second step uses a splitter of one vertex, therefore the
+    # buffers don't grow
+    assert pool.refine_steps == 2
+    assert pool.allocated_qblocks == 2
+    assert pool.reused_qblocks == 0
+    assert pool.reused_buffers == 3
+    assert pool.avoided_allocations == 3
+    assert pool.avoided_allocations_per_step() == 1.5
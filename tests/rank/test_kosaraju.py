@@ -4,8 +4,9 @@ from bispy.utilities.graph_entities import (
     _Edge,
 )
 import networkx as nx
-from bispy.utilities.kosaraju import kosaraju
-from bispy.utilities.graph_decorator import decorate_nx_graph
+from bispy.utilities.kosaraju import kosaraju, csr_kosaraju
+from bispy.utilities.graph_decorator import as_bispy_graph, decorate_nx_graph
+from bispy.utilities.csr_graph import CSRGraph
 
 
 def test_scc1():
@@ -267,5 +268,80 @@ def test_kosaraju_unvisits():
     vertexes, _ = decorate_nx_graph(graph)
     result = kosaraju(vertexes, return_sccs=True)
 
-    for v in vertexes:
-        assert not v.visited
+    # marks left by the first visit do not affect the second one
+    assert scc_sets(kosaraju(vertexes, return_sccs=True)) == scc_sets(result)
+
+
+def scc_sets(sccs):
+    return set(frozenset(v.label for v in scc._vertexes) for scc in sccs)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_tarjan_same_sccs(seed):
+    graph = nx.gnm_random_graph(30, 50, seed=seed, directed=True)
+
+    vertexes, _ = decorate_nx_graph(graph)
+    sccs = kosaraju(vertexes, return_sccs=True)
+    tarjan_sccs = kosaraju(vertexes, return_sccs=True, tarjan=True)
+
+    assert scc_sets(tarjan_sccs) == scc_sets(sccs)
+    assert scc_sets(tarjan_sccs) == set(
+        map(frozenset, nx.strongly_connected_components(graph))
+    )
+    for scc in tarjan_sccs:
+        for vertex in scc._vertexes:
+            assert vertex.scc is scc
+
+
+@pytest.mark.parametrize("tarjan", [False, True])
+def test_based_sccs(tarjan):
+    graph = nx.DiGraph([(0, 1), (1, 2), (2, 0), (3, 0), (4, 5), (5, 4)])
+    vertexes, _ = decorate_nx_graph(graph)
+    old_scc = vertexes[4].scc
+
+    # only the vertexes which reach 1 are visited
+    sccs = kosaraju(vertexes[1], return_sccs=True, tarjan=tarjan)
+
+    assert scc_sets(sccs) == set([frozenset([0, 1, 2]), frozenset([3])])
+    assert vertexes[4].scc is old_scc
+    assert not hasattr(vertexes[0], "reachable_from_base")
+
+
+@pytest.mark.parametrize("tarjan", [False, True])
+def test_long_chain(tarjan):
+    # deeper than the default recursion limit
+    nvertexes = 20000
+    graph = CSRGraph.from_edges(
+        nvertexes, range(nvertexes - 1), range(1, nvertexes)
+    )
+    vertexes, _ = as_bispy_graph(graph, [range(nvertexes)], True, False, False)
+
+    sccs = kosaraju(vertexes, return_sccs=True, tarjan=tarjan)
+    assert len(sccs) == nvertexes
+
+    graph = CSRGraph.from_edges(
+        nvertexes,
+        range(nvertexes),
+        [(node + 1) % nvertexes for node in range(nvertexes)],
+    )
+    vertexes, _ = as_bispy_graph(graph, [range(nvertexes)], True, False, False)
+
+    sccs = kosaraju(vertexes[0], return_sccs=True, tarjan=tarjan)
+    assert len(sccs) == 1
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_csr_kosaraju(seed):
+    graph = nx.gnm_random_graph(30, 50, seed=seed, directed=True)
+
+    nsccs, scc_of = csr_kosaraju(CSRGraph.from_nx_graph(graph))
+
+    sccs = [set() for _ in range(nsccs)]
+    for node, scc in enumerate(scc_of):
+        sccs[scc].add(node)
+    assert set(map(frozenset, sccs)) == set(
+        map(frozenset, nx.strongly_connected_components(graph))
+    )
+    # SCCs are in topological order
+    for source, target in graph.edges:
+        assert scc_of[source] <= scc_of[target]
@@ -3,7 +3,10 @@ import networkx as nx
 
 from bispy.utilities.rank_computation import (
     compute_rank,
+    csr_rank,
 )
+from bispy.utilities import graph_decorator, rank_computation
+from bispy.utilities.csr_graph import CSRGraph
 from bispy.utilities.graph_decorator import (
     decorate_nx_graph,
 )
@@ -18,6 +21,49 @@ def test_compute_rank(graph, node_rank_dict: dict):
         assert vertexes[idx].rank == node_rank_dict[idx]
 
 
+@pytest.mark.parametrize("graph, node_rank_dict", zip(graphs, noderank_dicts))
+def test_csr_rank(graph, node_rank_dict: dict):
+    vertexes, _ = decorate_nx_graph(graph)
+    scc_of, rank, wf = csr_rank(CSRGraph.from_nx_graph(graph))
+
+    for idx in range(len(vertexes)):
+        scc = scc_of[idx]
+        if node_rank_dict[idx] == float("-inf"):
+            assert rank[scc] == -1
+        else:
+            assert rank[scc] == node_rank_dict[idx]
+        assert wf[scc] == vertexes[idx].wf
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_csr_graph_rank(monkeypatch, seed, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(rank_computation, "np", None)
+        monkeypatch.setattr(graph_decorator, "np", None)
+    graph = nx.gnm_random_graph(40, 60, seed=seed, directed=True)
+    vertexes, _ = decorate_nx_graph(graph)
+    csr_vertexes, _ = decorate_nx_graph(CSRGraph.from_nx_graph(graph))
+
+    assert [vx.rank for vx in csr_vertexes] == [vx.rank for vx in vertexes]
+    assert [vx.wf for vx in csr_vertexes] == [vx.wf for vx in vertexes]
+    for vx in csr_vertexes:
+        assert vx in vx.scc._vertexes
+
+
+def test_csr_rank_long_chain():
+    # deeper than the default recursion limit
+    nvertexes = 20000
+    graph = CSRGraph.from_edges(
+        nvertexes, range(1, nvertexes), range(nvertexes - 1)
+    )
+    vertexes, _ = decorate_nx_graph(graph)
+
+    for vx in vertexes:
+        assert vx.rank == vx.label
+        assert vx.wf
+
+
 def test_rank2():
     graph = nx.DiGraph()
     graph.add_nodes_from(range(7))
@@ -122,6 +168,10 @@ def test_rank_clears_visited():
         ]
     )
     vertexes, _ = decorate_nx_graph(graph)
+    rank = [vx.rank for vx in vertexes]
+    wf = [vx.wf for vx in vertexes]
 
-    for vx in vertexes:
-        assert not vx.visited
+    # marks left by the first visit do not affect the second one
+    compute_rank(vertexes)
+    assert [vx.rank for vx in vertexes] == rank
+    assert [vx.wf for vx in vertexes] == wf
@@ -171,3 +171,49 @@ g2.add_edges_from([(2, 0), (3, 1), (4, 3), (5, 3), (5, 4)])
 update_rscp_graphs.append(g2)
 update_rscp_initial_partition.append([(0, 1, 2, 3, 4, 5)])
 update_rscp_new_edge.append((0, 1))
+
+# sequences of new edges which used to depend on the order of the blocks and
+# of their vertexes
+add_edges_graphs = []
+add_edges_initial_partition = []
+add_edges_new_edges = []
+
+# 0
+g0 = nx.DiGraph()
+g0.add_nodes_from(range(6))
+g0.add_edges_from([(3, 2), (4, 2), (5, 0), (5, 5)])
+add_edges_graphs.append(g0)
+add_edges_initial_partition.append([(0, 1), (2, 3, 4, 5)])
+add_edges_new_edges.append([(2, 4), (2, 2), (2, 0)])
+
+# 1
+g1 = nx.DiGraph()
+g1.add_nodes_from(range(5))
+g1.add_edges_from([(0, 2), (0, 4), (1, 2), (2, 4), (3, 2), (4, 2), (4, 4)])
+add_edges_graphs.append(g1)
+add_edges_initial_partition.append([(0, 1, 2), (3, 4)])
+add_edges_new_edges.append([(1, 3), (3, 1)])
+
+# 2
+g2 = nx.DiGraph()
+g2.add_nodes_from(range(7))
+g2.add_edges_from(
+    [
+        (0, 3),
+        (0, 4),
+        (0, 5),
+        (0, 6),
+        (1, 2),
+        (2, 3),
+        (2, 4),
+        (3, 6),
+        (4, 1),
+        (4, 6),
+        (5, 4),
+        (6, 0),
+        (6, 3),
+    ]
+)
+add_edges_graphs.append(g2)
+add_edges_initial_partition.append([(0, 2, 3, 5, 6), (1, 4)])
+add_edges_new_edges.append([(5, 0), (2, 5)])
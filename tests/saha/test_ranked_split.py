@@ -3,10 +3,12 @@ from bispy.utilities.graph_entities import (
     _QBlock,
     _Vertex,
     _Edge,
+    _XBlock,
 )
 from typing import Set, Tuple, List
 import networkx as nx
 from bispy.saha.ranked_pta import ranked_split
+from bispy.saha.ranked_compound_xblocks_container import xblock_rank
 from bispy.paige_tarjan.paige_tarjan import paige_tarjan
 from bispy.saha.saha import add_edge
 from bispy.utilities.graph_decorator import decorate_nx_graph
@@ -15,7 +17,7 @@ from bispy.utilities.graph_decorator import decorate_nx_graph
 def partition_to_integer(partition: List[_QBlock]) -> Set[Set[int]]:
     return set(
         frozenset(vertex.label for vertex in block.vertexes)
-        for block in filter(lambda b: b.vertexes.size > 0, partition)
+        for block in filter(lambda b: b.size > 0, partition)
     )
 
 
@@ -28,7 +30,7 @@ def integer_to_partition(
     return qblocks
 
 
-def test_resets_aux_count():
+def test_ignores_stale_aux_count():
     g = nx.DiGraph()
     g.add_nodes_from(range(5))
     g.add_edges_from([(0, 1), (0, 2), (3, 1), (3, 2), (4, 1), (4, 2), (4, 3)])
@@ -49,10 +51,17 @@ def test_resets_aux_count():
                 modified_destination_block = block
                 break
 
+    # leave a wrong aux_count on each vertex
+    for vx in vertexes:
+        vx.aux_count = vx.count_table.new_slot()
+        vx.count_table.values[vx.aux_count] = 100
+
     ranked_split(q_partition, modified_destination_block, 2)
 
-    for vx in vertexes:
-        assert not hasattr(vx, "aux_count") or vx.aux_count is None
+    final_integer_partition = partition_to_integer(q_partition)
+    assert final_integer_partition == set(
+        [frozenset([0]), frozenset([1, 2]), frozenset([3]), frozenset([4])]
+    )
 
 
 def test_ranked_split():
@@ -82,3 +91,18 @@ def test_ranked_split():
     assert final_integer_partition == set(
         [frozenset([0]), frozenset([1, 2]), frozenset([3]), frozenset([4])]
     )
+
+
+def test_xblock_rank_ignores_empty_qblocks():
+    g = nx.DiGraph()
+    g.add_nodes_from(range(3))
+    g.add_edges_from([(0, 1), (1, 2)])
+
+    vertexes, _ = decorate_nx_graph(g)
+
+    xblock = _XBlock()
+    _QBlock([], xblock)
+    _QBlock([vertexes[1], vertexes[0]], xblock)
+
+    assert xblock_rank(xblock) == 2
+    assert xblock.rank == 2
@@ -4,6 +4,9 @@ from bispy.saha.saha_partition import saha as saha_partition
 from .saha_test_cases import (
     update_rscp_graphs,
     update_rscp_initial_partition,
+    add_edges_graphs,
+    add_edges_initial_partition,
+    add_edges_new_edges,
 )
 from tests.paige_tarjan.paige_tarjan_test_cases import (
     graph_partition_rscp_tuples,
@@ -80,3 +83,41 @@ def test_graph_normalization():
     assert set(map(frozenset, partition.add_edge(("nodo2", "nodo3")))) == set(
         [frozenset(nodes)]
     )
+
+
+def test_add_edge_non_integer_graph():
+    goal_graph = nx.relabel_nodes(
+        nx.balanced_tree(2, 3, create_using=nx.DiGraph), lambda node: str(node)
+    )
+    initial_graph = nx.DiGraph()
+    initial_graph.add_nodes_from(goal_graph.nodes)
+
+    partition = saha_partition(initial_graph)
+    assert partition.idx_to_node == list(goal_graph.nodes)
+
+    edges = []
+    for edge in goal_graph.edges:
+        edges.append(edge)
+        g = nx.DiGraph()
+        g.add_nodes_from(goal_graph.nodes)
+        g.add_edges_from(edges)
+
+        assert to_set(partition.add_edge(edge)) == to_set(paige_tarjan(g))
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, new_edges",
+    zip(add_edges_graphs, add_edges_initial_partition, add_edges_new_edges),
+)
+def test_add_edge_sequence(graph, initial_partition, new_edges):
+    partition = saha_partition(graph, initial_partition)
+
+    g = nx.DiGraph()
+    g.add_nodes_from(graph.nodes)
+    g.add_edges_from(graph.edges)
+    for edge in new_edges:
+        g.add_edge(*edge)
+
+        assert to_set(partition.add_edge(edge)) == to_set(
+            paige_tarjan(g, initial_partition)
+        )
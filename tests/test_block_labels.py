@@ -0,0 +1,94 @@
+import pytest
+import networkx as nx
+from bispy import (
+    paige_tarjan,
+    paige_tarjan_from_arrays,
+    dovier_piazza_policriti,
+    dovier_piazza_policriti_from_arrays,
+)
+from bispy.utilities.block_labels import BlockLabels
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    to_set,
+    to_tuple_list,
+)
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+def test_canonical_labels():
+    partition = BlockLabels.from_partition([(3, 1), (2,), (0, 4)], 5)
+    assert list(partition.labels) == [0, 1, 2, 1, 0]
+    assert partition.number_of_blocks() == 3
+    assert len(partition) == 5
+
+    # the order of blocks and nodes doesn't matter
+    assert partition == BlockLabels.from_partition([(2,), (4, 0), (1, 3)], 5)
+    assert partition != BlockLabels.from_partition([(0, 1, 3, 4), (2,)], 5)
+
+
+def test_block_offsets_and_members():
+    partition = BlockLabels.from_partition([(3, 1), (2,), (0, 4)], 5)
+    assert list(partition.block_offsets) == [0, 2, 4, 5]
+    assert list(partition.block_members) == [0, 4, 1, 3, 2]
+    assert list(partition.block(1)) == [1, 3]
+    assert partition.to_tuple_list() == [(0, 4), (1, 3), (2,)]
+
+
+def test_empty_blocks_are_dropped():
+    partition = BlockLabels.from_partition([(), (1,), (0,)], 2)
+    assert partition.to_tuple_list() == [(0,), (1,)]
+
+
+def test_partition_should_cover_nodes():
+    with pytest.raises(ValueError):
+        BlockLabels.from_partition([(0,), (2,)], 3)
+
+
+def test_labels_constructor():
+    partition = BlockLabels.from_partition([(0, 2), (1,)], 3)
+    assert BlockLabels(partition.labels).number_of_blocks() == 2
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+@pytest.mark.parametrize("algorithm", [paige_tarjan, dovier_piazza_policriti])
+def test_algorithms_return_block_labels(
+    graph, initial_partition, expected_q_partition, algorithm
+):
+    partition = algorithm(graph, initial_partition, block_labels=True)
+    assert isinstance(partition, BlockLabels)
+    assert partition == BlockLabels.from_partition(
+        expected_q_partition, len(graph.nodes)
+    )
+    assert to_set(partition.to_tuple_list()) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize(
+    "algorithm",
+    [paige_tarjan_from_arrays, dovier_piazza_policriti_from_arrays],
+)
+def test_from_arrays(algorithm):
+    partition = algorithm(
+        4, [0, 1], [2, 3], labels=[0, 0, 1, 1], block_labels=True
+    )
+    assert list(partition.labels) == [0, 0, 1, 1]
+
+
+def test_non_integer_graph():
+    graph = nx.DiGraph()
+    graph.add_edges_from([("a", "b"), ("c", "d")])
+    partition = paige_tarjan(graph, block_labels=True)
+    # labels follow the order of graph.nodes
+    assert list(partition.labels) == [0, 1, 0, 1]
+
+
+def test_from_vertexes():
+    graph = nx.balanced_tree(2, 2, create_using=nx.DiGraph)
+    vertexes, qblocks = decorate_nx_graph(graph, [(0, 3, 4), (1, 2, 5, 6)])
+    partition = BlockLabels.from_vertexes(vertexes)
+    assert partition == BlockLabels.from_partition(to_tuple_list(qblocks), 7)
+    assert partition.number_of_blocks() == len(qblocks)
@@ -0,0 +1,92 @@
+import gc
+import pytest
+from bispy import paige_tarjan, dovier_piazza_policriti, saha
+from bispy.utilities.bulk_build import bulk_build_mode
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    to_set,
+    to_tuple_list,
+)
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+@pytest.fixture
+def gc_enabled():
+    was_enabled = gc.isenabled()
+    gc.enable()
+    yield
+    if not was_enabled:
+        gc.disable()
+
+
+def test_bulk_build_mode_restores_gc(gc_enabled):
+    with bulk_build_mode():
+        assert not gc.isenabled()
+        with bulk_build_mode():
+            assert not gc.isenabled()
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+
+def test_bulk_build_mode_restores_gc_on_exception(gc_enabled):
+    with pytest.raises(ValueError):
+        with bulk_build_mode():
+            raise ValueError()
+    assert gc.isenabled()
+
+
+def test_bulk_build_mode_disabled(gc_enabled):
+    with bulk_build_mode(enabled=False):
+        assert gc.isenabled()
+
+
+def test_bulk_build_mode_keeps_gc_disabled():
+    was_enabled = gc.isenabled()
+    gc.disable()
+    with bulk_build_mode():
+        pass
+    assert not gc.isenabled()
+    if was_enabled:
+        gc.enable()
+
+
+def test_bulk_build_mode_freeze(gc_enabled):
+    with bulk_build_mode(freeze=True):
+        vertexes, _ = decorate_nx_graph(graph_partition_rscp_tuples[0][0])
+    assert gc.get_freeze_count() > 0
+    gc.unfreeze()
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_bulk_build_same_result(
+    gc_enabled, graph, initial_partition, expected_q_partition
+):
+    assert to_set(
+        paige_tarjan(graph, initial_partition, bulk_build=True)
+    ) == to_set(expected_q_partition)
+    assert to_set(
+        dovier_piazza_policriti(graph, initial_partition, bulk_build=True)
+    ) == to_set(expected_q_partition)
+    saha_partition = saha(graph, initial_partition, bulk_build=True)
+    assert to_set(to_tuple_list(saha_partition.qblocks)) == to_set(
+        expected_q_partition
+    )
+    assert gc.isenabled()
+
+
+def test_gc_not_disabled_by_default(gc_enabled, monkeypatch):
+    disabled = []
+    monkeypatch.setattr(gc, "disable", lambda: disabled.append(True))
+
+    graph = graph_partition_rscp_tuples[0][0]
+    decorate_nx_graph(graph)
+    dovier_piazza_policriti(graph)
+    assert not disabled
+
+    dovier_piazza_policriti(graph, bulk_build=True)
+    assert disabled
@@ -0,0 +1,100 @@
+import pytest
+import networkx as nx
+from array import array
+from bispy import CSRGraph, paige_tarjan, dovier_piazza_policriti, saha
+from bispy.utilities.csr_graph import index_typecode
+from bispy.utilities.graph_decorator import to_set
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+def test_index_typecode():
+    assert index_typecode(0) == "i"
+    assert index_typecode(2**31 - 1) == "i"
+    assert index_typecode(2**31) == "q"
+
+
+def test_from_edges():
+    graph = CSRGraph.from_edges(4, [0, 2, 0, 3, 1], [1, 1, 3, 3, 0])
+
+    assert len(graph) == 4
+    assert graph.number_of_edges() == 5
+    assert isinstance(graph.image, array)
+
+    assert sorted(graph.successors(0)) == [1, 3]
+    assert list(graph.successors(1)) == [0]
+    assert list(graph.successors(2)) == [1]
+    assert list(graph.successors(3)) == [3]
+
+    assert sorted(graph.predecessors(1)) == [0, 2]
+    assert list(graph.predecessors(0)) == [1]
+    assert list(graph.predecessors(2)) == []
+    assert sorted(graph.predecessors(3)) == [0, 3]
+
+
+def test_from_edges_wrong_length():
+    with pytest.raises(ValueError):
+        CSRGraph.from_edges(3, [0, 1], [1])
+
+
+@pytest.mark.parametrize(
+    "nvertexes, sources, targets",
+    [(3, [0, 3], [1, 2]), (3, [0, 1], [-1, 2]), (0, [0], [0])],
+)
+def test_from_edges_out_of_range(nvertexes, sources, targets):
+    with pytest.raises(ValueError):
+        CSRGraph.from_edges(nvertexes, sources, targets)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_from_nx_graph(graph, initial_partition, expected_q_partition):
+    csr_graph = CSRGraph.from_nx_graph(graph)
+
+    assert set(csr_graph.edges) == set(graph.edges)
+    assert csr_graph.to_nx_graph().edges == graph.edges
+    for node in graph.nodes:
+        assert set(csr_graph.successors(node)) == set(graph.successors(node))
+        assert set(csr_graph.predecessors(node)) == set(
+            graph.predecessors(node)
+        )
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_algorithms_accept_csr_graph(
+    graph, initial_partition, expected_q_partition
+):
+    csr_graph = CSRGraph.from_nx_graph(graph)
+
+    assert to_set(paige_tarjan(csr_graph, initial_partition)) == to_set(
+        expected_q_partition
+    )
+    assert to_set(
+        dovier_piazza_policriti(csr_graph, initial_partition)
+    ) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_saha_accepts_csr_graph(
+    graph, initial_partition, expected_q_partition
+):
+    edges = list(graph.edges)
+    csr_graph = CSRGraph.from_edges(
+        len(graph.nodes),
+        [edge[0] for edge in edges[:-1]],
+        [edge[1] for edge in edges[:-1]],
+    )
+
+    saha_partition = saha(csr_graph, initial_partition)
+    assert to_set(saha_partition.add_edge(edges[-1])) == to_set(
+        expected_q_partition
+    )
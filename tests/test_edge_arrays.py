@@ -0,0 +1,120 @@
+import pytest
+import numpy as np
+from array import array
+from bispy import (
+    EdgeArrayGraph,
+    paige_tarjan_from_arrays,
+    dovier_piazza_policriti_from_arrays,
+    saha_from_arrays,
+)
+from bispy.utilities.edge_arrays import labels_to_partition
+from bispy.utilities.graph_decorator import to_set
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+def partition_to_labels(nvertexes, initial_partition):
+    labels = [None for _ in range(nvertexes)]
+    for idx, block in enumerate(initial_partition):
+        for vertex in block:
+            labels[vertex] = idx
+    return labels
+
+
+def test_edge_array_graph():
+    graph = EdgeArrayGraph(4, [0, 2, 0], [1, 1, 3])
+
+    assert len(graph) == 4
+    assert graph.number_of_nodes() == 4
+    assert graph.number_of_edges() == 3
+    assert list(graph.nodes) == [0, 1, 2, 3]
+    assert list(graph.edges) == [(0, 1), (2, 1), (0, 3)]
+
+
+@pytest.mark.parametrize(
+    "convert",
+    [
+        list,
+        lambda values: array("i", values),
+        lambda values: np.array(values, dtype=np.int32),
+        lambda values: np.array(values, dtype=np.int64),
+        tuple,
+    ],
+)
+def test_edge_array_graph_accepts_arrays(convert):
+    graph = EdgeArrayGraph(3, convert([0, 1]), convert([1, 2]))
+    assert list(graph.edges) == [(0, 1), (1, 2)]
+    assert all(type(node) is int for edge in graph.edges for node in edge)
+
+
+def test_edge_array_graph_does_not_copy_numpy_arrays():
+    sources = np.array([0, 1])
+    graph = EdgeArrayGraph(3, sources, np.array([1, 2]))
+    sources[0] = 2
+    assert list(graph.edges) == [(2, 1), (1, 2)]
+
+
+def test_edge_array_graph_errors():
+    with pytest.raises(ValueError):
+        EdgeArrayGraph(3, [0, 1], [1])
+    with pytest.raises(ValueError):
+        EdgeArrayGraph(3, [0, 3], [1, 2])
+    with pytest.raises(ValueError):
+        EdgeArrayGraph(3, [0, 1], [-1, 2])
+    with pytest.raises(ValueError):
+        EdgeArrayGraph(3, np.array([0.0, 1.0]), [1, 2])
+
+
+def test_labels_to_partition():
+    assert labels_to_partition([0, 1, 0, 2]) == [[0, 2], [1], [3]]
+    assert labels_to_partition(np.array([5, 5, 1])) == [[0, 1], [2]]
+    assert labels_to_partition(np.array(["b", "a", "b"])) == [[0, 2], [1]]
+    assert labels_to_partition([]) == []
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_algorithms_from_arrays(
+    graph, initial_partition, expected_q_partition
+):
+    nvertexes = len(graph.nodes)
+    sources = np.array([edge[0] for edge in graph.edges])
+    targets = np.array([edge[1] for edge in graph.edges])
+    labels = partition_to_labels(nvertexes, initial_partition)
+
+    assert to_set(
+        paige_tarjan_from_arrays(nvertexes, sources, targets, labels)
+    ) == to_set(expected_q_partition)
+    assert to_set(
+        dovier_piazza_policriti_from_arrays(
+            nvertexes, sources, targets, labels
+        )
+    ) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_saha_from_arrays(graph, initial_partition, expected_q_partition):
+    edges = list(graph.edges)
+    nvertexes = len(graph.nodes)
+
+    saha_partition = saha_from_arrays(
+        nvertexes,
+        array("i", (edge[0] for edge in edges[:-1])),
+        array("i", (edge[1] for edge in edges[:-1])),
+        partition_to_labels(nvertexes, initial_partition),
+    )
+    assert to_set(saha_partition.add_edge(edges[-1])) == to_set(
+        expected_q_partition
+    )
+
+
+def test_trivial_labels_from_arrays():
+    assert to_set(paige_tarjan_from_arrays(4, [0, 1], [2, 3])) == to_set(
+        [(0, 1), (2, 3)]
+    )
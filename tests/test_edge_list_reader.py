@@ -0,0 +1,83 @@
+import io
+import pytest
+import networkx as nx
+from bispy import paige_tarjan
+from bispy.utilities.edge_list_reader import read_edge_list
+from bispy.utilities.graph_normalization import back_to_original
+from bispy.utilities.graph_decorator import to_set
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+def edges_of(graph, node_to_idx):
+    idx_to_node = {idx: node for node, idx in node_to_idx.items()}
+    return [(idx_to_node[s], idx_to_node[t]) for s, t in graph.edges]
+
+
+def test_read_edge_list():
+    text = "a b\n# a comment\nb\tc 1.0\n\nc a # another comment\n"
+    graph, node_to_idx = read_edge_list(io.StringIO(text))
+
+    assert node_to_idx == {"a": 0, "b": 1, "c": 2}
+    assert graph.number_of_nodes() == 3
+    assert edges_of(graph, node_to_idx) == [("a", "b"), ("b", "c"), ("c", "a")]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_lines_split_among_chunks(chunk_size):
+    text = "alpha beta\nbeta gamma\ngamma alpha"
+    graph, node_to_idx = read_edge_list(
+        io.StringIO(text), chunk_size=chunk_size
+    )
+    assert edges_of(graph, node_to_idx) == [
+        ("alpha", "beta"),
+        ("beta", "gamma"),
+        ("gamma", "alpha"),
+    ]
+
+
+def test_delimiter_and_nodetype():
+    text = "1, 2\n2,3\n"
+    graph, node_to_idx = read_edge_list(
+        io.StringIO(text), delimiter=",", nodetype=int
+    )
+    assert node_to_idx == {1: 0, 2: 1, 3: 2}
+    assert list(graph.edges) == [(0, 1), (1, 2)]
+
+
+def test_invalid_line():
+    with pytest.raises(ValueError):
+        read_edge_list(io.StringIO("a b\nc\n"))
+
+
+def test_read_from_path(tmp_path):
+    path = tmp_path / "graph.txt"
+    path.write_text("a b\r\nb a\r\n")
+    graph, node_to_idx = read_edge_list(path)
+    assert edges_of(graph, node_to_idx) == [("a", "b"), ("b", "a")]
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_paige_tarjan_on_edge_list(
+    graph, initial_partition, expected_q_partition
+):
+    # nodes without edges can't be written in an edge list
+    if any(graph.degree(node) == 0 for node in graph.nodes):
+        return
+    # name the nodes so that they differ from their ids
+    text = "".join(
+        "n{} n{}\n".format(source, target) for source, target in graph.edges
+    )
+    edge_list_graph, node_to_idx = read_edge_list(
+        io.StringIO(text), chunk_size=5
+    )
+
+    rscp = back_to_original(paige_tarjan(edge_list_graph), node_to_idx)
+    expected = paige_tarjan(
+        nx.relabel_nodes(graph, lambda node: "n{}".format(node))
+    )
+    assert to_set(rscp) == to_set(expected)
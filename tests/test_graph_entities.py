@@ -1,6 +1,26 @@
 import pytest
 import networkx as nx
-from bispy.utilities.graph_entities import _Vertex, _QBlock
+import random
+from bispy.utilities.graph_entities import (
+    _LightVertex,
+    _Vertex,
+    _CompactLightVertex,
+    _CompactVertex,
+    _Edge,
+    _LightQBlock,
+    _QBlock,
+    _XBlock,
+    _CountTable,
+    _SCC,
+)
+from bispy.utilities.graph_decorator import (
+    build_topological_csr_graph,
+    compute_counterimage_finishing_time_list,
+    csr_counterimage_finishing_time_list,
+    decorate_nx_graph,
+)
+from bispy.utilities import graph_decorator
+from bispy.utilities.csr_graph import CSRGraph
 
 
 def test_fast_mitosis():
@@ -10,8 +30,265 @@ def test_fast_mitosis():
 
     for v in qb.vertexes:
         assert v.label != 2 and v.label != 3
-    assert qb.vertexes.size == 8
+    assert qb.size == len(qb.vertexes) == 8
 
     for v in qb2.vertexes:
         assert v.label == 2 or v.label == 3
-    assert qb2.vertexes.size == 2
+    assert qb2.size == len(qb2.vertexes) == 2
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        _LightVertex(0),
+        _Vertex(0),
+        _CompactLightVertex(0),
+        _CompactVertex(0),
+        _Edge(_Vertex(0), _Vertex(1)),
+        _LightQBlock([], None),
+        _QBlock([], None),
+        _XBlock(),
+        _CountTable(4),
+        _SCC(0),
+    ],
+)
+def test_entities_are_slotted(instance):
+    assert not hasattr(instance, "__dict__")
+
+
+def test_lightweight_decoration():
+    graph = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    vertexes, qblocks = decorate_nx_graph(
+        graph,
+        topological_sorted_images=False,
+        compute_rank=False,
+        lightweight=True,
+    )
+
+    assert all(type(vertex) is _LightVertex for vertex in vertexes)
+    assert all(type(qblock) is _LightQBlock for qblock in qblocks)
+
+    # split helpers have the same type of the block they come from
+    qblocks[0].initialize_split_helper_block()
+    assert type(qblocks[0].split_helper_block) is _LightQBlock
+
+
+def test_lightweight_decoration_rank():
+    graph = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    with pytest.raises(ValueError):
+        decorate_nx_graph(graph, lightweight=True)
+
+
+def test_xblock_remove_qblock():
+    xblock = _XBlock()
+    qblocks = [_QBlock([_Vertex(i)], xblock) for i in range(5)]
+
+    xblock.remove_qblock(qblocks[1])
+    xblock.remove_qblock(qblocks[4])
+
+    assert xblock.size == 3
+    assert set(xblock.qblocks) == set([qblocks[0], qblocks[2], qblocks[3]])
+    for idx, qblock in enumerate(xblock.qblocks):
+        assert qblock._position == idx
+    assert qblocks[1].xblock is None
+
+
+def test_count_table_recycles_slots():
+    table = _CountTable(2)
+    first = table.new_slot()
+    second = table.new_slot()
+    table.values[first] = 3
+
+    assert first != second
+    assert len(table) == 2
+
+    table.release_slot(first)
+    assert len(table) == 1
+    assert table.new_slot() == first
+    assert table.values[first] == 0
+
+    # the table grows when more slots are needed
+    third = table.new_slot()
+    assert third not in (first, second)
+    assert len(table.values) == 3
+
+
+@pytest.mark.parametrize("lightweight", [True, False])
+def test_compact_decoration(lightweight):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(4))
+    graph.add_edges_from([(0, 1), (0, 2), (1, 2), (2, 0), (3, 2)])
+
+    vertexes, _ = decorate_nx_graph(
+        graph,
+        topological_sorted_images=False,
+        compute_rank=False,
+        lightweight=lightweight,
+        edge_objects=False,
+    )
+
+    for vertex in vertexes:
+        assert not vertex.edge_objects
+        assert set(v.label for v in vertex.image) == set(
+            graph.successors(vertex.label)
+        )
+        assert set(v.label for v in vertex.counterimage) == set(
+            graph.predecessors(vertex.label)
+        )
+
+        # count(x,V) = |E({x})|
+        assert len(vertex.counterimage_counts) == len(vertex.counterimage)
+        for source, slot in zip(
+            vertex.counterimage, vertex.counterimage_counts
+        ):
+            assert vertex.count_table.values[slot] == len(source.image)
+
+
+def test_compact_decoration_rank():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(6))
+    graph.add_edges_from([(0, 1), (1, 2), (2, 1), (3, 4), (4, 5), (0, 5)])
+
+    vertexes, _ = decorate_nx_graph(graph)
+    compact_vertexes, _ = decorate_nx_graph(graph, edge_objects=False)
+
+    assert all(type(vertex) is _CompactVertex for vertex in compact_vertexes)
+    for vertex, compact_vertex in zip(vertexes, compact_vertexes):
+        assert vertex.rank == compact_vertex.rank
+        assert vertex.wf == compact_vertex.wf
+        assert [v.label for v in vertex.successors()] == [
+            v.label for v in compact_vertex.image
+        ]
+
+
+def recursive_counterimage_dfs(vertex, finishing_list, visited):
+    visited.add(vertex.label)
+    for source in vertex.predecessors():
+        if source.label not in visited:
+            recursive_counterimage_dfs(source, finishing_list, visited)
+    finishing_list.append(vertex)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_counterimage_finishing_time_list(seed):
+    graph = nx.gnm_random_graph(40, 80, seed=seed, directed=True)
+    vertexes, _ = decorate_nx_graph(
+        graph, topological_sorted_images=False, compute_rank=False
+    )
+
+    expected, visited = [], set()
+    for vertex in vertexes:
+        if vertex.label not in visited:
+            recursive_counterimage_dfs(vertex, expected, visited)
+
+    assert compute_counterimage_finishing_time_list(vertexes) == expected
+
+
+def test_topological_sorted_images_of_long_chain():
+    # deeper than the default recursion limit
+    nvertexes = 20000
+    graph = CSRGraph.from_edges(
+        nvertexes, range(1, nvertexes), range(nvertexes - 1)
+    )
+    vertexes, _ = decorate_nx_graph(graph, compute_rank=False)
+
+    finishing_time_list = compute_counterimage_finishing_time_list(vertexes)
+    assert [vertex.label for vertex in finishing_time_list] == list(
+        range(nvertexes - 1, -1, -1)
+    )
+    assert [edge.destination.label for edge in vertexes[1].image] == [0]
+
+
+def sorted_csr_graph(graph):
+    # the counterimage of each node is sorted by source, like the one of
+    # the vertexes
+    edges = sorted(graph.edges)
+    return CSRGraph.from_edges(
+        len(graph.nodes),
+        [source for source, _ in edges],
+        [destination for _, destination in edges],
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_csr_counterimage_finishing_time_list(seed):
+    graph = nx.gnm_random_graph(40, 80, seed=seed, directed=True)
+    vertexes, _ = decorate_nx_graph(
+        graph, topological_sorted_images=False, compute_rank=False
+    )
+
+    assert list(
+        csr_counterimage_finishing_time_list(sorted_csr_graph(graph))
+    ) == [
+        vertex.label
+        for vertex in compute_counterimage_finishing_time_list(vertexes)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_build_topological_csr_graph(monkeypatch, seed, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(graph_decorator, "np", None)
+    graph = nx.gnm_random_graph(40, 80, seed=seed, directed=True)
+    graph.add_edges_from([(0, 0), (3, 3)])
+    vertexes, _ = decorate_nx_graph(graph, compute_rank=False)
+
+    csr_graph = build_topological_csr_graph(sorted_csr_graph(graph))
+    for vertex in vertexes:
+        assert list(csr_graph.successors(vertex.label)) == [
+            edge.destination.label for edge in vertex.image
+        ]
+
+
+def test_build_topological_csr_graph_any_counterimage_order():
+    graph = nx.gnm_random_graph(40, 80, seed=0, directed=True)
+    edges = list(graph.edges)
+    edges.reverse()
+    csr_graph = CSRGraph.from_edges(
+        len(graph.nodes),
+        [source for source, _ in edges],
+        [destination for _, destination in edges],
+    )
+
+    finishing_time_list = csr_counterimage_finishing_time_list(csr_graph)
+    finishing_time = {
+        node: time for time, node in enumerate(finishing_time_list)
+    }
+    sorted_graph = build_topological_csr_graph(csr_graph, finishing_time_list)
+    for node in graph.nodes:
+        image = list(sorted_graph.successors(node))
+        assert sorted(image) == sorted(graph.successors(node))
+        # inverse order of finishing time
+        assert image == sorted(
+            image, key=lambda destination: -finishing_time[destination]
+        )
+
+
+def test_build_topological_csr_graph_of_long_chain():
+    nvertexes = 20000
+    graph = CSRGraph.from_edges(
+        nvertexes, range(1, nvertexes), range(nvertexes - 1)
+    )
+
+    assert list(csr_counterimage_finishing_time_list(graph)) == list(
+        range(nvertexes - 1, -1, -1)
+    )
+    assert list(build_topological_csr_graph(graph).image) == list(
+        range(nvertexes - 1)
+    )
+
+
+def test_build_topological_csr_graph_with_numpy_of_large_graph(monkeypatch):
+    # more than 2^16 vertexes, the edges are sorted by source one digit at
+    # a time
+    pytest.importorskip("numpy")
+    nvertexes = 70000
+    rnd = random.Random(0)
+    sources = [rnd.randrange(nvertexes) for _ in range(3 * nvertexes)]
+    targets = [rnd.randrange(nvertexes) for _ in range(3 * nvertexes)]
+    graph = CSRGraph.from_edges(nvertexes, sources, targets)
+
+    image = build_topological_csr_graph(graph).image
+    monkeypatch.setattr(graph_decorator, "np", None)
+    assert list(image) == list(build_topological_csr_graph(graph).image)
@@ -0,0 +1,258 @@
+import pytest
+import networkx as nx
+from array import array
+from bispy import (
+    Algorithms,
+    CSRGraph,
+    compute_maximum_bisimulation,
+    paige_tarjan,
+    dovier_piazza_policriti,
+    saha,
+)
+from bispy.utilities.graph_file import (
+    MappedGraph,
+    as_mapped_graph_input,
+    decorate_mapped_graph,
+    open_graph_file,
+    write_decorated_graph,
+    write_edge_arrays,
+    write_nx_graph,
+)
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    to_set,
+    to_tuple_list,
+)
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+from tests.rank.rank_test_cases import graphs as rank_graphs
+
+
+def test_write_and_open_edge_arrays(tmp_path):
+    path = tmp_path / "graph.bispy"
+    write_edge_arrays(path, 4, [0, 2, 0], array("i", [1, 1, 3]))
+
+    with open_graph_file(path) as mapped_graph:
+        assert isinstance(mapped_graph, MappedGraph)
+        assert mapped_graph.number_of_nodes() == 4
+        assert mapped_graph.number_of_edges() == 3
+        assert sorted(mapped_graph.graph.edges) == [(0, 1), (0, 3), (2, 1)]
+        assert mapped_graph.labels is None
+        assert mapped_graph.initial_partition() is None
+
+
+def test_labels(tmp_path):
+    path = tmp_path / "graph.bispy"
+    write_edge_arrays(path, 4, [0, 1], [2, 3], labels=["a", "b", "a", "c"])
+
+    with open_graph_file(path) as mapped_graph:
+        assert list(mapped_graph.labels) == [0, 1, 0, 2]
+        assert mapped_graph.initial_partition() == [[0, 2], [1], [3]]
+
+
+def test_empty_graph(tmp_path):
+    path = tmp_path / "graph.bispy"
+    write_edge_arrays(path, 3, [], [])
+
+    with open_graph_file(path) as mapped_graph:
+        assert mapped_graph.number_of_edges() == 0
+        assert list(mapped_graph.graph.edges) == []
+
+
+def test_not_a_graph_file(tmp_path):
+    path = tmp_path / "graph.bispy"
+    path.write_bytes(b"hello")
+    with pytest.raises(ValueError):
+        open_graph_file(path)
+
+
+def test_truncated_graph_file(tmp_path):
+    path = tmp_path / "graph.bispy"
+    write_edge_arrays(path, 4, [0, 2, 0], [1, 1, 3])
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        open_graph_file(path)
+
+
+def test_non_integer_graph(tmp_path):
+    with pytest.raises(ValueError):
+        write_nx_graph(tmp_path / "graph.bispy", nx.DiGraph([("a", "b")]))
+
+
+def test_partition_must_cover_all_nodes(tmp_path):
+    with pytest.raises(ValueError):
+        write_nx_graph(
+            tmp_path / "graph.bispy", nx.DiGraph([(0, 1), (1, 2)]), [(0, 1)]
+        )
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_algorithms_accept_graph_file(
+    tmp_path, graph, initial_partition, expected_q_partition
+):
+    path = tmp_path / "graph.bispy"
+    write_nx_graph(path, graph, initial_partition)
+
+    # the initial partition is read from the file
+    assert to_set(paige_tarjan(path)) == to_set(expected_q_partition)
+    assert to_set(dovier_piazza_policriti(str(path))) == to_set(
+        expected_q_partition
+    )
+
+    with open_graph_file(path) as mapped_graph:
+        assert to_set(paige_tarjan(mapped_graph)) == to_set(
+            expected_q_partition
+        )
+        assert to_set(dovier_piazza_policriti(mapped_graph)) == to_set(
+            expected_q_partition
+        )
+        assert to_set(
+            compute_maximum_bisimulation(
+                mapped_graph, algorithm=Algorithms.DovierPiazzaPolicriti
+            )
+        ) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_explicit_initial_partition_wins(
+    tmp_path, graph, initial_partition, expected_q_partition
+):
+    path = tmp_path / "graph.bispy"
+    write_nx_graph(path, CSRGraph.from_nx_graph(graph))
+
+    assert to_set(paige_tarjan(path, initial_partition)) == to_set(
+        expected_q_partition
+    )
+
+
+def test_graph_file_closed_after_computation(tmp_path, monkeypatch):
+    path = tmp_path / "graph.bispy"
+    write_nx_graph(path, nx.balanced_tree(2, 3, create_using=nx.DiGraph))
+
+    closed = []
+    close = MappedGraph.close
+
+    def record_close(mapped_graph):
+        closed.append(mapped_graph)
+        close(mapped_graph)
+
+    monkeypatch.setattr(MappedGraph, "close", record_close)
+
+    paige_tarjan(path)
+    compute_maximum_bisimulation(path, sparse_quotient=True)
+    assert len(closed) == 2
+
+    with as_mapped_graph_input(path, None) as (graph, initial_partition):
+        assert graph.number_of_nodes() == 15
+    assert len(closed) == 3
+
+
+@pytest.mark.parametrize("decorated", [False, True])
+def test_graph_file_closed_by_dpp_and_saha(tmp_path, monkeypatch, decorated):
+    path = tmp_path / "graph.bispy"
+    graph = nx.DiGraph([(0, 1), (1, 2), (2, 1), (3, 3)])
+    if decorated:
+        write_decorated_graph(path, graph)
+    else:
+        write_nx_graph(path, graph)
+
+    closed = []
+    close = MappedGraph.close
+
+    def record_close(mapped_graph):
+        closed.append(mapped_graph)
+        close(mapped_graph)
+
+    monkeypatch.setattr(MappedGraph, "close", record_close)
+
+    assert to_set(dovier_piazza_policriti(path)) == to_set(
+        dovier_piazza_policriti(graph)
+    )
+    saha_partition = saha(path)
+    assert len(closed) == 2
+
+    # the vertexes do not depend on the file
+    assert to_set(saha_partition.add_edge((0, 3))) == to_set(
+        paige_tarjan(nx.DiGraph([(0, 1), (1, 2), (2, 1), (3, 3), (0, 3)]))
+    )
+
+
+@pytest.mark.parametrize("graph", rank_graphs)
+def test_decorated_graph_matches_decoration(tmp_path, graph):
+    path = tmp_path / "graph.bispy"
+    write_decorated_graph(path, graph)
+
+    expected_vertexes, _ = decorate_nx_graph(graph)
+    with open_graph_file(path) as mapped_graph:
+        assert mapped_graph.is_decorated
+        vertexes, _ = decorate_mapped_graph(mapped_graph)
+
+    for vertex, expected in zip(vertexes, expected_vertexes):
+        assert vertex.rank == expected.rank
+        assert vertex.wf == expected.wf
+        assert [edge.destination.label for edge in vertex.image] == [
+            edge.destination.label for edge in expected.image
+        ]
+    for vertex in vertexes:
+        for other in vertexes:
+            assert (vertex.scc == other.scc) == (
+                expected_vertexes[vertex.label].scc
+                == expected_vertexes[other.label].scc
+            )
+
+
+def test_not_decorated_graph_file(tmp_path):
+    path = tmp_path / "graph.bispy"
+    write_edge_arrays(path, 2, [0], [1])
+
+    with open_graph_file(path) as mapped_graph:
+        assert not mapped_graph.is_decorated
+        assert mapped_graph.scc is None
+        with pytest.raises(ValueError):
+            decorate_mapped_graph(mapped_graph)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_algorithms_accept_decorated_graph_file(
+    tmp_path, graph, initial_partition, expected_q_partition
+):
+    path = tmp_path / "graph.bispy"
+    write_decorated_graph(path, graph, initial_partition)
+
+    assert to_set(paige_tarjan(path)) == to_set(expected_q_partition)
+    assert to_set(dovier_piazza_policriti(path)) == to_set(
+        expected_q_partition
+    )
+    assert to_set(to_tuple_list(saha(path).qblocks)) == to_set(
+        expected_q_partition
+    )
+
+    # the decoration is reused with another labeling set
+    with open_graph_file(path) as mapped_graph:
+        assert to_set(
+            dovier_piazza_policriti(mapped_graph, [tuple(graph.nodes)])
+        ) == to_set(dovier_piazza_policriti(graph))
+
+
+def test_saha_on_decorated_graph_file(tmp_path):
+    graph = nx.DiGraph([(0, 1), (1, 2), (3, 4)])
+    graph.add_node(5)
+    path = tmp_path / "graph.bispy"
+    write_decorated_graph(path, graph)
+
+    partition = saha(path)
+    expected = saha(graph)
+    for edge in [(2, 0), (4, 5), (5, 3)]:
+        assert to_set(partition.add_edge(edge)) == to_set(
+            expected.add_edge(edge)
+        )
@@ -5,7 +5,9 @@ from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
     convert_to_integer_graph,
     back_to_original,
+    inverse_mapping,
 )
+from bispy.utilities.edge_arrays import EdgeArrayGraph
 
 
 def test_integer_graph():
@@ -69,3 +71,43 @@ def test_back_to_original():
         frozenset(tp)
         for tp in back_to_original(integer_partition, node_to_idx)
     ) == set(frozenset(tp) for tp in partition)
+
+
+def test_integer_graph_is_edge_arrays():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["a", "b", "c", "isolated"])
+    graph.add_edges_from([("a", "b"), ("b", "c"), ("a", "c")])
+
+    integer_graph, node_to_idx = convert_to_integer_graph(graph)
+
+    assert isinstance(integer_graph, EdgeArrayGraph)
+    assert integer_graph.number_of_nodes() == 4
+    assert set(integer_graph.edges) == set(
+        (node_to_idx[source], node_to_idx[destination])
+        for source, destination in graph.edges
+    )
+
+
+def test_integer_graph_from_undirected_graph():
+    graph = nx.Graph()
+    graph.add_edges_from([("a", "b"), ("b", "c")])
+
+    integer_graph, node_to_idx = convert_to_integer_graph(graph)
+    assert integer_graph.number_of_edges() == 2
+
+
+def test_integrality_check_empty_graph():
+    assert check_normal_integer_graph(nx.DiGraph())
+
+
+def test_back_to_original_with_inverse_mapping():
+    node_to_idx = {"a": 2, "b": 0, "c": 1}
+    idx_to_node = inverse_mapping(node_to_idx)
+    assert idx_to_node == ["b", "c", "a"]
+
+    partition = [(0, 2), (1,)]
+    assert (
+        back_to_original(partition, idx_to_node)
+        == back_to_original(partition, node_to_idx)
+        == [("b", "a"), ("c",)]
+    )
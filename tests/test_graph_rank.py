@@ -0,0 +1,195 @@
+import pytest
+import networkx as nx
+from bispy import (
+    CSRGraph,
+    GraphRank,
+    clear_rank_cache,
+    dovier_piazza_policriti,
+    graph_rank,
+    saha,
+)
+from bispy.utilities.graph_file import (
+    MappedGraph,
+    open_graph_file,
+    write_decorated_graph,
+    write_nx_graph,
+)
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    to_set,
+    to_tuple_list,
+)
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+from tests.rank.rank_test_cases import graphs as rank_graphs
+
+
+def expected_rank(graph):
+    vertexes, _ = decorate_nx_graph(graph)
+    return (
+        [-1 if vx.rank == float("-inf") else vx.rank for vx in vertexes],
+        [int(vx.wf) for vx in vertexes],
+    )
+
+
+@pytest.mark.parametrize("graph", rank_graphs)
+def test_graph_rank(graph):
+    rank, wf = expected_rank(graph)
+
+    for input_graph in [graph, CSRGraph.from_nx_graph(graph)]:
+        result = graph_rank(input_graph)
+        assert list(result.rank) == rank
+        assert list(result.wf) == wf
+        assert result.number_of_nodes() == len(graph.nodes)
+
+
+@pytest.mark.parametrize("graph", rank_graphs)
+def test_graph_rank_of_graph_file(tmp_path, monkeypatch, graph):
+    rank, wf = expected_rank(graph)
+
+    closed = []
+    close = MappedGraph.close
+
+    def record_close(mapped_graph):
+        closed.append(mapped_graph)
+        close(mapped_graph)
+
+    monkeypatch.setattr(MappedGraph, "close", record_close)
+
+    path = tmp_path / "graph.bispy"
+    write_nx_graph(path, graph)
+    assert list(graph_rank(path).rank) == rank
+
+    # the rank stored in the file is used
+    write_decorated_graph(path, graph)
+    result = graph_rank(path)
+    assert list(result.rank) == rank
+    assert list(result.wf) == wf
+    assert len(closed) == 2
+
+    # the result doesn't refer to the memory of a closed file
+    with open_graph_file(path) as mapped_graph:
+        result = graph_rank(mapped_graph)
+    assert list(result.rank) == rank
+    assert list(result.wf) == wf
+
+
+def test_cache():
+    graph = nx.DiGraph([(0, 1), (1, 2)])
+
+    rank = graph_rank(graph)
+    assert graph_rank(graph) is rank
+    assert graph_rank(graph, cache=False) is not rank
+
+    # the number of edges changed
+    graph.add_edge(2, 0)
+    new_rank = graph_rank(graph)
+    assert new_rank is not rank
+    assert list(new_rank.rank) == [-1, -1, -1]
+
+    clear_rank_cache(graph)
+    assert graph_rank(graph) is not new_rank
+
+
+def test_cache_of_rewired_graph():
+    graph = nx.DiGraph([(0, 1), (1, 2)])
+    assert to_set(
+        dovier_piazza_policriti(graph, rank=graph_rank(graph))
+    ) == to_set([(2,), (1,), (0,)])
+
+    # same number of nodes and edges
+    graph.remove_edge(1, 2)
+    graph.add_edge(2, 1)
+    assert to_set(
+        dovier_piazza_policriti(graph, rank=graph_rank(graph))
+    ) == to_set([(1,), (0, 2)])
+
+
+def test_cache_of_sparse_matrix():
+    scipy_sparse = pytest.importorskip("scipy.sparse")
+    matrix = scipy_sparse.csr_matrix(([1, 1], ([0, 1], [1, 2])), shape=(3, 3))
+
+    rank = graph_rank(matrix)
+    assert list(rank.rank) == [2, 1, 0]
+    assert graph_rank(matrix) is rank
+
+
+def test_non_integer_graph():
+    with pytest.raises(ValueError):
+        graph_rank(nx.DiGraph([("a", "b")]))
+
+
+def test_max_rank():
+    assert graph_rank(nx.DiGraph([(0, 1), (1, 2)])).max_rank() == 2
+    assert GraphRank([], [], bytearray()).max_rank() == -1
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_algorithms_accept_rank(
+    graph, initial_partition, expected_q_partition
+):
+    rank = graph_rank(graph)
+
+    assert to_set(
+        dovier_piazza_policriti(graph, initial_partition, rank=rank)
+    ) == to_set(expected_q_partition)
+    assert to_set(
+        to_tuple_list(saha(graph, initial_partition, rank=rank).qblocks)
+    ) == to_set(expected_q_partition)
+
+
+def test_saha_with_rank_adds_edges():
+    graph = nx.DiGraph([(0, 1), (1, 2), (3, 4)])
+    graph.add_node(5)
+
+    partition = saha(graph, rank=graph_rank(graph))
+    expected = saha(graph)
+    for edge in [(2, 0), (4, 5), (5, 3)]:
+        assert to_set(partition.add_edge(edge)) == to_set(
+            expected.add_edge(edge)
+        )
+
+
+def test_rank_of_another_graph():
+    rank = graph_rank(nx.DiGraph([(0, 1)]))
+    with pytest.raises(ValueError):
+        dovier_piazza_policriti(nx.DiGraph([(0, 1), (1, 2)]), rank=rank)
+    with pytest.raises(ValueError):
+        dovier_piazza_policriti(nx.DiGraph([("a", "b")]), rank=rank)
+
+
+def test_rank_of_graph_with_other_edges():
+    rank = graph_rank(nx.DiGraph([(0, 1), (1, 2)]))
+    assert rank.number_of_edges() == 2
+    with pytest.raises(ValueError):
+        dovier_piazza_policriti(
+            nx.DiGraph([(0, 1), (1, 2), (2, 0)]), rank=rank
+        )
+    with pytest.raises(ValueError):
+        saha(nx.DiGraph([(0, 1), (1, 2), (0, 2)]), rank=rank)
+
+
+def test_rank_of_decorated_graph_file(tmp_path):
+    graph = nx.DiGraph([(0, 1), (1, 2), (2, 1)])
+    path = tmp_path / "graph.bispy"
+    write_decorated_graph(path, graph)
+    expected = to_set(dovier_piazza_policriti(graph))
+
+    with open_graph_file(path) as mapped_graph:
+        rank = graph_rank(mapped_graph)
+        assert (
+            to_set(dovier_piazza_policriti(mapped_graph, rank=rank))
+            == expected
+        )
+        partition = saha(mapped_graph, rank=rank, compact_node_ids=True)
+        assert to_set(to_tuple_list(partition.qblocks)) == expected
+
+        other_rank = graph_rank(nx.DiGraph([(0, 1), (1, 2)]))
+        with pytest.raises(ValueError):
+            dovier_piazza_policriti(mapped_graph, rank=other_rank)
+        with pytest.raises(ValueError):
+            saha(mapped_graph, rank=other_rank)
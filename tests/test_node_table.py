@@ -0,0 +1,92 @@
+import pytest
+import networkx as nx
+from bispy import paige_tarjan
+from bispy.saha.saha_partition import saha
+from bispy.utilities.node_table import NodeTable
+from bispy.utilities.graph_normalization import (
+    convert_to_integer_graph,
+    back_to_original,
+    inverse_mapping,
+)
+from bispy.utilities.graph_decorator import to_set
+
+URIS = ["<http://ex.org/{}>".format(name) for name in "dbca"]
+
+
+def graph_with_edges(nodes, edges):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return graph
+
+
+def test_ids_are_sorted_positions():
+    table = NodeTable(URIS)
+    assert table.names == sorted(URIS)
+    assert len(table) == 4
+    for idx, name in enumerate(sorted(URIS)):
+        assert table[name] == table.index(name) == idx
+        assert name in table
+    assert dict(table.items()) == {name: table[name] for name in URIS}
+
+
+def test_bulk_lookups():
+    table = NodeTable(URIS)
+    ids = table.indexes(URIS)
+    assert list(ids) == [3, 1, 2, 0]
+    assert table.names_of(ids) == URIS
+
+
+@pytest.mark.parametrize("name", ["<http://ex.org/e>", "", 3, None])
+def test_missing_node(name):
+    table = NodeTable(URIS)
+    assert name not in table
+    with pytest.raises(KeyError):
+        table[name]
+    with pytest.raises(KeyError):
+        table.indexes(URIS + [name])
+
+
+def test_tuple_names():
+    table = NodeTable([("b", 1), ("a", 2), ("a", 1)])
+    assert table[("a", 2)] == 1
+
+
+def test_invalid_names():
+    with pytest.raises(ValueError):
+        NodeTable(["a", 1])
+    with pytest.raises(ValueError):
+        NodeTable(["a", "b", "a"])
+
+
+def test_compact_integer_graph():
+    graph = nx.DiGraph()
+    graph.add_edges_from([("c", "a"), ("a", "b"), ("b", "c"), ("c", "d")])
+
+    integer_graph, table = convert_to_integer_graph(graph, compact=True)
+    assert isinstance(table, NodeTable)
+    assert inverse_mapping(table) is table.names
+    assert set(integer_graph.edges) == {(2, 0), (0, 1), (1, 2), (2, 3)}
+
+    rscp = back_to_original(paige_tarjan(integer_graph), table)
+    assert to_set(rscp) == to_set(paige_tarjan(graph))
+
+
+def test_saha_compact_node_ids():
+    goal_graph = nx.relabel_nodes(
+        nx.balanced_tree(2, 3, create_using=nx.DiGraph), lambda node: str(node)
+    )
+    initial_graph = nx.DiGraph()
+    initial_graph.add_nodes_from(goal_graph.nodes)
+
+    partition = saha(initial_graph, compact_node_ids=True)
+    assert isinstance(partition.node_to_idx, NodeTable)
+
+    edges = list(goal_graph.edges)
+    assert to_set(partition.add_edges(edges[:5])) == to_set(
+        paige_tarjan(graph_with_edges(goal_graph.nodes, edges[:5]))
+    )
+    for idx in range(5, len(edges)):
+        assert to_set(partition.add_edge(edges[idx])) == to_set(
+            paige_tarjan(graph_with_edges(goal_graph.nodes, edges[: idx + 1]))
+        )
@@ -0,0 +1,148 @@
+import io
+import pytest
+import networkx as nx
+from bispy import paige_tarjan
+from bispy.utilities.ntriples_reader import (
+    RDF_TYPE,
+    parse_triple,
+    read_ntriples,
+)
+from bispy.utilities.graph_normalization import back_to_original
+from bispy.utilities.graph_decorator import to_set
+
+EX = "http://example.org/"
+
+TRIPLES = """# people
+<{ex}alice> <{rdf}> <{ex}Person> .
+<{ex}bob> <{rdf}> <{ex}Person> .
+<{ex}alice> <{ex}knows> <{ex}bob> .
+<{ex}bob> <{ex}knows> <{ex}alice> .
+<{ex}alice> <{ex}name> "Alice \\"A.\\" Smith"@en-US .
+
+_:b1 <{ex}knows> <{ex}alice>.
+<{ex}carol> <{rdf}> <{ex}Person> .
+<{ex}carol> <{rdf}> <{ex}Student> .
+<{ex}carol> <{ex}age> "21"^^<http://www.w3.org/2001/XMLSchema#integer> .
+""".format(ex=EX, rdf=RDF_TYPE[1:-1])
+
+
+def iri(name):
+    return "<{}{}>".format(EX, name)
+
+
+def named_partition(partition, node_to_idx):
+    return to_set(back_to_original(partition, node_to_idx))
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("<a> <b> <c> .", ("<a>", "<b>", "<c>")),
+        ("<a> <b> <c>.", ("<a>", "<b>", "<c>")),
+        ("_:x <b> _:y.", ("_:x", "<b>", "_:y")),
+        ("<a>\t<b>\t_:y . # comment", ("<a>", "<b>", "_:y")),
+        ('<a> <b> "x y . z" .', ("<a>", "<b>", '"x y . z"')),
+        ('<a> <b> "x\\\\" .', ("<a>", "<b>", '"x\\\\"')),
+        ('<a> <b> "x"@en-GB .', ("<a>", "<b>", '"x"@en-GB')),
+        ('<a> <b> "1"^^<int> .', ("<a>", "<b>", '"1"^^<int>')),
+        ("   ", None),
+        ("# comment", None),
+    ],
+)
+def test_parse_triple(line, expected):
+    assert parse_triple(line) == expected
+
+
+@pytest.mark.parametrize(
+    "line", ["<a> <b>", '<a> <b> "c .', "<a> <b> <c>", "<a> <b> <c> <d> ."]
+)
+def test_invalid_triple(line):
+    with pytest.raises(ValueError):
+        parse_triple(line)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 2**20])
+def test_read_ntriples(chunk_size):
+    graph, initial_partition, node_to_idx = read_ntriples(
+        io.StringIO(TRIPLES), chunk_size=chunk_size
+    )
+
+    literal = '"Alice \\"A.\\" Smith"@en-US'
+    age = '"21"^^<http://www.w3.org/2001/XMLSchema#integer>'
+    assert set(node_to_idx) == {
+        iri("alice"),
+        iri("bob"),
+        iri("carol"),
+        "_:b1",
+        literal,
+        age,
+    }
+    # type triples are not edges
+    assert graph.number_of_edges() == 5
+    assert named_partition(initial_partition, node_to_idx) == {
+        frozenset([iri("alice"), iri("bob")]),
+        frozenset([iri("carol")]),
+        frozenset(["_:b1", literal, age]),
+    }
+
+
+def test_predicate_nodes():
+    graph, initial_partition, node_to_idx = read_ntriples(
+        io.StringIO(TRIPLES + TRIPLES), predicate_nodes=True
+    )
+
+    knows = (iri("alice"), iri("knows"), iri("bob"))
+    assert knows in node_to_idx
+    # duplicate triples are ignored
+    assert graph.number_of_nodes() == 6 + 5
+    assert graph.number_of_edges() == 2 * 5
+
+    partition = named_partition(initial_partition, node_to_idx)
+    assert (
+        frozenset(
+            [
+                knows,
+                (iri("bob"), iri("knows"), iri("alice")),
+                ("_:b1", iri("knows"), iri("alice")),
+            ]
+        )
+        in partition
+    )
+
+
+def test_custom_type_predicate():
+    text = "<a> <is> <T> .\n<b> <is> <U> .\n<a> <p> <b> .\n"
+    graph, initial_partition, node_to_idx = read_ntriples(
+        io.StringIO(text), type_predicate="<is>"
+    )
+    assert list(graph.edges) == [(node_to_idx["<a>"], node_to_idx["<b>"])]
+    assert named_partition(initial_partition, node_to_idx) == {
+        frozenset(["<a>"]),
+        frozenset(["<b>"]),
+    }
+
+
+def test_read_from_path(tmp_path):
+    path = tmp_path / "graph.nt"
+    path.write_text(TRIPLES, encoding="utf-8")
+    graph, initial_partition, node_to_idx = read_ntriples(path)
+    assert graph.number_of_edges() == 5
+
+
+@pytest.mark.parametrize("predicate_nodes", [False, True])
+def test_maximum_bisimulation(predicate_nodes):
+    graph, initial_partition, node_to_idx = read_ntriples(
+        io.StringIO(TRIPLES), predicate_nodes=predicate_nodes
+    )
+    rscp = paige_tarjan(graph, initial_partition)
+
+    # the same graph built with networkx
+    nx_graph = nx.DiGraph()
+    nx_graph.add_nodes_from(range(graph.number_of_nodes()))
+    nx_graph.add_edges_from(graph.edges)
+    assert to_set(rscp) == to_set(paige_tarjan(nx_graph, initial_partition))
+
+    rscp = named_partition(rscp, node_to_idx)
+    # alice and bob know each other, but only alice has a name
+    assert frozenset([iri("alice")]) in rscp
+    assert frozenset([iri("bob")]) in rscp
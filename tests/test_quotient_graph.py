@@ -0,0 +1,65 @@
+import pytest
+import networkx as nx
+from bispy import paige_tarjan_quotient
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks
+from bispy.utilities.csr_graph import CSRGraph
+from bispy.utilities.graph_decorator import decorate_nx_graph, to_tuple_list
+from bispy.utilities.quotient_graph import quotient_graph
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+def expected_quotient_edges(graph, partition):
+    block_of = {}
+    for idx, block in enumerate(partition):
+        for node in block:
+            block_of[node] = idx
+    return set(
+        (block_of[source], block_of[destination])
+        for source, destination in graph.edges
+    )
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+@pytest.mark.parametrize("edge_objects", [True, False])
+def test_quotient_graph(
+    graph, initial_partition, expected_q_partition, edge_objects
+):
+    _, qblocks = decorate_nx_graph(
+        graph, initial_partition, edge_objects=edge_objects
+    )
+    rscp = paige_tarjan_qblocks(qblocks)
+    partition = to_tuple_list(rscp)
+
+    quotient = quotient_graph(rscp)
+    assert isinstance(quotient, CSRGraph)
+    assert quotient.number_of_nodes() == len(partition)
+    # edges are deduplicated
+    assert len(set(quotient.edges)) == quotient.number_of_edges()
+    assert set(quotient.edges) == expected_quotient_edges(graph, partition)
+
+
+def test_networkx_quotient_graph():
+    graph = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    _, qblocks = decorate_nx_graph(graph)
+    rscp = paige_tarjan_qblocks(qblocks)
+
+    quotient = quotient_graph(rscp, networkx_graph=True)
+    assert isinstance(quotient, nx.DiGraph)
+    # the quotient of a complete binary tree is a path
+    assert nx.is_isomorphic(quotient, nx.path_graph(4, nx.DiGraph))
+
+
+def test_paige_tarjan_quotient_non_integer_graph():
+    graph = nx.DiGraph()
+    graph.add_edges_from(
+        [("a", "b"), ("a", "c"), ("b", "d"), ("c", "e"), ("d", "d")]
+    )
+
+    rscp, quotient = paige_tarjan_quotient(graph, networkx_graph=True)
+    assert set(quotient.edges) == expected_quotient_edges(graph, rscp)
+    assert quotient.number_of_nodes() == len(rscp)
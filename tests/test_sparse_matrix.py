@@ -0,0 +1,131 @@
+import pytest
+import networkx as nx
+from bispy import (
+    Algorithms,
+    CSRGraph,
+    compute_maximum_bisimulation,
+    decorate_nx_graph,
+    paige_tarjan,
+    dovier_piazza_policriti,
+    saha,
+)
+from bispy.utilities.sparse_matrix import (
+    is_sparse_matrix,
+    quotient_sparse_matrix,
+)
+from bispy.utilities.graph_decorator import to_set, to_tuple_list
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+np = pytest.importorskip("numpy")
+sparse = pytest.importorskip("scipy.sparse")
+
+
+def to_sparse(graph):
+    return nx.to_scipy_sparse_array(
+        graph, nodelist=range(len(graph.nodes)), format="csr"
+    )
+
+
+def test_is_sparse_matrix():
+    assert is_sparse_matrix(sparse.csr_matrix((2, 2)))
+    assert is_sparse_matrix(sparse.coo_matrix((2, 2)))
+    assert not is_sparse_matrix(np.zeros((2, 2)))
+    assert not is_sparse_matrix(nx.DiGraph())
+
+
+def test_from_scipy_sparse_does_not_copy():
+    matrix = sparse.csr_matrix(
+        (np.ones(3), ([0, 0, 2], [1, 2, 0])), shape=(3, 3)
+    )
+    graph = CSRGraph.from_scipy_sparse(matrix)
+
+    assert np.shares_memory(np.asarray(graph.image), matrix.indices)
+    assert np.shares_memory(np.asarray(graph.image_offsets), matrix.indptr)
+    assert sorted(graph.edges) == [(0, 1), (0, 2), (2, 0)]
+    assert sorted(graph.predecessors(0)) == [2]
+    assert sorted(graph.predecessors(2)) == [0]
+
+
+def test_from_scipy_sparse_duplicates_and_zeros():
+    matrix = sparse.csr_matrix(
+        (
+            np.array([1, 1, 0, 2]),
+            np.array([1, 1, 2, 0]),
+            np.array([0, 3, 3, 4]),
+        ),
+        shape=(3, 3),
+    )
+    graph = CSRGraph.from_scipy_sparse(matrix)
+    assert sorted(graph.edges) == [(0, 1), (2, 0)]
+
+
+def test_from_scipy_sparse_not_square():
+    with pytest.raises(ValueError):
+        CSRGraph.from_scipy_sparse(sparse.csr_matrix((2, 3)))
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_algorithms_accept_sparse_matrix(
+    graph, initial_partition, expected_q_partition
+):
+    matrix = to_sparse(graph)
+
+    assert to_set(paige_tarjan(matrix, initial_partition)) == to_set(
+        expected_q_partition
+    )
+    assert to_set(
+        dovier_piazza_policriti(matrix.tocoo(), initial_partition)
+    ) == to_set(expected_q_partition)
+    assert to_set(
+        to_tuple_list(saha(matrix, initial_partition).qblocks)
+    ) == to_set(expected_q_partition)
+
+    vertexes, _ = decorate_nx_graph(matrix, initial_partition)
+    assert len(vertexes) == len(graph.nodes)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+@pytest.mark.parametrize(
+    "algorithm", [Algorithms.PaigeTarjan, Algorithms.DovierPiazzaPolicriti]
+)
+def test_sparse_quotient(
+    graph, initial_partition, expected_q_partition, algorithm
+):
+    for input_graph in (graph, to_sparse(graph)):
+        rscp, quotient = compute_maximum_bisimulation(
+            input_graph,
+            initial_partition,
+            algorithm=algorithm,
+            sparse_quotient=True,
+        )
+        assert to_set(rscp) == to_set(expected_q_partition)
+        assert quotient.shape == (len(rscp), len(rscp))
+
+        block_of = {
+            node: idx for idx, block in enumerate(rscp) for node in block
+        }
+        expected_edges = set(
+            (block_of[source], block_of[destination])
+            for source, destination in graph.edges
+        )
+        rows, cols = quotient.nonzero()
+        assert set(zip(rows.tolist(), cols.tolist())) == expected_edges
+
+
+def test_quotient_sparse_matrix_non_integer_graph():
+    graph = nx.DiGraph([("a", "b"), ("c", "d"), ("b", "b"), ("d", "d")])
+    quotient = quotient_sparse_matrix(graph, [("a", "c"), ("b", "d")])
+    assert quotient.toarray().tolist() == [[False, True], [False, True]]
+
+
+def test_compute_unknown_algorithm():
+    with pytest.raises(ValueError):
+        compute_maximum_bisimulation(nx.DiGraph([(0, 1)]), algorithm=None)